@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+What changed in git since a revision: files and lines, for incremental link checks.
+
+A PR that touches one post shouldn't re-check or re-report the whole
+archive. These helpers ask ``git diff`` which files, and which lines of
+them, changed, so the scripts can limit their work to those and reuse cached
+results for the rest.
+
+``rev`` is anything ``git diff`` accepts: a single revision (compared with
+the working tree, e.g. ``origin/main``) or a range (``A..B``, ``A...B``).
+
+Usage:
+    from git_changes import changed_files, changed_lines, split_changed_links
+
+    for path in changed_files('origin/main...HEAD', 'src/posts/*.md'):
+        ...
+
+    changed = changed_lines('origin/main')       # {path: {line, ...}}
+    fresh, rest = split_changed_links(links, changed)
+"""
+
+import re
+import shlex
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+HUNK_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+class GitError(RuntimeError):
+    """git failed or isn't available"""
+
+
+def _git(*args: str, cwd: Optional[Path] = None) -> str:
+    try:
+        result = subprocess.run(('git',) + args, cwd=cwd, capture_output=True,
+                                text=True, check=False)
+    except FileNotFoundError as e:
+        raise GitError('git is not installed') from e
+    if result.returncode != 0:
+        raise GitError(f"git {shlex.join(args)}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def repo_root(cwd: Optional[Path] = None) -> Path:
+    return Path(_git('rev-parse', '--show-toplevel', cwd=cwd).strip())
+
+
+def changed_files(rev: str, pathspec: str = '*.md', cwd: Optional[Path] = None) -> List[Path]:
+    """Files matching ``pathspec`` added, modified or deleted since ``rev``.
+
+    Renames are reported as a deletion plus an addition, so both names are
+    returned. Paths are absolute.
+    """
+    root = repo_root(cwd)
+    out = _git('diff', '--name-only', '--no-renames', rev, '--', pathspec, cwd=cwd)
+    return [root / line for line in out.splitlines() if line]
+
+
+def changed_lines(rev: str, pathspec: str = '*.md',
+                  cwd: Optional[Path] = None) -> Dict[Path, Set[int]]:
+    """Lines added or modified since ``rev``, by absolute file path.
+
+    Line numbers are those of the current version. Deleted files, and
+    files where lines were only removed, aren't included.
+    """
+    root = repo_root(cwd).resolve()
+    out = _git('diff', '--no-color', '--no-ext-diff', '--no-renames', '-U0',
+               '--src-prefix=a/', '--dst-prefix=b/', rev, '--', pathspec, cwd=cwd)
+
+    lines: Dict[Path, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    for line in out.splitlines():
+        if line.startswith('+++ '):
+            target = line[4:]
+            current = None if target == '/dev/null' else lines.setdefault(root / target[2:], set())
+            continue
+        match = HUNK_RE.match(line)
+        if match and current is not None:
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            current.update(range(start, start + count))
+    return {path: numbers for path, numbers in lines.items() if numbers}
+
+
+def split_changed_links(links: List[Dict],
+                        changed: Dict[Path, Set[int]]) -> Tuple[List[Dict], List[Dict]]:
+    """(links on changed lines, all other links) for links.json records"""
+    resolved: Dict[str, Path] = {}
+    fresh, rest = [], []
+    for link in links:
+        file_path = link.get('file_path') or ''
+        path = resolved.get(file_path)
+        if path is None:
+            path = resolved[file_path] = Path(file_path).resolve()
+        if link.get('line_number') in changed.get(path, ()):
+            fresh.append(link)
+        else:
+            rest.append(link)
+    return fresh, rest
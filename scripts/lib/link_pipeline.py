@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+In-process link validation pipeline.
+
+Runs the link-validation scripts as stages of one program instead of one
+``python`` subprocess each:
+
+    extract -> validate -> relevance -> repair -> report
+
+All stages share one event loop and one pooled aiohttp session, and each
+stage's output (the same dicts the scripts write as links.json,
+validation.json, relevance.json and repairs.json) is handed to the next in
+memory. The JSON files are optional artifacts, written only when an
+``artifacts_dir`` is given. Stage logs appear as they happen rather than when
+a subprocess exits.
+
+Each stage's wall time and peak Python memory (tracemalloc) are recorded and
+logged at the end.
+
+Stages are cached make-style. A stage's fingerprint covers its inputs: the
+post files (extract), the outputs of the stages before it, the stage script's
+source, the scripts/lib modules and the options that change its output. After a successful run the
+fingerprint and output are kept under ``.cache/link-validation/pipeline``;
+next time a stage whose fingerprint matches is reused instead of rerun.
+Network-backed stages (validate, repair) are only reused while their last run
+is younger than ``NETWORK_TTL``, so link health is still rechecked daily.
+
+Usage:
+    from link_pipeline import LinkPipeline
+
+    pipeline = LinkPipeline(Path('src/posts'), artifacts_dir=Path('.'))
+    data = asyncio.run(pipeline.run())   # {'extract': {...}, 'validate': {...}, ...}
+    pipeline.log_timings()
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from logging_config import setup_logger
+from occurrence_index import OccurrenceIndex, index_path
+from page_cache import PageCache
+from repair_cache import DEFAULT_CACHE_DIR
+from validation_history import ValidationHistory
+
+logger = setup_logger(__name__)
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / 'link-validation'
+LIB_DIR = Path(__file__).resolve().parent
+
+DAY = 24 * 60 * 60
+
+
+def lib_digest() -> str:
+    """Hash of every scripts/lib module; the stages import them"""
+    h = hashlib.sha256()
+    for module in sorted(LIB_DIR.glob('*.py')):
+        h.update(module.name.encode('utf-8'))
+        h.update(hashlib.sha256(module.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def digest(data) -> str:
+    """Stable hash of a stage output, ignoring when it was produced"""
+    if isinstance(data, dict):
+        data = {k: v for k, v in data.items() if not k.endswith('_date')}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+_modules: Dict[str, object] = {}
+
+
+def load_stage(filename: str):
+    """Import a hyphenated script from scripts/link-validation/ by filename"""
+    if filename not in _modules:
+        path = SCRIPTS_DIR / filename
+        spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _modules[filename] = module
+    return _modules[filename]
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float
+    peak_mb: float
+    status: str  # 'ok', 'failed' or 'reused'
+
+
+class LinkPipeline:
+    """Extract, validate, score, repair and report in one process"""
+
+    # Stage name -> artifact file name
+    ARTIFACTS = {
+        'extract': 'links.json',
+        'validate': 'validation.json',
+        'relevance': 'relevance.json',
+        'repair': 'repairs.json',
+    }
+
+    # Stage -> (script, upstream stages, max age for reuse or None)
+    STAGES = {
+        'extract': ('link-extractor.py', (), None),
+        'validate': ('link-validator.py', ('extract',), DAY),
+        'relevance': ('content-relevance-checker.py', ('extract', 'validate'), None),
+        'repair': ('citation-repair.py', ('extract', 'validate', 'relevance'), DAY),
+        'report': ('link-report-generator.py', ('extract', 'validate', 'relevance', 'repair'), None),
+    }
+    # Bump to invalidate every stored stage
+    STATE_VERSION = 1
+
+    # What later stages see when an optional stage fails
+    FALLBACKS = {
+        'validate': {'results': []},
+        'relevance': {'results': []},
+        'repair': {'repairs': []},
+    }
+
+    def __init__(self, posts_dir: Path, reports_dir: Path = Path('reports'),
+                 artifacts_dir: Optional[Path] = None,
+                 page_cache: Optional[PageCache] = None,
+                 repair_concurrency: int = 5, verify: bool = True,
+                 cache_dir: Optional[Path] = None,
+                 state_dir: Optional[Path] = None, reuse: bool = True):
+        self.posts_dir = posts_dir
+        self.reports_dir = reports_dir
+        self.artifacts_dir = artifacts_dir
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.repair_concurrency = repair_concurrency
+        self.verify = verify
+        # Repair caches; None for the default .cache/link-validation
+        self.cache_dir = cache_dir
+        # Fingerprints and outputs of the last successful run of each stage
+        self.state_dir = state_dir or (cache_dir or DEFAULT_CACHE_DIR) / 'pipeline'
+        self.reuse = reuse
+        self.data: Dict[str, Dict] = {}
+        self.timings: List[StageTiming] = []
+        self.saved_seconds = 0.0
+        self._lib_digest: Optional[str] = None
+
+    @contextmanager
+    def timed(self, name: str):
+        """Record wall time and peak traced memory of the enclosed block"""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        status = 'failed'
+        try:
+            yield
+            status = 'ok'
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            self.timings.append(StageTiming(name, round(time.perf_counter() - start, 3),
+                                            round(peak / 2**20, 1), status))
+
+    async def run(self) -> Dict[str, Dict]:
+        """Run (or reuse) every stage; returns each stage's output by stage name"""
+        validator_module = load_stage('link-validator.py')
+        session = validator_module.LinkValidator.create_session(limit=20)
+        tracemalloc.start()
+        try:
+            async with session:
+                await self._stage('extract', self._extract, required=True)
+                await self._stage('validate', lambda: self._validate(session))
+                await self._stage('relevance', self._relevance)
+                await self._stage('repair', lambda: self._repair(session))
+                await self._stage('report', self._report)
+        finally:
+            tracemalloc.stop()
+            self.page_cache.close()
+        return self.data
+
+    async def _stage(self, name: str, run: Callable, required: bool = False):
+        fingerprint = self.fingerprint(name)
+        stored = self._load_state(name, fingerprint)
+        if stored is not None:
+            self.data[name] = stored['data']
+            self.timings.append(StageTiming(name, 0.0, 0.0, 'reused'))
+            self.saved_seconds += stored['seconds']
+            logger.info(f"\n♻️  {name}: inputs unchanged, reusing the last run "
+                        f"({stored['seconds']:.1f}s saved)")
+            self._write_artifact(name)
+            return
+
+        logger.info(f"\n▶️  {name}")
+        try:
+            with self.timed(name):
+                self.data[name] = await run()
+        except Exception as e:
+            if required:
+                raise
+            logger.warning(f"⚠️  {name} failed, continuing: {e}")
+            self.data[name] = self.FALLBACKS.get(name, {})
+        else:
+            self._save_state(name, fingerprint, self.timings[-1].seconds)
+        self._write_artifact(name)
+
+    def _options(self, name: str) -> Dict:
+        """Settings that change a stage's output"""
+        if name == 'extract':
+            return {'posts_dir': str(self.posts_dir)}
+        if name == 'repair':
+            return {'verify': self.verify}
+        if name == 'report':
+            return {'reports_dir': str(self.reports_dir)}
+        return {}
+
+    def fingerprint(self, name: str) -> str:
+        """Hash of everything a stage's output depends on"""
+        script, upstream, _ = self.STAGES[name]
+        h = hashlib.sha256()
+        h.update(f'{self.STATE_VERSION}:{name}:'.encode('utf-8'))
+        h.update((SCRIPTS_DIR / script).read_bytes())
+        if self._lib_digest is None:
+            self._lib_digest = lib_digest()
+        h.update(self._lib_digest.encode('utf-8'))
+        h.update(json.dumps(self._options(name), sort_keys=True).encode('utf-8'))
+        for stage in upstream:
+            h.update(digest(self.data[stage]).encode('utf-8'))
+        if name == 'extract':
+            for post in sorted(self.posts_dir.glob('*.md')):
+                h.update(post.name.encode('utf-8'))
+                h.update(hashlib.sha256(post.read_bytes()).digest())
+        return h.hexdigest()
+
+    def _state_file(self, name: str) -> Path:
+        return self.state_dir / f'{name}.json'
+
+    def _load_state(self, name: str, fingerprint: str) -> Optional[Dict]:
+        """Stored run of ``name`` if its fingerprint matches and it is fresh"""
+        if not self.reuse:
+            return None
+        try:
+            with open(self._state_file(name), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        max_age = self.STAGES[name][2]
+        if state.get('fingerprint') != fingerprint:
+            return None
+        if max_age is not None and time.time() - state.get('finished_at', 0) > max_age:
+            return None
+        if name == 'report' and not (self.reports_dir / 'summary.md').exists():
+            return None
+        return state
+
+    def _save_state(self, name: str, fingerprint: str, seconds: float):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self._state_file(name)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'finished_at': time.time(),
+                       'seconds': seconds, 'data': self.data[name]}, f)
+        os.replace(tmp, path)
+
+    def _write_artifact(self, name: str):
+        if self.artifacts_dir is None or name not in self.ARTIFACTS:
+            return
+        self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        path = self.artifacts_dir / self.ARTIFACTS[name]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.data[name], f, indent=2)
+        if name == 'extract':
+            OccurrenceIndex.from_links(self.data[name]['links']).save(index_path(path), path)
+        logger.info(f"💾 {path}")
+
+    async def _extract(self) -> Dict:
+        extractor = load_stage('link-extractor.py').LinkExtractor(self.posts_dir)
+        extractor.extract_all()
+        logger.info(f"📎 {len(extractor.links)} links from {extractor.stats['total_files']} posts")
+        return extractor.results_data()
+
+    async def _validate(self, session) -> Dict:
+        validator = load_stage('link-validator.py').LinkValidator(page_cache=self.page_cache)
+        await validator.initialize(session)
+        try:
+            results = await validator.validate_batch(self.data['extract']['links'])
+        finally:
+            await validator.cleanup()
+        stats = validator.stats
+        logger.info(f"🔍 {stats['total']} checked: {stats['valid']} valid, {stats['broken']} broken, "
+                    f"{stats['redirects']} redirected, {stats['restricted']} restricted")
+        return validator.results_data(results)
+
+    async def _relevance(self) -> Dict:
+        module = load_stage('content-relevance-checker.py')
+        if not module.NUMPY_AVAILABLE:
+            raise RuntimeError('numpy is required for the relevance check')
+        checker = module.RelevanceChecker(self.page_cache)
+        results = checker.check(self.data['extract'], self.data['validate'])
+        checker.log_summary()
+        return checker.results_data(results)
+
+    async def _repair(self, session) -> Dict:
+        module = load_stage('citation-repair.py')
+        stores = {'cache_dir': self.cache_dir} if self.cache_dir else {}
+        repair_tool = module.CitationRepair.with_persistent_stores(
+            max_concurrency=self.repair_concurrency, pages=self.page_cache, **stores
+        )
+        await repair_tool.initialize(session)
+        try:
+            repairs = await repair_tool.run(
+                self.data['extract'], self.data['validate'], self.data['relevance'],
+                verify=self.verify
+            )
+        finally:
+            await repair_tool.cleanup()
+            repair_tool.close_stores()
+        repair_tool.log_summary()
+        return repair_tool.results_data(repairs)
+
+    async def _report(self) -> Dict:
+        history = ValidationHistory((self.cache_dir or DEFAULT_CACHE_DIR) / 'history.sqlite')
+        generator = load_stage('link-report-generator.py').ReportGenerator(self.page_cache, history)
+        try:
+            generator.generate_all_reports(
+                self.data['extract'], self.data['validate'], self.data['relevance'],
+                self.data['repair'], self.reports_dir
+            )
+        finally:
+            history.close()
+        return {}
+
+    def log_timings(self):
+        logger.info("\n⏱️  Stage timings")
+        for timing in self.timings:
+            marker = '' if timing.status == 'ok' else f'  ({timing.status})'
+            logger.info(f"   {timing.name:<10} {timing.seconds:8.2f}s   "
+                        f"peak {timing.peak_mb:8.1f} MB{marker}")
+        logger.info(f"   {'total':<10} {sum(t.seconds for t in self.timings):8.2f}s")
+        reused = [t.name for t in self.timings if t.status == 'reused']
+        if reused:
+            logger.info(f"♻️  Reused {', '.join(reused)}: {self.saved_seconds:.1f}s saved")
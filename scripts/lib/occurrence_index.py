@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Where every extracted URL occurs: URL -> file, line and position records.
+
+links.json has one record per link occurrence. Finding the posts that use a
+URL meant scanning all of them, and batch-link-fixer.py built a
+``{url: file_path}`` dict in which the last occurrence won. A repair for a
+URL cited in several posts therefore fixed only one of them.
+
+The extractor now writes this index once, next to its output
+(``links.json`` -> ``links.index.json``), and consumers look URLs up in a
+dict. Each URL keeps every occurrence in extraction order, plus the link text
+and context of its first occurrence for review listings. The index records
+the SHA-256 of the links.json it was built with. If links.json changes and
+no longer matches, the index is rebuilt from it.
+
+Usage:
+    from occurrence_index import OccurrenceIndex
+
+    index = OccurrenceIndex.for_links_file(Path('links.json'))
+    index.files(url)        # ['src/posts/a.md', 'src/posts/b.md']
+    index.occurrences(url)  # [{'file_path', 'line_number', 'position'}, ...]
+    index.context(url)      # {'text', 'context_before', 'context_after'}
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def index_path(links_file: Path) -> Path:
+    """Index file that belongs to ``links_file`` (links.json -> links.index.json)"""
+    return links_file.with_name(f'{links_file.stem}.index.json')
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class OccurrenceIndex:
+    """URL -> every occurrence of it in the posts"""
+
+    VERSION = 1
+    CONTEXT_KEYS = ('text', 'context_before', 'context_after')
+
+    def __init__(self, urls: Dict[str, Dict], links_sha256: Optional[str] = None):
+        self.urls = urls
+        self.links_sha256 = links_sha256  # of the links.json this indexes
+
+    @classmethod
+    def from_links(cls, links: Iterable) -> 'OccurrenceIndex':
+        """Build from link dicts (links.json records) or LinkContext objects"""
+        urls: Dict[str, Dict] = {}
+        for link in links:
+            get = link.get if isinstance(link, dict) else partial(getattr, link)
+            url = get('url')
+            entry = urls.get(url)
+            if entry is None:
+                entry = urls[url] = {'occurrences': []}
+                entry.update((key, get(key) or '') for key in cls.CONTEXT_KEYS)
+            entry['occurrences'].append({
+                'file_path': get('file_path'),
+                'line_number': get('line_number'),
+                'position': get('position'),
+            })
+        return cls(urls)
+
+    def save(self, path: Path, links_file: Optional[Path] = None):
+        """Write the index; ``links_file`` is the links.json it belongs to"""
+        if links_file is not None:
+            self.links_sha256 = file_digest(links_file)
+        tmp = path.with_name(f'.{path.name}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'created_date': datetime.now().isoformat(),
+                       'links_sha256': self.links_sha256, 'urls': self.urls}, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'OccurrenceIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f'{path}: unsupported index version {data.get("version")}')
+        return cls(data['urls'], data.get('links_sha256'))
+
+    @classmethod
+    def for_links_file(cls, links_file: Path) -> 'OccurrenceIndex':
+        """Index for ``links_file``, built (and saved) from it only if missing or stale"""
+        path = index_path(links_file)
+        try:
+            index = cls.load(path)
+            if index.links_sha256 == file_digest(links_file):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+
+        logger.info(f"Indexing {links_file} (no up-to-date {path.name})")
+        with open(links_file, 'r', encoding='utf-8') as f:
+            index = cls.from_links(json.load(f).get('links', []))
+        try:
+            index.save(path, links_file)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not save {path}: {e}")
+        return index
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.urls
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def occurrences(self, url: str) -> List[Dict]:
+        entry = self.urls.get(url)
+        return entry['occurrences'] if entry else []
+
+    def files(self, url: str) -> List[str]:
+        """Files ``url`` occurs in, each once, in extraction order"""
+        return list(dict.fromkeys(o['file_path'] for o in self.occurrences(url)))
+
+    def context(self, url: str) -> Dict:
+        """Link text and context of the first occurrence ({} if unknown)"""
+        entry = self.urls.get(url)
+        return {key: entry[key] for key in self.CONTEXT_KEYS} if entry else {}
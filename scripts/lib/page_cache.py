@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Page bodies fetched by the link validator, shared by later pipeline stages.
+
+``link-validator.py`` already reads a bounded prefix of every HTML page it
+checks. Storing it here lets the relevance checker, citation repair and the
+report generator work from the same bytes, so a pipeline run fetches each URL
+once.
+
+The store is content-addressed:
+
+- Each fetch is recorded under the canonical URL and its fetch time, along
+  with the HTTP status and the SHA-256 of the body. The last few fetches of a
+  URL are kept, so a page that has since died still has its last good copy.
+- Bodies are gzip-compressed and stored once per hash. Identical pages
+  (mirrors, soft-404 templates, one page reached through several URLs)
+  take the space of one.
+- The compressed total is capped; when it is exceeded, the least recently
+  read or written bodies are evicted, along with the fetches that point at
+  them.
+
+Layout under ``root``: ``index.sqlite`` plus ``blobs/<hh>/<sha256>.gz``.
+
+Usage:
+    from page_cache import PageCache
+
+    cache = PageCache()
+    cache.put(url, html, status=200)
+    html = cache.get(url)                 # None if no fetch was stored
+    html = cache.get(url, max_age=86400)  # only if fetched in the last day
+    fetch = cache.latest(url)             # {'fetched_at', 'status', 'body_hash', ...}
+    cache.close()
+
+    html = await read_body(response)      # bounded body of an aiohttp response
+"""
+
+import gzip
+import hashlib
+import html
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_PAGE_DIR = REPO_ROOT / '.cache' / 'link-validation' / 'pages'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_access ON blobs(last_access);
+CREATE TABLE IF NOT EXISTS fetches (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    status INTEGER,
+    body_hash TEXT NOT NULL REFERENCES blobs(hash),
+    PRIMARY KEY (url, fetched_at)
+);
+CREATE INDEX IF NOT EXISTS fetches_body_hash ON fetches(body_hash);
+"""
+
+# Upper bound on how much of a response body is read. Enough for the
+# <title>, paywall banners, the ids and the text of any ordinary article page.
+MAX_BODY_BYTES = 2 * 1024 * 1024
+BODY_CHUNK_BYTES = 64 * 1024
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def canonical_url(url: str) -> str:
+    """Store key for a URL: scheme and host lower-cased, default port and
+    fragment dropped, empty path as ``/``. Path and query are kept as-is."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+def page_title(body: str) -> str:
+    """Whitespace-normalized <title> of an HTML page, '' if it has none"""
+    match = TITLE_RE.search(body or '')
+    return html.unescape(' '.join(match.group(1).split())) if match else ''
+
+
+async def read_body(response, limit: int = MAX_BODY_BYTES) -> str:
+    """First ``limit`` bytes of an aiohttp response body, decoded.
+
+    ``response.content.read(n)`` returns only what is already buffered,
+    usually the first network chunk, so chunks are read until the limit or EOF.
+    """
+    chunks, size = [], 0
+    async for chunk in response.content.iter_chunked(BODY_CHUNK_BYTES):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b''.join(chunks)[:limit].decode(response.charset or 'utf-8', errors='replace')
+
+
+class PageCache:
+    """Compressed, deduplicated, size-capped store of fetched page bodies"""
+
+    MAX_BYTES = 256 * 1024 * 1024   # compressed bodies on disk
+    MAX_VERSIONS = 3                # fetches remembered per URL
+    COMMIT_EVERY = 200              # index writes per transaction; close() commits the rest
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = MAX_BYTES):
+        self.root = root or DEFAULT_PAGE_DIR
+        self.max_bytes = max_bytes
+        self.stats = {'stored': 0, 'deduplicated': 0, 'hits': 0, 'misses': 0, 'evicted': 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total = 0  # compressed bytes, read from the index on open
+        self._pending = 0  # index writes since the last commit
+
+    def _db(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Open the index; readers don't create a store that doesn't exist"""
+        if self._conn is None:
+            path = self.root / 'index.sqlite'
+            if not create and not path.exists():
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path))
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(SCHEMA)
+            self._total = self._stored_bytes()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+            self._pending = 0
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / 'blobs' / digest[:2] / f'{digest}.gz'
+
+    def put(self, url: str, body: str, status: int = 200,
+            fetched_at: Optional[float] = None) -> str:
+        """Record a fetch of ``url``; returns the body's hash"""
+        db = self._db(create=True)
+        now = time.time()
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        if db.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone():
+            db.execute('UPDATE blobs SET last_access = ? WHERE hash = ?', (now, digest))
+            self.stats['deduplicated'] += 1
+        else:
+            compressed = gzip.compress(data, compresslevel=6, mtime=0)
+            path = self._blob_path(digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+            db.execute('INSERT INTO blobs (hash, size, stored_size, last_access) VALUES (?, ?, ?, ?)',
+                       (digest, len(data), len(compressed), now))
+            self._total += len(compressed)
+            self.stats['stored'] += 1
+
+        key = canonical_url(url)
+        # Bodies this URL's fetches point at; replacing or trimming may orphan them
+        before = {row['body_hash'] for row in db.execute(
+            'SELECT body_hash FROM fetches WHERE url = ?', (key,))}
+        db.execute('INSERT OR REPLACE INTO fetches (url, fetched_at, status, body_hash) '
+                   'VALUES (?, ?, ?, ?)', (key, fetched_at or now, status, digest))
+        db.execute('DELETE FROM fetches WHERE url = ? AND fetched_at NOT IN '
+                   '(SELECT fetched_at FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT ?)',
+                   (key, key, self.MAX_VERSIONS))
+        self._drop_orphans(before | {digest})
+        self._evict()
+        self._wrote()
+        return digest
+
+    def latest(self, url: str) -> Optional[Dict]:
+        """Most recent fetch of ``url``: url, fetched_at, status, body_hash"""
+        db = self._db(create=False)
+        if db is None:
+            return None
+        row = db.execute('SELECT * FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT 1',
+                         (canonical_url(url),)).fetchone()
+        return dict(row) if row else None
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Body of the latest fetch of ``url`` (no older than ``max_age`` seconds)"""
+        fetch = self.latest(url)
+        if fetch is None or (max_age is not None and time.time() - fetch['fetched_at'] > max_age):
+            self.stats['misses'] += 1
+            return None
+        try:
+            data = gzip.decompress(self._blob_path(fetch['body_hash']).read_bytes())
+        except (OSError, EOFError, gzip.BadGzipFile):
+            # Blob lost underneath us: forget the fetches that point at it
+            self._forget_blob(fetch['body_hash'])
+            self._wrote()
+            self.stats['misses'] += 1
+            return None
+        self._conn.execute('UPDATE blobs SET last_access = ? WHERE hash = ?',
+                           (time.time(), fetch['body_hash']))
+        self._wrote()
+        self.stats['hits'] += 1
+        return data.decode('utf-8')
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute('SELECT COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()[0]
+
+    def _forget_blob(self, digest: str):
+        row = self._conn.execute('SELECT stored_size FROM blobs WHERE hash = ?', (digest,)).fetchone()
+        self._conn.execute('DELETE FROM fetches WHERE body_hash = ?', (digest,))
+        self._conn.execute('DELETE FROM blobs WHERE hash = ?', (digest,))
+        if row:
+            self._total -= row['stored_size']
+        try:
+            self._blob_path(digest).unlink()
+        except OSError:
+            pass
+
+    def _wrote(self):
+        """Count an index write, committing every ``COMMIT_EVERY``"""
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def _drop_orphans(self, hashes):
+        """Remove those of ``hashes`` no remembered fetch refers to any more"""
+        for digest in hashes:
+            if not self._conn.execute('SELECT 1 FROM fetches WHERE body_hash = ? LIMIT 1',
+                                      (digest,)).fetchone():
+                self._forget_blob(digest)
+
+    def _evict(self):
+        """Drop least recently used bodies until the store fits ``max_bytes``"""
+        while self._total > self.max_bytes:
+            row = self._conn.execute(
+                'SELECT hash FROM blobs ORDER BY last_access LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            self._forget_blob(row['hash'])
+            self.stats['evicted'] += 1
+
+    def __len__(self) -> int:
+        db = self._db(create=False)
+        return db.execute('SELECT COUNT(*) FROM blobs').fetchone()[0] if db else 0
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of citation-repair outcomes.
+
+Entries are keyed by ``<url>:<issue_type>`` -- the same key the in-memory
+cache in citation-repair.py used -- and survive between runs. Both outcomes
+are stored: a suggestion, and "no fix found" (negative caching), each with
+its own TTL, so a link nothing could repair is not searched against arXiv,
+CrossRef and Wayback again on every run.
+
+Every entry records a fingerprint of the prose the link appears in. Repair
+strategies mine titles, authors and DOIs from that context, so when it
+changes the cached outcome no longer applies and the entry is dropped.
+
+Usage:
+    from repair_cache import RepairCache, context_fingerprint
+
+    cache = RepairCache()
+    hit, suggestion = cache.get(url, issue_type, fingerprint)
+    if not hit:
+        suggestion = search(...)
+        cache.put(url, issue_type, fingerprint, suggestion)
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = REPO_ROOT / '.cache' / 'link-validation'
+
+DAY = 24 * 60 * 60
+
+
+def context_fingerprint(links: Iterable[Dict]) -> str:
+    """Fingerprint of the text and context around every occurrence of a link"""
+    parts = sorted(
+        '\x1f'.join((link.get('text', ''), link.get('context_before', ''),
+                     link.get('context_after', '')))
+        for link in links
+    )
+    return hashlib.sha256('\x1e'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class RepairCache:
+    """JSON-backed store of repair suggestions and "no fix" outcomes"""
+
+    VERSION = 1
+    FOUND_TTL = 30 * DAY      # suggestions: sources rarely move twice a month
+    NOT_FOUND_TTL = 7 * DAY   # misses: retry weekly in case an archive appears
+
+    def __init__(self, path: Optional[Path] = None,
+                 found_ttl: float = FOUND_TTL, not_found_ttl: float = NOT_FOUND_TTL):
+        self.path = path or DEFAULT_CACHE_DIR / 'repairs.json'
+        self.found_ttl = found_ttl
+        self.not_found_ttl = not_found_ttl
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0,
+                      'expired': 0, 'invalidated': 0}
+        self._entries: Dict[str, Dict] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.VERSION:
+            return {}
+        return data.get('entries', {})
+
+    @staticmethod
+    def key(url: str, issue_type: str) -> str:
+        return f"{url}:{issue_type}"
+
+    def get(self, url: str, issue_type: str,
+            fingerprint: str) -> Tuple[bool, Optional[Dict]]:
+        """Return (hit, suggestion); a hit with None is a cached "no fix"."""
+        key = self.key(url, issue_type)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return False, None
+
+        suggestion = entry.get('suggestion')
+        ttl = self.found_ttl if suggestion else self.not_found_ttl
+        if time.time() - entry.get('stored_at', 0) > ttl:
+            self.stats['expired'] += 1
+        elif entry.get('context') != fingerprint:
+            self.stats['invalidated'] += 1
+        else:
+            self.stats['hits' if suggestion else 'negative_hits'] += 1
+            return True, suggestion
+
+        del self._entries[key]
+        self._dirty = True
+        self.stats['misses'] += 1
+        return False, None
+
+    def contains(self, url: str, issue_type: str, fingerprint: str) -> bool:
+        """Whether ``get`` would hit, without touching stats or entries"""
+        entry = self._entries.get(self.key(url, issue_type))
+        if entry is None or entry.get('context') != fingerprint:
+            return False
+        ttl = self.found_ttl if entry.get('suggestion') else self.not_found_ttl
+        return time.time() - entry.get('stored_at', 0) <= ttl
+
+    def put(self, url: str, issue_type: str, fingerprint: str,
+            suggestion: Optional[Dict]):
+        self._entries[self.key(url, issue_type)] = {
+            'suggestion': suggestion,
+            'context': fingerprint,
+            'stored_at': time.time(),
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the cache atomically; a no-op when nothing changed"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': self._entries}, f)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
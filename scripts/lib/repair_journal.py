@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Journal of the post edits made by one batch-link-fixer.py run.
+
+Repairs rewrite posts in place. Each post is written to a temporary file
+beside it, flushed and renamed over the original, so neither a reader nor a
+crash ever sees a half-written post. Rather than leaving a timestamped
+``.bak`` copy beside every post, a run keeps one journal. It lists every file
+changed, with the SHA-256 of its content before and after. The original
+contents are stored once each, gzip-compressed and addressed by hash.
+
+The journal is rewritten to disk each time a file is recorded, before that
+file is replaced, so a run that dies partway can still be rolled back.
+
+``rollback(run_id)`` puts back every file the run changed. A file that was
+edited again after the run (its hash is no longer the "after" hash) is left
+alone and reported.
+
+Layout under ``root``: ``<run-id>.json`` plus ``blobs/<sha256>.gz``.
+
+Usage:
+    from repair_journal import RepairJournal, rollback
+
+    journal = RepairJournal()
+    journal.record(path, before_bytes, after_bytes)   # thread-safe; saves
+    print(journal.run_id)
+
+    result = rollback('20260101-120000-ab12cd')       # {'restored': [...], ...}
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from repair_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_JOURNAL_DIR = DEFAULT_CACHE_DIR / 'runs'
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic(path: Path, data: bytes):
+    """Replace ``path`` with ``data`` via a flushed temp file and a rename"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class RepairJournal:
+    """Before/after hashes of every file one run changed, with the originals"""
+
+    def __init__(self, root: Optional[Path] = None, run_id: Optional[str] = None):
+        self.root = root or DEFAULT_JOURNAL_DIR
+        self.run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(3)}"
+        self.files: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.root / f'{self.run_id}.json'
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / 'blobs' / f'{digest}.gz'
+
+    def _store(self, data: bytes) -> str:
+        digest = sha256(data)
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, gzip.compress(data, mtime=0))
+        return digest
+
+    def record(self, path: Path, before: bytes, after: bytes):
+        """Note that ``path`` goes from ``before`` to ``after``; call before writing it.
+
+        The journal is on disk when this returns.
+        """
+        entry = {'path': str(Path(path).resolve()), 'before': self._store(before),
+                 'after': sha256(after)}
+        with self._lock:
+            self.files.append(entry)
+            self._write()
+
+    def save(self):
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        journal = {'run_id': self.run_id, 'created_date': datetime.now().isoformat(),
+                   'files': sorted(self.files, key=lambda entry: entry['path'])}
+        write_atomic(self.path, json.dumps(journal, indent=2).encode('utf-8'))
+
+    @classmethod
+    def load(cls, run_id: str, root: Optional[Path] = None) -> 'RepairJournal':
+        journal = cls(root, run_id)
+        with open(journal.path, 'r', encoding='utf-8') as f:
+            journal.files = json.load(f)['files']
+        return journal
+
+    def original(self, entry: Dict) -> bytes:
+        return gzip.decompress(self._blob_path(entry['before']).read_bytes())
+
+
+def rollback(run_id: str, root: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Restore every file changed by run ``run_id``.
+
+    Returns the paths that were 'restored', were 'unchanged' (already back to
+    their original content) and were 'skipped' (edited again since the run,
+    or deleted).
+    """
+    journal = RepairJournal.load(run_id, root)
+    result = {'restored': [], 'unchanged': [], 'skipped': []}
+    for entry in journal.files:
+        path = Path(entry['path'])
+        try:
+            current = sha256(path.read_bytes())
+        except OSError:
+            result['skipped'].append(entry['path'])
+            continue
+        if current == entry['before']:
+            result['unchanged'].append(entry['path'])
+        elif current == entry['after']:
+            write_atomic(path, journal.original(entry))
+            result['restored'].append(entry['path'])
+        else:
+            result['skipped'].append(entry['path'])
+    return result
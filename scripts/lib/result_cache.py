@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Last known validation result of every URL, for incremental (--since) runs.
+
+Every validator run stores its fresh results here, newest winning. A run
+with ``--since <git-rev>`` validates only the links on lines changed since
+that revision, plus any URL the cache has never seen, and serves the stored
+result for every other link. PR feedback then takes as long as the PR's
+own links, however large the archive grows.
+
+link-validator.py and simple-validator.py classify differently, so each
+keeps its own file.
+
+Usage:
+    from result_cache import ResultCache, plan_incremental
+
+    cache = ResultCache(DEFAULT_CACHE_DIR / 'link-validator-results.json')
+    to_validate, cached = plan_incremental(links, changed, cache)
+    ...
+    cache.update(fresh_results)
+    cache.save()
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from git_changes import split_changed_links
+from repair_journal import write_atomic
+
+
+class ResultCache:
+    """JSON-backed store of the latest result dict per URL"""
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.results: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.VERSION:
+            return {}
+        return data.get('results', {})
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self.results.get(url)
+
+    def update(self, results: Iterable[Dict]):
+        for result in results:
+            if result and result.get('url'):
+                self.results[result['url']] = result
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': self.VERSION, 'updated_date': datetime.now().isoformat(),
+                'results': self.results}
+        write_atomic(self.path, json.dumps(data).encode('utf-8'))
+
+
+def plan_incremental(links: List[Dict], changed: Dict[Path, Set[int]], cache: ResultCache,
+                     url_of: Callable[[Dict], str] = lambda link: link['url']
+                     ) -> Tuple[List[Dict], List[Dict]]:
+    """(links to validate, cached results to serve) for a --since run.
+
+    Links on changed lines are validated, as are links whose URL has no
+    cached result. Every other URL gets its cached result, once.
+    """
+    to_validate, rest = split_changed_links(links, changed)
+    fresh_urls = {url_of(link) for link in to_validate}
+
+    cached: Dict[str, Dict] = {}
+    for link in rest:
+        url = url_of(link)
+        if url in fresh_urls or url in cached:
+            continue
+        result = cache.get(url)
+        if result is None:
+            to_validate.append(link)
+            fresh_urls.add(url)
+        else:
+            cached[url] = result
+    return to_validate, list(cached.values())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Shared, rate-limited HTTP client for the scholarly APIs.
+
+One pooled ``aiohttp`` session serves every source in
+``CitationRepair.ACADEMIC_SOURCES``. Each API gets its own token bucket sized
+to its published limits, so repairs can run in parallel without tripping
+arXiv's one-request-per-three-seconds rule or CrossRef's polite pool.
+
+- Successful responses are cached on disk, keyed by the API and the
+  normalized query (parameter order, case and whitespace don't matter);
+  identical queries in flight at the same time share one request.
+- 429/503 responses are retried after ``Retry-After`` (seconds or HTTP date),
+  and the whole API is paused for that long, not just the one request.
+- Set ``SCHOLARLY_MAILTO`` to identify yourself: it is added to the
+  User-Agent and sent as CrossRef's ``mailto`` parameter (polite pool).
+
+Usage:
+    from scholarly_client import ScholarlyClient
+
+    client = ScholarlyClient(cache_dir=Path('.cache/link-validation/responses'))
+    await client.open()
+    status, body = await client.fetch('crossref', url, {'query': title, 'rows': '1'})
+    await client.close()
+    print(client.stats)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+DAY = 24 * 60 * 60
+
+# (requests per second, burst) per API
+RATE_LIMITS = {
+    'arxiv': (1 / 3, 1),            # arXiv API terms: one request every 3 s
+    'crossref': (5.0, 5),           # well under the polite pool's 50/s
+    'semantic_scholar': (1.0, 1),   # unauthenticated shared pool
+    'unpaywall': (5.0, 5),
+    'core': (1.0, 1),
+    'pmc': (3.0, 3),                # NCBI E-utilities without an API key
+}
+DEFAULT_RATE = (1.0, 1)
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take a token, sleeping until one is available; returns seconds waited"""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(self.paused_until - now, (1 - self.tokens) / self.rate, 0.0)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self.tokens = min(self.capacity, self.tokens + wait * self.rate)
+                self.updated = time.monotonic()
+            self.tokens -= 1
+            return wait
+
+    def pause(self, seconds: float):
+        """Hold every caller back, e.g. for a server's Retry-After"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    if not value:
+        return default
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+def query_key(api: str, url: str, params: Optional[Dict[str, str]]) -> str:
+    """Cache key: the API, the endpoint and its normalized parameters"""
+    normalized = sorted(
+        (str(k), ' '.join(str(v).lower().split())) for k, v in (params or {}).items()
+        if k != 'mailto'
+    )
+    raw = json.dumps([api, url.rstrip('/'), normalized])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ScholarlyClient:
+    """Pooled, per-API rate-limited client with an on-disk response cache"""
+
+    TTL = 7 * DAY
+    MAX_RETRIES = 3
+    USER_AGENT = 'CitationRepair/1.0 (https://williamzujkowski.github.io)'
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: float = TTL,
+                 rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 timeout: float = 30):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self.mailto = os.environ.get('SCHOLARLY_MAILTO', '')
+        limits = rate_limits if rate_limits is not None else RATE_LIMITS
+        self.buckets = {api: TokenBucket(*rate) for api, rate in limits.items()}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {'requests': 0, 'cache_hits': 0, 'retries': 0, 'throttled_seconds': 0.0}
+        self.api_stats: Dict[str, Dict[str, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._owns_session = True
+
+    async def open(self, session: Optional[aiohttp.ClientSession] = None):
+        """Open a pooled session, or borrow ``session`` (left open by ``close``)"""
+        self._owns_session = session is None
+        self.session = session or aiohttp.ClientSession(
+            # Reuse connections; a few per host keeps every API comfortable
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=4, ttl_dns_cache=300),
+        )
+
+    async def close(self):
+        if self.session and self._owns_session:
+            await self.session.close()
+        self.session = None
+
+    @property
+    def user_agent(self) -> str:
+        if self.mailto:
+            return f'{self.USER_AGENT[:-1]}; mailto:{self.mailto})'
+        return self.USER_AGENT
+
+    def _count(self, api: str, key: str, amount: float = 1):
+        self.stats[key] += amount
+        stats = self.api_stats.setdefault(
+            api, {'requests': 0, 'cache_hits': 0, 'retries': 0, 'throttled_seconds': 0.0}
+        )
+        stats[key] += amount
+
+    async def fetch(self, api: str, url: str,
+                    params: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
+        """GET ``url`` for ``api``; returns (status, body text).
+
+        Network failures surface as exceptions, like a bare session would.
+        """
+        params = dict(params or {})
+        if api == 'crossref' and self.mailto:
+            params['mailto'] = self.mailto
+        key = query_key(api, url, params)
+
+        cached = self._read_cache(api, key)
+        if cached is not None:
+            self._count(api, 'cache_hits')
+            return 200, cached
+
+        if key not in self._inflight:
+            self._inflight[key] = asyncio.ensure_future(self._request(api, url, params, key))
+        return await asyncio.shield(self._inflight[key])
+
+    async def fetch_json(self, api: str, url: str,
+                         params: Optional[Dict[str, str]] = None) -> Tuple[int, Optional[Dict]]:
+        status, body = await self.fetch(api, url, params)
+        return status, json.loads(body) if status == 200 and body else None
+
+    async def _request(self, api: str, url: str, params: Dict[str, str],
+                       key: str) -> Tuple[int, str]:
+        try:
+            return await self._get_with_retries(api, url, params, key)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _get_with_retries(self, api: str, url: str, params: Dict[str, str],
+                                key: str) -> Tuple[int, str]:
+        bucket = self.buckets.get(api)
+        if bucket is None:
+            bucket = self.buckets[api] = TokenBucket(*DEFAULT_RATE)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            self._count(api, 'throttled_seconds', await bucket.acquire())
+            self._count(api, 'requests')
+            # Per request, so a borrowed session keeps its own defaults
+            async with self.session.get(
+                url, params=params, headers={'User-Agent': self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                body = await response.text()
+                if response.status in (429, 503) and attempt < self.MAX_RETRIES:
+                    delay = retry_after_seconds(response.headers.get('Retry-After'), 2 ** (attempt + 1))
+                    bucket.pause(delay)
+                    self._count(api, 'retries')
+                    continue
+                if response.status == 200:
+                    self._write_cache(api, key, body)
+                return response.status, body
+
+    def _cache_file(self, api: str, key: str) -> Optional[Path]:
+        return self.cache_dir / api / f'{key}.json' if self.cache_dir else None
+
+    def _read_cache(self, api: str, key: str) -> Optional[str]:
+        path = self._cache_file(api, key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        return entry.get('body')
+
+    def _write_cache(self, api: str, key: str, body: str):
+        path = self._cache_file(api, key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': time.time(), 'body': body}, f)
+        os.replace(tmp, path)
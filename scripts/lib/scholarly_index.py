@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local index of scholarly works cited across the blog.
+
+A small SQLite database of DOIs, arXiv IDs, titles, authors and years, plus
+the URLs each work has been seen at. It is filled as citations are extracted
+and as CrossRef/arXiv responses arrive, so later runs answer these locally:
+
+- "which paper is this URL?" -- instead of regex-mining the post context;
+- "do these two URLs cite the same work?" -- e.g. an arXiv abstract and the
+  journal DOI of the same paper;
+- "do we already know a DOI/arXiv entry for this title?" -- instead of
+  another search request.
+
+Usage:
+    from scholarly_index import ScholarlyIndex
+
+    index = ScholarlyIndex(Path('.cache/link-validation/scholarly.sqlite'))
+    index.record(doi='10.1145/3379597', title='...', authors=['Ada Lovelace'], source='CrossRef')
+    work = index.lookup_url('https://doi.org/10.1145/3379597')
+    index.close()
+"""
+
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import unquote, urlparse
+
+DOI_RE = re.compile(r'10\.\d{4,9}/[^\s?#"<>]+', re.IGNORECASE)
+ARXIV_RE = re.compile(
+    r'(?:arxiv\.org/(?:abs|pdf|html)/|arxiv[:.])(\d{4}\.\d{4,5})(?:v\d+)?', re.IGNORECASE
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    id INTEGER PRIMARY KEY,
+    doi TEXT UNIQUE,
+    arxiv_id TEXT UNIQUE,
+    title TEXT,
+    title_key TEXT,
+    authors TEXT,
+    year TEXT,
+    source TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS works_title_key ON works(title_key);
+CREATE TABLE IF NOT EXISTS urls (
+    url_key TEXT PRIMARY KEY,
+    work_id INTEGER NOT NULL REFERENCES works(id)
+);
+"""
+
+
+def normalize_doi(text: str) -> Optional[str]:
+    """Lower-cased DOI found in a URL or string, trailing punctuation removed"""
+    match = DOI_RE.search(unquote(text or ''))
+    if not match:
+        return None
+    doi = match.group(0).rstrip('.,;:')
+    while doi.endswith(')') and doi.count('(') < doi.count(')'):
+        doi = doi[:-1]
+    return doi.lower()
+
+
+def arxiv_id(text: str) -> Optional[str]:
+    """Version-less arXiv identifier in a URL, ``arXiv:`` tag or arXiv DOI"""
+    match = ARXIV_RE.search(text or '')
+    return match.group(1) if match else None
+
+
+def title_key(title: str) -> str:
+    """Comparison form of a title: lower-case words, punctuation dropped"""
+    return ' '.join(re.findall(r'\w+', (title or '').lower()))
+
+
+def url_key(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.netloc.lower().removeprefix('www.') + parsed.path.rstrip('/')
+
+
+class ScholarlyIndex:
+    """SQLite-backed DOI / arXiv / title index; ``:memory:`` for a throwaway one"""
+
+    MIN_MERGE_TITLE_WORDS = 4
+
+    def __init__(self, path: Union[Path, str] = ':memory:'):
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.stats = {'lookups': 0, 'hits': 0, 'recorded': 0}
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def record(self, doi: Optional[str] = None, arxiv: Optional[str] = None,
+               title: Optional[str] = None, authors: Optional[List[str]] = None,
+               year: Optional[str] = None, url: Optional[str] = None,
+               source: str = '') -> Optional[int]:
+        """Insert or enrich a work, merging on DOI or arXiv ID; returns its id"""
+        doi = normalize_doi(doi) if doi else None
+        arxiv = arxiv_id(f'arxiv:{arxiv}') if arxiv else None
+        if arxiv is None and doi:
+            arxiv = arxiv_id(doi)  # 10.48550/arXiv.2401.01234
+        if not doi and not arxiv:
+            return None
+
+        existing = self._find_row(doi, arxiv)
+        if existing is None and title:
+            existing = self._find_by_title(title, doi, arxiv)
+        fields = {
+            'doi': doi, 'arxiv_id': arxiv, 'title': title,
+            'title_key': title_key(title) if title else None,
+            'authors': '; '.join(authors) if authors else None,
+            'year': str(year) if year else None, 'source': source or None,
+        }
+        if existing is None:
+            cursor = self.conn.execute(
+                'INSERT INTO works (doi, arxiv_id, title, title_key, authors, year, source, updated_at) '
+                'VALUES (:doi, :arxiv_id, :title, :title_key, :authors, :year, :source, :now)',
+                {**fields, 'now': time.time()}
+            )
+            work_id = cursor.lastrowid
+        else:
+            work_id = existing['id']
+            # Keep what we knew, fill in what we didn't
+            updates = {k: v for k, v in fields.items() if v and not existing[k]}
+            if source and source != 'corpus' and existing['source'] == 'corpus':
+                updates['source'] = source  # metadata now comes from an API
+            if updates:
+                assignments = ', '.join(f'{k} = :{k}' for k in updates)
+                try:
+                    self.conn.execute(
+                        f'UPDATE works SET {assignments}, updated_at = :now WHERE id = :id',
+                        {**updates, 'now': time.time(), 'id': work_id}
+                    )
+                except sqlite3.IntegrityError:
+                    # The identifier already belongs to another row; leave both as they are
+                    pass
+        if url:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO urls (url_key, work_id) VALUES (?, ?)',
+                (url_key(url), work_id)
+            )
+        self.stats['recorded'] += 1
+        return work_id
+
+    def record_links(self, links: Iterable[Dict]):
+        """Register every extracted link whose URL names a DOI or arXiv ID"""
+        for link in links:
+            url = link.get('url', '')
+            doi, arxiv = normalize_doi(url), arxiv_id(url)
+            if doi or arxiv:
+                self.record(doi=doi, arxiv=arxiv, url=url, source='corpus')
+        self.conn.commit()
+
+    def _find_row(self, doi: Optional[str], arxiv: Optional[str]) -> Optional[sqlite3.Row]:
+        if doi:
+            row = self.conn.execute('SELECT * FROM works WHERE doi = ?', (doi,)).fetchone()
+            if row:
+                return row
+        if arxiv:
+            return self.conn.execute('SELECT * FROM works WHERE arxiv_id = ?', (arxiv,)).fetchone()
+        return None
+
+    def _find_by_title(self, title: str, doi: Optional[str],
+                       arxiv: Optional[str]) -> Optional[sqlite3.Row]:
+        """Row for the same paper found through the other source (a preprint
+        from arXiv, its journal DOI from CrossRef), matched on a full title.
+        Short titles ("Introduction") are too ambiguous to merge on."""
+        key = title_key(title)
+        if len(key.split()) < self.MIN_MERGE_TITLE_WORDS:
+            return None
+        missing = 'doi' if doi and not arxiv else 'arxiv_id' if arxiv and not doi else None
+        if missing is None:
+            return None
+        return self.conn.execute(
+            f'SELECT * FROM works WHERE title_key = ? AND {missing} IS NULL', (key,)
+        ).fetchone()
+
+    def _work_id(self, url: str) -> Optional[int]:
+        row = self.conn.execute('SELECT work_id FROM urls WHERE url_key = ?', (url_key(url),)).fetchone()
+        if row:
+            return row['work_id']
+        found = self._find_row(normalize_doi(url), arxiv_id(url))
+        return found['id'] if found else None
+
+    def lookup_url(self, url: str) -> Optional[Dict]:
+        """Work a URL points at, if the index has seen it or its identifier"""
+        self.stats['lookups'] += 1
+        work_id = self._work_id(url)
+        if work_id is None:
+            return None
+        self.stats['hits'] += 1
+        return self._as_dict(self.conn.execute('SELECT * FROM works WHERE id = ?', (work_id,)).fetchone())
+
+    def lookup_title(self, title: str, need: Optional[str] = None) -> Optional[Dict]:
+        """Work with exactly this (normalized) title; ``need`` = 'doi' or 'arxiv_id'"""
+        key = title_key(title)
+        if not key:
+            return None
+        self.stats['lookups'] += 1
+        query = 'SELECT * FROM works WHERE title_key = ?'
+        if need in ('doi', 'arxiv_id'):
+            query += f' AND {need} IS NOT NULL'
+        row = self.conn.execute(query + ' ORDER BY updated_at DESC LIMIT 1', (key,)).fetchone()
+        if row is None:
+            return None
+        self.stats['hits'] += 1
+        return self._as_dict(row)
+
+    def same_work(self, url_a: str, url_b: str) -> Optional[bool]:
+        """Whether two URLs cite the same work; None unless both are indexed"""
+        a, b = self._work_id(url_a), self._work_id(url_b)
+        if a is None or b is None:
+            return None
+        return a == b
+
+    @staticmethod
+    def _as_dict(row: sqlite3.Row) -> Dict:
+        work = dict(row)
+        work['authors'] = work['authors'].split('; ') if work['authors'] else []
+        return work
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Offline resolution of links that point at this site.
+
+Links to ``/posts/<slug>``, site pages and static assets are checked against
+the source tree instead of over HTTP:
+
+- post slugs against ``src/posts/*.md`` (drafts are not published),
+- pages against ``astro-site/src/pages`` (including the dynamic
+  ``posts/[...slug]``, ``tags/[tag]`` and ``og/[slug].png`` routes),
+- static files against ``astro-site/public``.
+
+It also answers which element ids a post or page carries, so ``#fragment``
+links can be checked with a set lookup: post ids come from the markdown
+headings (slugged the way Astro's github-slugger does it), page ids from the
+literal ``id="..."`` attributes in the page and layout sources.
+
+Usage:
+    from lib.site_routes import SiteRoutes
+
+    routes = SiteRoutes()
+    if routes.is_internal(url):
+        exists = routes.exists(url)
+        ids = routes.anchors(url)
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Optional, Set
+from urllib.parse import unquote, urlparse
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SITE_HOST = 'williamzujkowski.github.io'
+
+# Files Astro integrations emit at build time with no source under pages/.
+GENERATED_ROUTES = frozenset({'/sitemap-index.xml', '/sitemap-0.xml'})
+
+PAGE_SUFFIXES = ('.astro', '.md', '.mdx', '.ts', '.js')
+DRAFT_RE = re.compile(r'^draft:\s*true\s*$', re.MULTILINE)
+
+HEADING_RE = re.compile(r'^ {0,3}#{1,6}\s+(.+?)(?:\s+#+)?\s*$')
+FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+FOOTNOTE_RE = re.compile(r'^\[\^([^\]]+)\]:', re.MULTILINE)
+ID_ATTR_RE = re.compile(r'\bid\s*=\s*["\']([^"\'{}]+)["\']')
+
+
+def github_slug(text: str) -> str:
+    """Slug a heading the way github-slugger (Astro's heading ids) does"""
+    return re.sub(r'[^\w\- ]', '', text.lower()).replace(' ', '-')
+
+
+def _heading_text(raw: str) -> str:
+    """Rendered text of a markdown heading: links, tags and markers dropped"""
+    text = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', raw)
+    text = re.sub(r'<[^>]+>', '', text)
+    return re.sub(r'[*`~]', '', text).strip()
+
+
+def heading_ids(markdown: str) -> Set[str]:
+    """Element ids a rendered post exposes: headings, raw HTML ids, footnotes"""
+    ids: Set[str] = set()
+    occurrences: Dict[str, int] = {}
+    fence = None
+
+    for line in markdown.split('\n'):
+        opening = FENCE_RE.match(line)
+        if opening:
+            marker = opening.group(1)[0]
+            if fence is None:
+                fence = marker
+            elif fence == marker:
+                fence = None
+            continue
+        if fence:
+            continue
+
+        heading = HEADING_RE.match(line)
+        if heading:
+            # github-slugger de-duplicates repeats as slug-1, slug-2, ...
+            slug = result = github_slug(_heading_text(heading.group(1)))
+            while result in occurrences:
+                occurrences[slug] += 1
+                result = f'{slug}-{occurrences[slug]}'
+            occurrences[result] = 0
+            ids.add(result)
+
+    ids.update(ID_ATTR_RE.findall(markdown))
+    for label in FOOTNOTE_RE.findall(markdown):
+        ids.update({f'user-content-fn-{label}', f'user-content-fnref-{label}'})
+    return ids
+
+
+class SiteRoutes:
+    """Index of every path the built site serves, derived from the source tree"""
+
+    def __init__(self, repo_root: Path = REPO_ROOT,
+                 posts_dir: Optional[Path] = None,
+                 pages_dir: Optional[Path] = None,
+                 public_dir: Optional[Path] = None):
+        self.posts_dir = posts_dir or repo_root / 'src' / 'posts'
+        self.pages_dir = pages_dir or repo_root / 'astro-site' / 'src' / 'pages'
+        self.public_dir = public_dir or repo_root / 'astro-site' / 'public'
+        self.layouts_dir = (pages_dir.parent if pages_dir else
+                            repo_root / 'astro-site' / 'src') / 'layouts'
+        self._routes: Optional[Set[str]] = None
+        self._top_level: Set[str] = set()
+        self._anchors: Dict[str, Optional[Set[str]]] = {}
+        self._layout_ids: Optional[Set[str]] = None
+
+    def is_internal(self, url: str) -> bool:
+        """Whether ``url`` should be resolved against the source tree.
+
+        Root-relative paths always are. Absolute URLs on the site host are too,
+        unless their first path segment is one this site doesn't own: the
+        user-site host also serves other repos' project pages
+        (``/remarque/``), which only HTTP can check.
+        """
+        if url.startswith('/'):
+            return not url.startswith('//')
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() not in (
+            SITE_HOST, f'www.{SITE_HOST}'
+        ):
+            return False
+        first = self.normalize(url).split('/')[1]
+        return first == '' or first in self.top_level
+
+    @staticmethod
+    def normalize(url: str) -> str:
+        """Reduce a site URL to the route path the build would serve"""
+        path = unquote(urlparse(url).path) or '/'
+        if path.endswith('/index.html'):
+            path = path[:-len('index.html')]
+        if len(path) > 1:
+            path = path.rstrip('/')
+        return path
+
+    def exists(self, url: str) -> bool:
+        """Whether an internal URL resolves to a post, page or asset"""
+        return self.normalize(url) in self.routes
+
+    def anchors(self, url: str) -> Optional[Set[str]]:
+        """Element ids of the internal document at ``url``; None if unknown.
+
+        Built once per document and cached, so each ``#anchor`` occurrence
+        costs a set lookup.
+        """
+        path = self.normalize(url)
+        if path not in self._anchors:
+            self._anchors[path] = self._build_anchors(path)
+        return self._anchors[path]
+
+    def _build_anchors(self, path: str) -> Optional[Set[str]]:
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'posts':
+            post = self.posts_dir / f'{parts[1]}.md'
+            if post.is_file():
+                return heading_ids(post.read_text(encoding='utf-8')) | self.layout_ids
+
+        rel = path.strip('/')
+        for candidate in (f'{rel}.astro', f'{rel}/index.astro' if rel else 'index.astro'):
+            page = self.pages_dir / candidate
+            if page.is_file():
+                return set(ID_ATTR_RE.findall(page.read_text(encoding='utf-8'))) | self.layout_ids
+        return None
+
+    @property
+    def layout_ids(self) -> Set[str]:
+        """Static ids every page inherits from the shared layouts"""
+        if self._layout_ids is None:
+            self._layout_ids = set()
+            if self.layouts_dir.is_dir():
+                for layout in self.layouts_dir.glob('*.astro'):
+                    self._layout_ids.update(ID_ATTR_RE.findall(layout.read_text(encoding='utf-8')))
+        return self._layout_ids
+
+    @property
+    def routes(self) -> Set[str]:
+        if self._routes is None:
+            self._routes = self._build_routes()
+            self._top_level = {route.split('/')[1] for route in self._routes}
+        return self._routes
+
+    @property
+    def top_level(self) -> Set[str]:
+        """First path segments this site serves (posts, tags, assets, ...)"""
+        self.routes
+        return self._top_level
+
+    def _build_routes(self) -> Set[str]:
+        routes = set(GENERATED_ROUTES)
+        slugs, tags = self._scan_posts()
+
+        if self.pages_dir.is_dir():
+            for page in self.pages_dir.rglob('*'):
+                if not page.is_file() or page.suffix not in PAGE_SUFFIXES:
+                    continue
+                rel = page.relative_to(self.pages_dir).with_suffix('')
+                parts = list(rel.parts)
+                if parts[-1] == 'index':
+                    parts.pop()
+                if any(part.startswith('[') for part in parts):
+                    routes.update(self._expand_dynamic(parts, slugs, tags))
+                else:
+                    routes.add('/' + '/'.join(parts))
+
+        if self.public_dir.is_dir():
+            for asset in self.public_dir.rglob('*'):
+                if asset.is_file():
+                    routes.add('/' + asset.relative_to(self.public_dir).as_posix())
+
+        return routes
+
+    @staticmethod
+    def _expand_dynamic(parts, slugs: Set[str], tags: Set[str]) -> Set[str]:
+        """Expand the site's known dynamic routes; unknown ones are skipped"""
+        prefix = '/' + '/'.join(parts[:-1])
+        param = parts[-1]
+        if param in ('[...slug]', '[slug]'):
+            return {f'{prefix}/{slug}' for slug in slugs}
+        if param == '[slug].png':
+            return {f'{prefix}/{slug}.png' for slug in slugs}
+        if param == '[tag]':
+            return {f'{prefix}/{tag}' for tag in tags}
+        return set()
+
+    def _scan_posts(self):
+        """Published post slugs and the tags they use"""
+        slugs, tags = set(), set()
+        if not self.posts_dir.is_dir():
+            return slugs, tags
+        for post in self.posts_dir.glob('*.md'):
+            frontmatter = self._frontmatter(post.read_text(encoding='utf-8'))
+            if DRAFT_RE.search(frontmatter):
+                continue
+            slugs.add(post.stem)
+            tags.update(t for t in self._tags(frontmatter) if t != 'posts')
+        return slugs, tags
+
+    @staticmethod
+    def _frontmatter(content: str) -> str:
+        if not content.startswith('---'):
+            return ''
+        end = content.find('\n---', 3)
+        return content[3:end] if end != -1 else ''
+
+    @staticmethod
+    def _tags(frontmatter: str) -> Set[str]:
+        """Tags from either ``tags: [a, b]`` or a block list under ``tags:``"""
+        inline = re.search(r'^tags:\s*\[([^\]]*)\]', frontmatter, re.MULTILINE)
+        if inline:
+            items = inline.group(1).split(',')
+        else:
+            block = re.search(r'^tags:\s*\n((?:\s+-\s*.+\n?)+)', frontmatter, re.MULTILINE)
+            items = re.findall(r'-\s*(.+)', block.group(1)) if block else []
+        return {item.strip().strip('\'"') for item in items if item.strip()}
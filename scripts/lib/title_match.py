@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Match a cited paper against search-API candidates by title and authors.
+
+CrossRef and arXiv return their top hits for a title query, and the first hit
+is not always the paper cited: a survey with a similar title or a later paper
+by the same group can rank first. Repairs now ask for the top few candidates
+and keep one only if it really is the cited work.
+
+Titles are compared as sets of character trigrams (Dice coefficient), which
+tolerates punctuation, hyphenation and small typos in the post while telling
+different titles apart. All candidates of a query are scored at once against
+a sparse trigram index; with NumPy this is a couple of array operations,
+without it an equivalent set computation.
+
+Usage:
+    from title_match import TrigramIndex, best_match
+
+    match = best_match('Attention Is All You Need', 'Vaswani et al.', candidates)
+    if match:
+        position, score = match
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MIN_TITLE_SCORE = 0.7   # below this the candidate is a different paper
+TITLE_WEIGHT = 0.8      # title vs author agreement, when the citation names authors
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a title: lower-case words, punctuation dropped"""
+    normalized = ' ' + ' '.join(re.findall(r'\w+', (text or '').lower())) + ' '
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)} if normalized.strip() else set()
+
+
+def surnames(authors: Sequence[str]) -> Set[str]:
+    """Family names from "Ada Lovelace", "Lovelace, A." or "Lovelace et al." forms"""
+    names = set()
+    for author in authors:
+        author = re.sub(r'\bet\s+al\.?', '', author or '', flags=re.IGNORECASE)
+        if ',' in author:
+            author = author.split(',', 1)[0]
+        words = re.findall(r'[^\W\d_]+', author.lower())
+        if words:
+            names.add(words[-1])
+    return names
+
+
+def cited_authors(text: str) -> List[str]:
+    """Split an author string from a post ("Smith, Jones and Lee") into names"""
+    parts = re.split(r',|;|\band\b|&', re.sub(r'\bet\s+al\.?', '', text or '', flags=re.IGNORECASE))
+    return [part.strip() for part in parts if part.strip()]
+
+
+class TrigramIndex:
+    """Candidate titles as a sparse (title, trigram) index"""
+
+    def __init__(self, titles: Sequence[str]):
+        self.sets = [trigrams(title) for title in titles]
+        self.sizes = [len(grams) for grams in self.sets]
+        if NUMPY_AVAILABLE:
+            self.vocab: Dict[str, int] = {}
+            ids = [[self.vocab.setdefault(g, len(self.vocab)) for g in grams] for grams in self.sets]
+            self.rows = np.repeat(np.arange(len(ids)), [len(row) for row in ids])
+            self.cols = np.fromiter((i for row in ids for i in row), dtype=np.int64,
+                                    count=int(sum(self.sizes)))
+            self.size_array = np.asarray(self.sizes, dtype=float)
+
+    def scores(self, title: str) -> List[float]:
+        """Dice similarity of ``title`` to every indexed title"""
+        query = trigrams(title)
+        if not self.sets:
+            return []
+        if not NUMPY_AVAILABLE:
+            return [2 * len(query & grams) / (len(query) + len(grams)) if query or grams else 0.0
+                    for grams in self.sets]
+        query_ids = np.fromiter((self.vocab[g] for g in query if g in self.vocab), dtype=np.int64)
+        shared = np.bincount(self.rows[np.isin(self.cols, query_ids)], minlength=len(self.sets))
+        total = self.size_array + len(query)
+        return np.divide(2 * shared, total, out=np.zeros(len(self.sets)), where=total > 0).tolist()
+
+
+def best_match(title: str, authors: Optional[str],
+               candidates: List[Dict]) -> Optional[Tuple[int, float]]:
+    """(position, score) of the candidate that is the cited paper, if any.
+
+    ``candidates`` are dicts with 'title' and 'authors' (a list of names).
+    The title must match on its own; when the citation names authors, how
+    many of them appear among the candidate's authors is folded in.
+    """
+    if not candidates:
+        return None
+    title_scores = TrigramIndex([c.get('title') or '' for c in candidates]).scores(title)
+    wanted = surnames(cited_authors(authors)) if authors else set()
+
+    best = None
+    for position, (candidate, title_score) in enumerate(zip(candidates, title_scores)):
+        if title_score < MIN_TITLE_SCORE:
+            continue
+        score = title_score
+        if wanted and candidate.get('authors'):
+            author_score = len(wanted & surnames(candidate['authors'])) / len(wanted)
+            score = TITLE_WEIGHT * title_score + (1 - TITLE_WEIGHT) * author_score
+        if best is None or score > best[1]:
+            best = (position, round(score, 3))
+    return best
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+History of link validation runs, for trends and flapping-link detection.
+
+Each validation.json a report is generated from is recorded once, as a run.
+The run is keyed by its ``validation_date`` and by a suite name ('links' for
+the full link check, 'citations' for the citation check), so re-generating a
+report adds nothing. Per-URL results are kept in SQLite, indexed by URL, host
+and status, so the questions the reports ask stay cheap as runs accumulate:
+
+- trend: checked/valid/broken/restricted counts for the last N runs;
+- flapping: URLs whose status changed more than once in the last N runs
+  (up, down, up again). These are usually rate limits or flaky hosts, not
+  dead links, and shouldn't be "repaired";
+- hosts: hosts with the most broken results across the last N runs.
+
+Only the newest ``MAX_RUNS`` runs per suite are kept.
+
+Usage:
+    from validation_history import ValidationHistory, history_sections
+
+    history = ValidationHistory()
+    history.record(validation_data, suite='links')
+    report.extend(history_sections(history, 'links'))
+    history.close()
+"""
+
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from repair_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_HISTORY_PATH = DEFAULT_CACHE_DIR / 'history.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    suite TEXT NOT NULL,
+    validated_at TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    broken INTEGER NOT NULL,
+    redirect INTEGER NOT NULL,
+    restricted INTEGER NOT NULL,
+    UNIQUE (suite, validated_at)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER,
+    issue_type TEXT,
+    PRIMARY KEY (run_id, url)
+);
+CREATE INDEX IF NOT EXISTS results_url ON results(url, run_id);
+CREATE INDEX IF NOT EXISTS results_host ON results(host, status);
+CREATE INDEX IF NOT EXISTS results_status ON results(status, run_id);
+"""
+
+TREND_RUNS = 10     # runs shown in the trend table and scanned for flapping
+MIN_CHANGES = 2     # status changes within those runs that make a URL flap
+
+
+class ValidationHistory:
+    """SQLite store of per-URL validation results, one row set per run"""
+
+    MAX_RUNS = 180  # per suite; about six months of daily runs
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or DEFAULT_HISTORY_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute('PRAGMA foreign_keys = ON')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def record(self, validation_data: Dict, suite: str = 'links') -> int:
+        """Store a validation.json as a run of ``suite``; returns the run id.
+
+        A run already recorded (same suite and validation_date) is not
+        stored again.
+        """
+        validated_at = validation_data.get('validation_date') or datetime.now().isoformat()
+        row = self.db.execute('SELECT id FROM runs WHERE suite = ? AND validated_at = ?',
+                              (suite, validated_at)).fetchone()
+        if row:
+            return row['id']
+
+        results = {r['url']: r for r in validation_data.get('results', []) if r.get('url')}
+        counts = Counter(r.get('status') for r in results.values())
+        with self.db:
+            run_id = self.db.execute(
+                'INSERT INTO runs (suite, validated_at, total, valid, broken, redirect, restricted) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (suite, validated_at, len(results), counts['valid'], counts['broken'],
+                 counts['redirect'], counts['restricted'])
+            ).lastrowid
+            self.db.executemany(
+                'INSERT INTO results (run_id, url, host, status, status_code, issue_type) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((run_id, url, (urlsplit(url).hostname or '').lower(), r.get('status') or 'unknown',
+                  r.get('status_code'), r.get('issue_type')) for url, r in results.items())
+            )
+            self.db.execute(
+                'DELETE FROM runs WHERE suite = ? AND id NOT IN '
+                '(SELECT id FROM runs WHERE suite = ? ORDER BY validated_at DESC LIMIT ?)',
+                (suite, suite, self.MAX_RUNS)
+            )
+        return run_id
+
+    def _recent_runs(self, suite: str, runs: int) -> List[sqlite3.Row]:
+        """The last ``runs`` runs of ``suite``, oldest first"""
+        rows = self.db.execute('SELECT * FROM runs WHERE suite = ? ORDER BY validated_at DESC LIMIT ?',
+                               (suite, runs)).fetchall()
+        return rows[::-1]
+
+    def trend(self, suite: str = 'links', runs: int = TREND_RUNS) -> List[Dict]:
+        """Per-run counts, oldest first"""
+        return [dict(row) for row in self._recent_runs(suite, runs)]
+
+    def flapping(self, suite: str = 'links', runs: int = TREND_RUNS,
+                 min_changes: int = MIN_CHANGES) -> List[Dict]:
+        """URLs whose status changed at least ``min_changes`` times over the last runs.
+
+        Each entry has url, host, changes and statuses (oldest first), most
+        changes first.
+        """
+        run_ids = [row['id'] for row in self._recent_runs(suite, runs)]
+        if len(run_ids) <= min_changes:
+            return []
+        marks = ','.join('?' * len(run_ids))
+        rows = self.db.execute(
+            f'SELECT r.url, r.host, r.status FROM results r JOIN runs ON runs.id = r.run_id '
+            f'WHERE r.url IN (SELECT url FROM results WHERE run_id IN ({marks}) '
+            f'                GROUP BY url HAVING COUNT(DISTINCT status) > 1) '
+            f'AND r.run_id IN ({marks}) ORDER BY r.url, runs.validated_at',
+            run_ids + run_ids
+        ).fetchall()
+
+        by_url: Dict[str, Dict] = {}
+        for row in rows:
+            entry = by_url.setdefault(row['url'], {'url': row['url'], 'host': row['host'],
+                                                   'statuses': []})
+            entry['statuses'].append(row['status'])
+        flapping = []
+        for entry in by_url.values():
+            statuses = entry['statuses']
+            entry['changes'] = sum(a != b for a, b in zip(statuses, statuses[1:]))
+            if entry['changes'] >= min_changes:
+                flapping.append(entry)
+        return sorted(flapping, key=lambda e: (-e['changes'], e['url']))
+
+    def broken_hosts(self, suite: str = 'links', runs: int = TREND_RUNS,
+                     limit: int = 10) -> List[Dict]:
+        """Hosts with the most broken results over the last runs"""
+        run_ids = [row['id'] for row in self._recent_runs(suite, runs)]
+        if not run_ids:
+            return []
+        marks = ','.join('?' * len(run_ids))
+        rows = self.db.execute(
+            f"SELECT host, COUNT(*) AS broken, COUNT(DISTINCT url) AS urls FROM results "
+            f"WHERE status = 'broken' AND run_id IN ({marks}) "
+            f"GROUP BY host ORDER BY broken DESC, host LIMIT ?",
+            run_ids + [limit]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def history_sections(history: ValidationHistory, suite: str, runs: int = TREND_RUNS,
+                     heading: str = '##') -> List[str]:
+    """Markdown lines for the trend and flapping sections of a report"""
+    trend = history.trend(suite, runs)
+    lines = [f"\n{heading} Trend (last {len(trend)} runs)\n"]
+    if len(trend) < 2:
+        lines.append("First recorded run; trends appear from the next run.")
+        return lines
+
+    lines.append("| Run | Checked | Valid | Broken | Restricted | Δ Broken |")
+    lines.append("|-----|---------|-------|--------|------------|----------|")
+    previous = None
+    for run in trend:
+        delta = '' if previous is None else f"{run['broken'] - previous['broken']:+d}"
+        lines.append(f"| {run['validated_at'][:16].replace('T', ' ')} | {run['total']} | "
+                     f"{run['valid']} | {run['broken']} | {run['restricted']} | {delta} |")
+        previous = run
+
+    hosts = history.broken_hosts(suite, runs)
+    if hosts:
+        lines.append(f"\n{heading}# Hosts Broken Most Often\n")
+        lines.append("| Host | Broken Results | URLs |")
+        lines.append("|------|----------------|------|")
+        for host in hosts:
+            lines.append(f"| {host['host']} | {host['broken']} | {host['urls']} |")
+
+    flapping = history.flapping(suite, runs)
+    lines.append(f"\n{heading} Flapping Links\n")
+    if not flapping:
+        lines.append(f"No link changed status {MIN_CHANGES}+ times in the last {len(trend)} runs.")
+        return lines
+    lines.append("Status changed repeatedly: likely rate limiting or a flaky host. "
+                 "Verify by hand before repairing.\n")
+    lines.append("| URL | Changes | History (oldest first) |")
+    lines.append("|-----|---------|------------------------|")
+    for entry in flapping[:20]:
+        lines.append(f"| {entry['url']} | {entry['changes']} | {' → '.join(entry['statuses'])} |")
+    return lines
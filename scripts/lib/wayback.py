@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Batched Wayback Machine snapshot lookups via the CDX API.
+
+The availability API (``archive.org/wayback/available``) answers one URL per
+request and only with the capture closest to *now*. The CDX API lists every
+capture, so this module:
+
+- groups broken URLs that share a host directory into one
+  ``matchType=prefix`` query, collapsed to one capture per URL per month;
+- queries the remaining URLs individually, one at a time with a polite
+  interval between requests (and backs off on 429/503);
+- caches each URL's capture list on disk, empty lists included;
+- picks the capture closest to (and not after) the date the citing post was
+  published, i.e. the page the author actually linked to.
+
+Usage:
+    from wayback import WaybackLookup
+
+    wayback = WaybackLookup(cache_path=Path('.cache/link-validation/wayback.json'))
+    await wayback.prefetch(session, urls)
+    snapshot = await wayback.closest(session, url, before='20240716')
+    wayback.save()
+"""
+
+import asyncio
+import json
+import os
+import posixpath
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+CDX_API = 'https://web.archive.org/cdx/search/cdx'
+SNAPSHOT_URL = 'https://web.archive.org/web/{timestamp}/{original}'
+
+DAY = 24 * 60 * 60
+
+
+def url_key(url: str) -> str:
+    """Match key for a URL and its CDX ``original``: scheme, www, case of host
+    and trailing slash don't matter"""
+    parsed = urlparse(url if '://' in url else f'http://{url}')
+    host = (parsed.hostname or '').lower().removeprefix('www.')
+    key = host + (parsed.path.rstrip('/') or '')
+    return f'{key}?{parsed.query}' if parsed.query else key
+
+
+class WaybackError(RuntimeError):
+    """The CDX server couldn't be queried, so it's unknown whether a URL was archived"""
+
+
+class WaybackLookup:
+    """Capture lists per URL, fetched in batches and cached between runs"""
+
+    VERSION = 1
+    TTL = 30 * DAY
+    MIN_INTERVAL = 1.0     # seconds between CDX requests
+    PREFIX_MIN_URLS = 2    # URLs under one directory before a prefix query pays off
+    PREFIX_LIMIT = 5000    # rows per prefix query; a full page may be truncated
+    MAX_RETRIES = 3
+
+    def __init__(self, cdx_url: str = CDX_API, cache_path: Optional[Path] = None,
+                 min_interval: float = MIN_INTERVAL, ttl: float = TTL):
+        self.cdx_url = cdx_url
+        self.cache_path = cache_path
+        self.min_interval = min_interval
+        self.ttl = ttl
+        self.stats = {'requests': 0, 'prefix_queries': 0, 'cache_hits': 0, 'throttled_seconds': 0.0}
+        self._snapshots: Dict[str, Dict] = self._load()
+        self._dirty = False
+        self._lock = asyncio.Lock()
+        self._last_request = 0.0
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('snapshots', {}) if data.get('version') == self.VERSION else {}
+
+    def save(self):
+        if not self.cache_path or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'snapshots': self._snapshots}, f)
+        os.replace(tmp, self.cache_path)
+        self._dirty = False
+
+    def _cached(self, url: str) -> Optional[List[Tuple[str, str]]]:
+        entry = self._snapshots.get(url_key(url))
+        if entry is None or time.time() - entry['fetched_at'] > self.ttl:
+            return None
+        return entry['captures']
+
+    def _store(self, url: str, captures: List[Tuple[str, str]]):
+        self._snapshots[url_key(url)] = {'fetched_at': time.time(), 'captures': captures}
+        self._dirty = True
+
+    async def prefetch(self, session, urls: Iterable[str]):
+        """Fetch capture lists for every uncached URL, batching by directory"""
+        pending = {}
+        for url in urls:
+            if self._cached(url) is None:
+                pending.setdefault(url_key(url), url)
+
+        groups = defaultdict(list)
+        for key, url in pending.items():
+            host, _, path = key.split('?')[0].partition('/')
+            groups[(host, posixpath.dirname('/' + path))].append(url)
+
+        singles = []
+        for (host, directory), group in groups.items():
+            # Never prefix-scan a whole host
+            if len(group) < self.PREFIX_MIN_URLS or directory in ('', '/'):
+                singles.extend(group)
+                continue
+            singles.extend(await self._prefix_query(session, host, directory, group))
+
+        await asyncio.gather(*(self._exact_query(session, url) for url in singles))
+
+    async def closest(self, session, url: str,
+                      before: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Snapshot closest to ``before`` (YYYYMMDD[hhmmss]) without passing it.
+
+        Falls back to the earliest later capture when nothing predates it, and
+        to the latest capture when no date is known. Returns
+        ``{'url', 'timestamp', 'before_date'}`` or None if never archived;
+        raises WaybackError if the CDX query failed.
+        """
+        captures = self._cached(url)
+        if captures is None:
+            captures = await self._exact_query(session, url)
+            if captures is None:
+                raise WaybackError(f'CDX lookup failed for {url}')
+        else:
+            self.stats['cache_hits'] += 1
+        if not captures:
+            return None
+
+        timestamps = sorted(captures)
+        if before:
+            cutoff = before.ljust(14, '9')
+            earlier = [c for c in timestamps if c[0] <= cutoff]
+            timestamp, original = earlier[-1] if earlier else timestamps[0]
+            before_date = bool(earlier)
+        else:
+            timestamp, original = timestamps[-1]
+            before_date = False
+        return {
+            'url': SNAPSHOT_URL.format(timestamp=timestamp, original=original),
+            'timestamp': timestamp,
+            'before_date': before_date,
+        }
+
+    async def _prefix_query(self, session, host: str, directory: str,
+                            urls: List[str]) -> List[str]:
+        """One query for a directory; returns URLs it could not settle"""
+        self.stats['prefix_queries'] += 1
+        rows = await self._query(session, {
+            'url': f'{host}{directory.rstrip("/")}/',
+            'matchType': 'prefix',
+            'limit': str(self.PREFIX_LIMIT),
+        })
+        if rows is None:
+            return urls
+
+        # No server-side collapse here: CDX collapses adjacent rows, so a
+        # URL whose only capture shares a month with the previous URL's last
+        # one would vanish. Keep one capture per URL per month instead.
+        by_key = defaultdict(list)
+        seen = set()
+        for timestamp, original in rows:
+            key = url_key(original)
+            if (key, timestamp[:6]) not in seen:
+                seen.add((key, timestamp[:6]))
+                by_key[key].append([timestamp, original])
+
+        # A truncated page can't prove a URL was never captured
+        truncated = len(rows) >= self.PREFIX_LIMIT
+        unsettled = []
+        for url in urls:
+            captures = by_key.get(url_key(url))
+            if captures or not truncated:
+                self._store(url, captures or [])
+            else:
+                unsettled.append(url)
+        return unsettled
+
+    async def _exact_query(self, session, url: str) -> Optional[List[Tuple[str, str]]]:
+        # One capture per month is plenty to pick a date from
+        rows = await self._query(session, {'url': url, 'collapse': 'timestamp:6'})
+        if rows is None:
+            return None
+        captures = [[timestamp, original] for timestamp, original in rows]
+        self._store(url, captures)
+        return captures
+
+    async def _query(self, session, params: Dict[str, str]) -> Optional[List[List[str]]]:
+        """Throttled CDX request; rows of (timestamp, original), None on failure"""
+        params = {
+            **params,
+            'output': 'json',
+            'fl': 'timestamp,original',
+            'filter': 'statuscode:200',
+        }
+        for attempt in range(self.MAX_RETRIES):
+            await self._throttle()
+            try:
+                self.stats['requests'] += 1
+                async with session.get(self.cdx_url, params=params) as response:
+                    if response.status in (429, 503):
+                        retry_after = response.headers.get('Retry-After', '')
+                        delay = float(retry_after) if retry_after.isdigit() else 2 ** (attempt + 1)
+                        self.stats['throttled_seconds'] += delay
+                        await asyncio.sleep(delay)
+                        continue
+                    if response.status != 200:
+                        return None
+                    data = json.loads(await response.text() or '[]')
+            except Exception:
+                return None
+            # First row is the field-name header
+            return [row[:2] for row in data[1:]]
+        return None
+
+    async def _throttle(self):
+        async with self._lock:
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                self.stats['throttled_seconds'] += wait
+                await asyncio.sleep(wait)
+            self._last_request = time.monotonic()
@@ -42,20 +42,25 @@ RELATED_SCRIPTS:
 MANIFEST_REGISTRY: scripts/batch-link-fixer.py
 """
 
+import difflib
 import json
+import os
 import re
-import shutil
 import argparse
-import subprocess
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, TextIO, Tuple
 from datetime import datetime
 import sys
-from tqdm import tqdm
 
 # Path setup for logging import
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from logging_config import setup_logger
+from link_pipeline import LinkPipeline
+from occurrence_index import OccurrenceIndex
+from repair_journal import RepairJournal, rollback, write_atomic
 
 # Initialize logger
 logger = setup_logger(__name__)
@@ -63,122 +68,101 @@ logger = setup_logger(__name__)
 class BatchLinkFixer:
     """Orchestrate link validation and repair"""
 
-    def __init__(self, confidence_threshold: float = 90, dry_run: bool = False):
+    # A markdown link, allowing one level of parentheses in the target
+    MARKDOWN_LINK = r"\[[^\]]+\]\((?:[^()]|\([^()]*\))*\)"
+    MARKDOWN_PARTS = re.compile(r"(\[[^\]]+\]\()(.*)\)", re.DOTALL)
+
+    def __init__(self, confidence_threshold: float = 90, dry_run: bool = False,
+                 workers: Optional[int] = None, journal_dir: Optional[Path] = None,
+                 links_file: Path = Path('links.json'), patch_out: Optional[TextIO] = None):
         self.confidence_threshold = confidence_threshold
         self.dry_run = dry_run
+        self.workers = workers or os.cpu_count() or 1
+        self.journal_dir = journal_dir
+        self.links_file = links_file
+        # Where a dry run writes its patch (default stdout)
+        self.patch_out = patch_out
         self.changes_made = []
-        self.backups_created = []
-
-    @staticmethod
-    def _replace_url(content: str, old_url: str, new_url: str) -> Tuple[str, int]:
+        self.failed_files: List[str] = []
+        self.journal: Optional[RepairJournal] = None
+        self._index: Optional[OccurrenceIndex] = None
+
+    @property
+    def occurrences(self) -> OccurrenceIndex:
+        """Where each URL occurs, from the extractor's index beside links_file"""
+        if self._index is None:
+            self._index = OccurrenceIndex.for_links_file(self.links_file)
+        return self._index
+
+    @classmethod
+    def _replace_url(cls, content: str, old_url: str, new_url: str) -> Tuple[str, int]:
         """Replace a URL in markdown links first, then bare prose URLs."""
-        markdown_exact = re.compile(r"(\[[^\]]+\]\()" + re.escape(old_url) + r"(?=\))")
-        markdown_link = re.compile(r"\[[^\]]+\]\((?:[^()]|\([^()]*\))*\)")
-
-        content, markdown_count = markdown_exact.subn(lambda m: f"{m.group(1)}{new_url}", content)
-
-        pieces = []
-        bare_count = 0
-        last_end = 0
-
-        for match in markdown_link.finditer(content):
-            prefix = content[last_end:match.start()]
-            replaced_prefix = prefix.replace(old_url, new_url)
-            bare_count += prefix.count(old_url)
-            pieces.append(replaced_prefix)
-            pieces.append(match.group(0))
-            last_end = match.end()
-
-        suffix = content[last_end:]
-        pieces.append(suffix.replace(old_url, new_url))
-        bare_count += suffix.count(old_url)
+        content, counts = cls._replace_urls(content, {old_url: new_url})
+        return content, counts[old_url]
+
+    @classmethod
+    def _replace_urls(cls, content: str,
+                      replacements: Dict[str, str]) -> Tuple[str, Dict[str, int]]:
+        """Apply every old -> new URL replacement in one scan of ``content``.
+
+        A markdown link is rewritten only when its whole target is an old URL;
+        any other markdown link is left alone, URLs inside it included. Old
+        URLs anywhere else (bare prose URLs) are replaced wherever they occur.
+        Where old URLs overlap, the one listed first wins, as if the
+        replacements ran one after another. Replaced text is never rescanned.
+        Returns the new content and the number of replacements per old URL.
+        """
+        counts = dict.fromkeys(replacements, 0)
+        if not replacements:
+            return content, counts
 
-        return ''.join(pieces), markdown_count + bare_count
+        matcher = re.compile(
+            f"(?P<link>{cls.MARKDOWN_LINK})|" + '|'.join(map(re.escape, replacements))
+        )
 
-    def run_full_pipeline(self, posts_dir: Path) -> int:
-        """Run the complete validation and repair pipeline"""
+        def substitute(match: re.Match) -> str:
+            if match.group('link') is None:
+                counts[match.group(0)] += 1
+                return replacements[match.group(0)]
+            opener, target = cls.MARKDOWN_PARTS.match(match.group(0)).groups()
+            if target in replacements:
+                counts[target] += 1
+                return f"{opener}{replacements[target]})"
+            return match.group(0)
+
+        return matcher.sub(substitute, content), counts
+
+    def run_full_pipeline(self, posts_dir: Path, artifacts_dir: Optional[Path] = None,
+                          reuse: bool = True) -> int:
+        """Run the complete validation and repair pipeline in this process.
+
+        Extraction, validation, relevance scoring, repair search and reports
+        run as stages of one LinkPipeline (one event loop, one HTTP session,
+        results handed over in memory); fixes are then applied from the
+        in-memory repairs. ``artifacts_dir`` also writes the intermediate
+        JSON files there. Stages whose inputs haven't changed since their
+        last successful run are reused unless ``reuse`` is off.
+        """
         logger.info("🚀 Starting Link Validation Pipeline")
         logger.info("=" * 60)
 
+        pipeline = LinkPipeline(posts_dir, artifacts_dir=artifacts_dir, reuse=reuse)
         try:
-            # Step 1: Extract links
-            logger.info("\n📎 Step 1: Extracting links from blog posts...")
-            if not self._run_command([
-                'python', 'scripts/link-validation/link-extractor.py',
-                '--posts-dir', str(posts_dir),
-                '--output', 'links.json'
-            ]):
-                return 1
+            data = asyncio.run(pipeline.run())
 
-            # Step 2: Validate links
-            logger.info("\n🔍 Step 2: Validating links...")
-            if not self._run_command([
-                'python', 'scripts/link-validation/link-validator.py',
-                '--input', 'links.json',
-                '--output', 'validation.json'
-            ]):
-                logger.warning("⚠️  Link validation failed, continuing with basic validation...")
-
-            # Step 3: Check content relevance
-            logger.info("\n📊 Step 3: Checking content relevance...")
-            if not self._run_command([
-                'python', 'scripts/link-validation/content-relevance-checker.py',
-                '--links', 'links.json',
-                '--validation', 'validation.json',
-                '--output', 'relevance.json'
-            ]):
-                logger.warning("⚠️  Relevance check failed, continuing...")
-
-            # Step 4: Find repairs
-            logger.info("\n🔧 Step 4: Finding repairs for broken links...")
-            if not self._run_command([
-                'python', 'scripts/link-validation/citation-repair.py',
-                '--links', 'links.json',
-                '--validation', 'validation.json',
-                '--relevance', 'relevance.json',
-                '--output', 'repairs.json'
-            ]):
-                logger.warning("⚠️  Repair search failed, continuing...")
-
-            # Step 5: Generate reports
-            logger.info("\n📈 Step 5: Generating reports...")
-            if not self._run_command([
-                'python', 'scripts/link-validation/link-report-generator.py',
-                '--links', 'links.json',
-                '--validation', 'validation.json',
-                '--relevance', 'relevance.json',
-                '--repairs', 'repairs.json',
-                '--output-dir', 'reports'
-            ]):
-                logger.warning("⚠️  Report generation failed, continuing...")
-
-            # Step 6: Apply fixes
-            logger.info("\n✏️ Step 6: Applying fixes...")
-            self.apply_repairs('repairs.json', posts_dir)
+            logger.info("\n✏️ Applying fixes...")
+            with pipeline.timed('apply'):
+                self.apply_repairs_data(data['repair'], data['extract'])
 
             logger.info("\n✅ Pipeline completed successfully!")
             self._print_summary()
-
             return 0
 
         except Exception as e:
             logger.error(f"\n❌ Pipeline failed: {e}")
             return 1
-
-    def _run_command(self, cmd: List[str]) -> bool:
-        """Run a command and return success status"""
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            if result.stdout:
-                logger.info(result.stdout)
-            return True
-        except subprocess.CalledProcessError as e:
-            if e.stderr:
-                logger.error(f"Error: {e.stderr}")
-            return False
-        except FileNotFoundError:
-            logger.error(f"Command not found: {cmd[0]}")
-            return False
+        finally:
+            pipeline.log_timings()
 
     def apply_repairs(self, repairs_file: Path, posts_dir: Path):
         """Apply repairs to blog posts"""
@@ -195,82 +179,91 @@ class BatchLinkFixer:
         with open(repairs_file, 'r', encoding='utf-8') as f:
             repairs_data = json.load(f)
 
+        self.apply_repairs_data(repairs_data)
+
+    def apply_repairs_data(self, repairs_data: Dict, links_data: Optional[Dict] = None):
+        """Apply repairs.json contents; links_data defaults to the occurrence
+        index of ``links_file``"""
         repairs = repairs_data.get('repairs', [])
         if not repairs:
             logger.info("No repairs to apply")
             return
 
-        # Filter by confidence threshold
+        # Filter by confidence threshold; never apply a replacement that
+        # citation-repair.py fetched and found dead
         applicable_repairs = [
             r for r in repairs
             if r.get('confidence', 0) >= self.confidence_threshold
+            and r.get('verified') is not False
         ]
 
         logger.info(f"Found {len(applicable_repairs)} repairs with confidence >= {self.confidence_threshold}%")
 
+        # Group repairs by file
+        index = OccurrenceIndex.from_links(links_data['links']) if links_data else self.occurrences
+        repairs_by_file = self._group_repairs_by_file(applicable_repairs, index)
+
         if self.dry_run:
             logger.info("\n🔍 DRY RUN - No changes will be made")
-            self._show_planned_changes(applicable_repairs)
+            self._show_planned_changes(repairs_by_file)
             return
 
-        # Group repairs by file
-        repairs_by_file = self._group_repairs_by_file(applicable_repairs)
-
-        # Apply repairs to each file
-        for file_path, file_repairs in tqdm(repairs_by_file.items(), desc="Fixing files"):
-            self._apply_file_repairs(file_path, file_repairs)
-
-    def _group_repairs_by_file(self, repairs: List[Dict]) -> Dict[str, List[Dict]]:
-        """Group repairs by source file"""
-        # Load links data to map repairs to files
-        with open('links.json', 'r', encoding='utf-8') as f:
-            links_data = json.load(f)
-
-        # Create URL to file mapping
-        url_to_file = {}
-        for link in links_data.get('links', []):
-            url_to_file[link['url']] = link['file_path']
-
-        # Group repairs
+        # Rewrite the files in parallel, recording each in this run's journal
+        journal = RepairJournal(self.journal_dir)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for changes in pool.map(lambda item: self._apply_file_repairs(*item, journal),
+                                    repairs_by_file.items()):
+                self.changes_made.extend(changes)
+
+        # record() has already written the journal, before each rename
+        if journal.files:
+            self.journal = journal
+            logger.info(f"🧾 Run {journal.run_id}: {len(journal.files)} files changed "
+                        f"(undo with --rollback {journal.run_id})")
+        if self.failed_files:
+            logger.error(f"❌ {len(self.failed_files)} files could not be repaired: "
+                         f"{', '.join(Path(f).name for f in self.failed_files)}")
+
+    def _group_repairs_by_file(self, repairs: List[Dict],
+                               index: OccurrenceIndex) -> Dict[str, List[Dict]]:
+        """Group repairs by source file; a repair goes to every file its URL is in"""
         repairs_by_file = {}
         for repair in repairs:
-            file_path = url_to_file.get(repair['original_url'])
-            if file_path:
-                if file_path not in repairs_by_file:
-                    repairs_by_file[file_path] = []
-                repairs_by_file[file_path].append(repair)
+            for file_path in index.files(repair['original_url']):
+                repairs_by_file.setdefault(file_path, []).append(repair)
 
         return repairs_by_file
 
-    def _apply_file_repairs(self, file_path: str, repairs: List[Dict]):
-        """Apply repairs to a single file"""
+    def _plan_file_repairs(self, file_path: str, repairs: List[Dict]
+                           ) -> Optional[Tuple[Path, bytes, bytes, List[Dict]]]:
+        """Compute a file's repaired content without writing it.
+
+        Returns (path, original bytes, repaired bytes, changes), or None if
+        the file is missing or no repair matched.
+        """
         file_path = Path(file_path)
 
         if not file_path.exists():
             logger.warning(f"⚠️  File not found: {file_path}")
-            return
-
-        # Create backup
-        if not self.dry_run:
-            backup_path = self._create_backup(file_path)
-            self.backups_created.append((file_path, backup_path))
+            return None
 
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        original = file_path.read_bytes()
+        content = original.decode('utf-8')
 
-        original_content = content
+        # Apply every repair in one pass; the first repair for a URL wins
+        replacements = {}
+        for repair in repairs:
+            replacements.setdefault(repair['original_url'], repair['suggested_url'])
+        content, counts = self._replace_urls(content, replacements)
 
-        # Apply each repair
-        changes = 0
+        changes = []
         for repair in repairs:
             old_url = repair['original_url']
             new_url = repair['suggested_url']
 
-            content, count = self._replace_url(content, old_url, new_url)
+            count = counts.pop(old_url, 0)
             if count > 0:
-                changes += count
-                self.changes_made.append({
+                changes.append({
                     'file': str(file_path),
                     'old_url': old_url,
                     'new_url': new_url,
@@ -279,32 +272,80 @@ class BatchLinkFixer:
                     'repair_type': repair.get('repair_type', 'unknown')
                 })
 
-        # Write changes
-        if changes > 0 and not self.dry_run:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"✅ Fixed {changes} links in {file_path.name}")
-
-    def _create_backup(self, file_path: Path) -> Path:
-        """Create backup of file"""
-        backup_path = file_path.with_suffix(f'.bak.{datetime.now().strftime("%Y%m%d_%H%M%S")}')
-        shutil.copy2(file_path, backup_path)
-        return backup_path
-
-    def _show_planned_changes(self, repairs: List[Dict]):
-        """Show what changes would be made"""
-        logger.info("\nPlanned changes:")
-        logger.info("-" * 60)
-
-        for repair in repairs[:10]:  # Show first 10
-            logger.info(f"\nOriginal: {repair['original_url']}")
-            logger.info(f"Replace:  {repair['suggested_url']}")
-            logger.info(f"Source:   {repair['source']}")
-            logger.info(f"Confidence: {repair['confidence']}%")
-            logger.info(f"Notes:    {repair.get('notes', 'N/A')}")
-
-        if len(repairs) > 10:
-            logger.info(f"\n... and {len(repairs) - 10} more changes")
+        if not changes:
+            return None
+        return file_path, original, content.encode('utf-8'), changes
+
+    def _apply_file_repairs(self, file_path: str, repairs: List[Dict],
+                            journal: Optional[RepairJournal] = None) -> List[Dict]:
+        """Apply repairs to a single file; returns the changes made.
+
+        The file is replaced atomically (temp file + rename) after its old
+        and new content are recorded in ``journal``. A file that can't be
+        read, decoded or written is logged and added to ``failed_files``.
+        """
+        try:
+            planned = self._plan_file_repairs(file_path, repairs)
+            if planned is None:
+                return []
+
+            file_path, original, updated, changes = planned
+            if journal is not None:
+                journal.record(file_path, original, updated)
+            write_atomic(file_path, updated)
+        except (OSError, ValueError) as e:
+            # One unreadable or unwritable post mustn't stop the others
+            logger.error(f"❌ Could not repair {file_path}: {e}")
+            self.failed_files.append(str(file_path))
+            return []
+        logger.info(f"✅ Fixed {sum(c['count'] for c in changes)} links in {file_path.name}")
+        return changes
+
+    def rollback(self, run_id: str) -> int:
+        """Restore every file changed by an earlier run from its journal"""
+        result = rollback(run_id, self.journal_dir)
+        for path in result['restored']:
+            logger.info(f"↩️  Restored {Path(path).name}")
+        for path in result['skipped']:
+            logger.warning(f"⚠️  Skipped {path}: changed or removed since run {run_id}")
+        logger.info(f"Run {run_id}: {len(result['restored'])} restored, "
+                    f"{len(result['unchanged'])} already original, "
+                    f"{len(result['skipped'])} skipped")
+        return 1 if result['skipped'] else 0
+
+    @staticmethod
+    def _file_patch(file_path: Path, before: bytes, after: bytes) -> str:
+        """Unified diff of one file, in the form ``git apply`` accepts"""
+        try:
+            name = Path(os.path.relpath(file_path)).as_posix()
+        except ValueError:  # another drive on Windows
+            name = file_path.as_posix()
+
+        def lines(data: bytes) -> List[str]:
+            # Split on \n only: str.splitlines() also breaks on \f, \x1c, U+2028...
+            parts = data.decode('utf-8').split('\n')
+            return [part + '\n' for part in parts[:-1]] + ([parts[-1]] if parts[-1] else [])
+
+        patch = [f"diff --git a/{name} b/{name}\n"]
+        for line in difflib.unified_diff(lines(before), lines(after), f"a/{name}", f"b/{name}"):
+            patch.append(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n')
+        return ''.join(patch)
+
+    def _show_planned_changes(self, repairs_by_file: Dict[str, List[Dict]]):
+        """Compute every planned edit in memory and write them as one patch"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            planned = [p for p in pool.map(lambda item: self._plan_file_repairs(*item),
+                                           sorted(repairs_by_file.items())) if p]
+            patches = list(pool.map(lambda p: self._file_patch(*p[:3]), planned))
+
+        out = self.patch_out or sys.stdout
+        out.write(''.join(patches))
+        out.flush()
+
+        for _, _, _, changes in planned:
+            self.changes_made.extend(changes)
+        logger.info(f"Planned: {sum(c['count'] for c in self.changes_made)} links "
+                    f"in {len(planned)} files")
 
     def _print_summary(self):
         """Print summary of changes made"""
@@ -312,7 +353,7 @@ class BatchLinkFixer:
             logger.info("\n📊 No changes were made")
             return
 
-        logger.info("\n📊 Summary of Changes")
+        logger.info("\n📊 Summary of Planned Changes" if self.dry_run else "\n📊 Summary of Changes")
         logger.info("=" * 60)
 
         # Count by repair type
@@ -330,8 +371,8 @@ class BatchLinkFixer:
 
         logger.info(f"\nFiles modified: {len(set(c['file'] for c in self.changes_made))}")
 
-        if self.backups_created:
-            logger.info(f"\nBackups created: {len(self.backups_created)}")
+        if self.journal:
+            logger.info(f"\nUndo with: --rollback {self.journal.run_id}")
 
     def generate_review_queue(self, repairs_file: Path, output_file: Path):
         """Generate manual review queue for low-confidence repairs"""
@@ -344,15 +385,6 @@ class BatchLinkFixer:
             if r.get('confidence', 0) < self.confidence_threshold
         ]
 
-        # Load links data for context
-        with open('links.json', 'r', encoding='utf-8') as f:
-            links_data = json.load(f)
-
-        # Create URL to context mapping
-        url_to_context = {
-            link['url']: link for link in links_data.get('links', [])
-        }
-
         # Generate review markdown
         review = []
         review.append("# Manual Link Review Queue")
@@ -360,9 +392,10 @@ class BatchLinkFixer:
         review.append(f"\n{len(low_confidence)} links require manual review")
 
         for repair in low_confidence:
-            context = url_to_context.get(repair['original_url'], {})
+            context = self.occurrences.context(repair['original_url'])
+            files = self.occurrences.files(repair['original_url'])
 
-            review.append(f"\n## {Path(context.get('file_path', 'unknown')).name if context else 'Unknown file'}")
+            review.append(f"\n## {', '.join(Path(f).name for f in files) if files else 'Unknown file'}")
             review.append(f"\n**Original URL:** {repair['original_url']}")
             review.append(f"**Suggested:** {repair['suggested_url']}")
             review.append(f"**Confidence:** {repair['confidence']}%")
@@ -392,15 +425,25 @@ Examples:
   # Run full validation pipeline
   python scripts/link-validation/batch-link-fixer.py
 
+  # ...keeping the intermediate JSON files
+  python scripts/link-validation/batch-link-fixer.py --artifacts-dir .
+
+  # ...rerunning stages whose inputs haven't changed
+  python scripts/link-validation/batch-link-fixer.py --force
+
   # Apply repairs only
   python scripts/link-validation/batch-link-fixer.py --apply
 
-  # Dry run to preview changes
-  python scripts/link-validation/batch-link-fixer.py --dry-run
+  # Dry run: print the planned edits as a patch (git apply accepts it)
+  python scripts/link-validation/batch-link-fixer.py --apply --dry-run > link-repairs.patch
+  python scripts/link-validation/batch-link-fixer.py --apply --patch link-repairs.patch
 
   # Generate manual review queue
   python scripts/link-validation/batch-link-fixer.py --generate-review-queue
 
+  # Undo the edits of an earlier run (its id is logged when it applies fixes)
+  python scripts/link-validation/batch-link-fixer.py --rollback 20260101-120000-ab12cd
+
   # Quiet mode
   python scripts/link-validation/batch-link-fixer.py --quiet
         """
@@ -408,35 +451,71 @@ Examples:
     parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
     parser.add_argument('--posts-dir', type=Path, default=Path('src/posts'),
                        help='Directory containing blog posts')
+    parser.add_argument('--links', type=Path, default=Path('links.json'),
+                       help='Extracted links (its links.index.json is used when present)')
     parser.add_argument('--repairs', type=Path, default=Path('repairs.json'),
                        help='Repairs file to apply')
     parser.add_argument('--confidence-threshold', type=float, default=90,
                        help='Minimum confidence for auto-fix (0-100)')
     parser.add_argument('--dry-run', action='store_true',
-                       help='Show what would be changed without modifying files')
+                       help='Write the planned edits to stdout as a patch; change no files')
+    parser.add_argument('--patch', type=Path, default=None,
+                       help='Dry run, writing the patch to this file instead of stdout')
     parser.add_argument('--apply', action='store_true',
                        help='Apply repairs only (skip validation)')
     parser.add_argument('--generate-review-queue', action='store_true',
                        help='Generate manual review queue')
     parser.add_argument('--output', type=Path, default=Path('manual-review.md'),
                        help='Output file for review queue')
+    parser.add_argument('--artifacts-dir', type=Path, default=None,
+                       help='Also write links.json, validation.json, relevance.json '
+                            'and repairs.json here (full pipeline only)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rerun every pipeline stage, even if its inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Files rewritten in parallel (default: CPU count)')
+    parser.add_argument('--rollback', metavar='RUN_ID',
+                       help='Restore the files changed by an earlier run')
+    parser.add_argument('--journal-dir', type=Path, default=None,
+                       help='Where run journals are kept (default: .cache/link-validation/runs)')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress output messages')
 
     args = parser.parse_args()
 
+    patch_out = None
     try:
+        if args.patch:
+            patch_out = open(args.patch, 'w', encoding='utf-8', newline='')
+        elif args.dry_run:
+            # stdout carries the patch; keep log lines out of it, including
+            # those of loggers the pipeline stages create later.
+            patch_out, sys.stdout = sys.stdout, sys.stderr
+            for existing in logging.Logger.manager.loggerDict.values():
+                for handler in getattr(existing, 'handlers', []):
+                    if isinstance(handler, logging.StreamHandler) and handler.stream is patch_out:
+                        handler.setStream(sys.stderr)
+
         fixer = BatchLinkFixer(
             confidence_threshold=args.confidence_threshold,
-            dry_run=args.dry_run
+            dry_run=args.dry_run or args.patch is not None,
+            patch_out=patch_out,
+            workers=args.workers,
+            journal_dir=args.journal_dir,
+            links_file=args.links
         )
 
+        if args.rollback:
+            return fixer.rollback(args.rollback)
         if args.generate_review_queue:
             fixer.generate_review_queue(args.repairs, args.output)
         elif args.apply:
             fixer.apply_repairs(args.repairs, args.posts_dir)
+            if fixer.failed_files:
+                return 1
         else:
-            return fixer.run_full_pipeline(args.posts_dir)
+            return fixer.run_full_pipeline(args.posts_dir, args.artifacts_dir,
+                                           reuse=not args.force)
 
         return 0
 
@@ -446,6 +525,9 @@ Examples:
     except Exception as e:
         logger.error(f"❌ Error: {e}")
         return 2
+    finally:
+        if args.patch and patch_out is not None:
+            patch_out.close()
 
 if __name__ == '__main__':
     sys.exit(main())
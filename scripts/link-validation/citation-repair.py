@@ -45,23 +45,41 @@ MANIFEST_REGISTRY: scripts/citation-repair.py
 import json
 import re
 import asyncio
-import aiohttp
 import argparse
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from urllib.parse import unquote, urlparse, quote
+from urllib.parse import unquote, urlparse
 import hashlib
+import time
+
+import aiohttp
 
 # Path setup for centralized logging
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from logging_config import setup_logger
+from page_cache import PageCache
+from repair_cache import DEFAULT_CACHE_DIR, RepairCache, context_fingerprint
+from scholarly_client import ScholarlyClient
+from scholarly_index import ScholarlyIndex, arxiv_id
+from title_match import best_match
+from wayback import WaybackLookup
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+
+class LookupFailed(Exception):
+    """A repair source couldn't be queried (network error, 5xx, bad reply).
+
+    Unlike a strategy returning None, this says nothing about whether a fix
+    exists, so the outcome isn't cached and the link is searched again next run.
+    """
+
+
 @dataclass
 class RepairSuggestion:
     """Suggested repair for a broken link"""
@@ -76,6 +94,8 @@ class RepairSuggestion:
     is_archived: bool
     repair_type: str  # direct, wayback, alternative, doi_resolution
     notes: str
+    verified: Optional[bool] = None  # suggested_url fetched and live; None = not checked
+    verification_status: Optional[int] = None  # HTTP status of that fetch
 
     def to_dict(self):
         return asdict(self)
@@ -85,6 +105,13 @@ class CitationRepair:
 
     DOI_RE = re.compile(r'10\.\d{4,9}/[^\s?#]+', re.IGNORECASE)
 
+    # Suggestions not confirmed live stay below every auto-apply threshold
+    UNVERIFIED_CONFIDENCE_CAP = 89
+    # Same per-host spacing link-validator.py uses
+    DOMAIN_INTERVAL = 0.5
+    # Servers that reject HEAD; retried with a one-byte GET
+    HEAD_UNSUPPORTED = frozenset({403, 405, 501})
+
     # Academic search APIs and databases
     ACADEMIC_SOURCES = {
         'arxiv': 'https://export.arxiv.org/api/query',
@@ -104,16 +131,48 @@ class CitationRepair:
         'kubernetes': 'https://kubernetes.io/docs'
     }
 
-    def __init__(self):
+    POST_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})-[^/]*\.md$')
+
+    # Highwire Press <meta name="citation_*"> tags publishers embed for indexers
+    META_TAG_RE = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+    META_ATTR_RE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+    # Search hits scored against the cited title and authors per query
+    SEARCH_CANDIDATES = 5
+
+    # A page the validator fetched this recently needs no second check
+    VERIFIED_FRESH = 24 * 60 * 60
+
+    def __init__(self, max_concurrency: int = 5, cache: Optional[RepairCache] = None,
+                 wayback: Optional[WaybackLookup] = None,
+                 index: Optional[ScholarlyIndex] = None,
+                 client: Optional[ScholarlyClient] = None,
+                 pages: Optional[PageCache] = None):
         self.session = None
+        self.max_concurrency = max_concurrency
+        # Outcomes persisted between runs, "no fix found" included
+        self.cache = cache
+        self.wayback = wayback or WaybackLookup()
+        # DOIs, arXiv IDs, titles and authors seen in the corpus and API responses
+        self.index = index or ScholarlyIndex()
+        # Pooled session with per-API rate limits and a response cache
+        self.client = client or ScholarlyClient()
+        # Page bodies link-validator.py stored, including the last good copy of dead pages
+        self.pages = pages
         self.stats = {
             'total_processed': 0,
             'direct_fixes': 0,
             'wayback_fixes': 0,
             'alternative_fixes': 0,
-            'no_fix_found': 0
+            'no_fix_found': 0,
+            'lookup_failed': 0  # also counted in no_fix_found, but not cached
         }
+        # Per-strategy calls, hits, wins, cancellations and total latency
+        self.strategy_stats: Dict[str, Dict[str, float]] = {}
+        self.verification_stats = {'checked': 0, 'live': 0, 'dead': 0, 'from_page_cache': 0}
         self.repair_cache = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._domain_locks: Dict[str, asyncio.Lock] = {}
 
     @classmethod
     def _extract_doi(cls, text: str) -> Optional[str]:
@@ -132,6 +191,9 @@ class CitationRepair:
         return parsed.netloc.lower().removeprefix('www.'), parsed.path.rstrip('/')
 
     def _same_live_target(self, original_url: str, suggested_url: str) -> bool:
+        same_work = self.index.same_work(original_url, suggested_url)
+        if same_work is not None:
+            return same_work
         original_doi = self._extract_doi(original_url)
         suggested_doi = self._extract_doi(suggested_url)
         if original_doi or suggested_doi:
@@ -185,16 +247,52 @@ class CitationRepair:
             return confidence
         return min(confidence, 90)
 
-    async def initialize(self):
-        """Initialize HTTP session"""
-        self.session = aiohttp.ClientSession(
-            headers={'User-Agent': 'CitationRepair/1.0 (https://williamzujkowski.github.io)'}
+    @classmethod
+    def with_persistent_stores(cls, max_concurrency: int = 5, use_cache: bool = True,
+                               cache_path: Optional[Path] = None,
+                               pages: Optional[PageCache] = None,
+                               cache_dir: Path = DEFAULT_CACHE_DIR) -> 'CitationRepair':
+        """Repair tool backed by the caches under ``cache_dir`` (.cache/link-validation)"""
+        return cls(
+            max_concurrency=max_concurrency,
+            cache=RepairCache(cache_path or cache_dir / 'repairs.json') if use_cache else None,
+            client=ScholarlyClient(cache_dir=cache_dir / 'responses' if use_cache else None),
+            index=ScholarlyIndex(cache_dir / 'scholarly.sqlite' if use_cache else ':memory:'),
+            wayback=WaybackLookup(cache_path=cache_dir / 'wayback.json' if use_cache else None),
+            pages=pages,
         )
 
+    def close_stores(self):
+        """Persist the repair and Wayback caches; close the index and page store"""
+        if self.cache is not None:
+            self.cache.save()
+        self.wayback.save()
+        self.index.close()
+        if self.pages is not None:
+            self.pages.close()
+
+    async def run(self, links_data: Dict, validation_data: Dict, relevance_data: Dict,
+                  verify: bool = True) -> List[RepairSuggestion]:
+        """Find repairs, then confirm replacements are live before anything
+        can auto-apply them (or cap them all when ``verify`` is off)"""
+        repairs = await self.find_repairs(links_data, validation_data, relevance_data)
+        if verify:
+            await self.verify_suggestions(repairs)
+        else:
+            logger.warning("⚠️  Skipping verification: no suggestion can reach auto-apply confidence")
+            for repair in repairs:
+                repair.confidence = min(repair.confidence, self.UNVERIFIED_CONFIDENCE_CAP)
+        return repairs
+
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None):
+        """Open the rate-limited HTTP client, on ``session`` if one is shared"""
+        await self.client.open(session)
+        self.session = self.client.session
+
     async def cleanup(self):
         """Clean up resources"""
-        if self.session:
-            await self.session.close()
+        await self.client.close()
+        self.session = None
 
     async def find_repairs(self, links_data: Dict, validation_data: Dict,
                           relevance_data: Dict) -> List[RepairSuggestion]:
@@ -208,11 +306,42 @@ class CitationRepair:
 
         logger.info(f"🔍 Found {len(broken_links)} links needing repair")
 
-        # Process each broken link
+        self.index.record_links(links_data.get('links', []))
+
+        # A cached outcome is only reused while the prose around every
+        # occurrence of the link is unchanged
+        occurrences = defaultdict(list)
         for link_info in broken_links:
-            self.stats['total_processed'] += 1
-            suggestion = await self._find_replacement(link_info)
+            occurrences[(link_info['link']['url'], link_info['issue_type'])].append(link_info)
+        for group in occurrences.values():
+            fingerprint = context_fingerprint(info['link'] for info in group)
+            for link_info in group:
+                link_info['context_fingerprint'] = fingerprint
+
+        # Look up Wayback captures for every link that will need them in a
+        # few batched CDX queries, instead of one request per link
+        wayback_urls = [
+            info['link']['url'] for info in broken_links
+            if self._uses_wayback(info) and not (
+                self.cache is not None and self.cache.contains(
+                    info['link']['url'], info['issue_type'], info['context_fingerprint']
+                )
+            )
+        ]
+        if wayback_urls and self.session:
+            await self.wayback.prefetch(self.session, wayback_urls)
+
+        # Process broken links concurrently; results keep input order
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(link_info: Dict) -> Optional[RepairSuggestion]:
+            async with semaphore:
+                return await self._find_replacement(link_info)
+
+        suggestions = await asyncio.gather(*(bounded(info) for info in broken_links))
 
+        for suggestion in suggestions:
+            self.stats['total_processed'] += 1
             if suggestion:
                 repairs.append(suggestion)
             else:
@@ -220,6 +349,69 @@ class CitationRepair:
 
         return repairs
 
+    async def verify_suggestions(self, repairs: List[RepairSuggestion]):
+        """Fetch every distinct suggested_url once and record whether it is live.
+
+        Hosts are visited one request at a time, DOMAIN_INTERVAL apart, while
+        different hosts run concurrently up to max_concurrency. URLs the
+        validator fetched within VERIFIED_FRESH are taken from the page cache
+        instead. A suggestion that isn't verified live has its confidence
+        capped below the auto-apply thresholds.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        urls = list(dict.fromkeys(r.suggested_url for r in repairs))
+        outcome = {}
+        for url in urls:
+            fetch = self.pages.latest(url) if self.pages is not None else None
+            if fetch and time.time() - fetch['fetched_at'] <= self.VERIFIED_FRESH:
+                outcome[url] = fetch['status']
+                self.verification_stats['from_page_cache'] += 1
+        to_fetch = [url for url in urls if url not in outcome]
+        fetched = await asyncio.gather(*(self._verify_throttled(url, semaphore) for url in to_fetch))
+        outcome.update(zip(to_fetch, fetched))
+        statuses = [outcome[url] for url in urls]
+
+        self.verification_stats['checked'] += len(urls)
+        for status in statuses:
+            self.verification_stats['live' if self._is_live(status) else 'dead'] += 1
+
+        # A URL cited in several posts shares one suggestion object
+        for repair in {id(r): r for r in repairs}.values():
+            status = outcome[repair.suggested_url]
+            repair.verification_status = status
+            repair.verified = self._is_live(status)
+            if not repair.verified:
+                repair.confidence = min(repair.confidence, self.UNVERIFIED_CONFIDENCE_CAP)
+                reason = f'HTTP {status}' if status else 'no response'
+                repair.notes = f'{repair.notes} (replacement not verified: {reason})'
+
+    @staticmethod
+    def _is_live(status: Optional[int]) -> bool:
+        return status is not None and 200 <= status < 400
+
+    async def _verify_throttled(self, url: str,
+                                semaphore: asyncio.Semaphore) -> Optional[int]:
+        domain = urlparse(url).netloc.lower()
+        lock = self._domain_locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            async with semaphore:
+                status = await self._check_live(url)
+            await asyncio.sleep(self.DOMAIN_INTERVAL)
+        return status
+
+    async def _check_live(self, url: str) -> Optional[int]:
+        """HEAD the URL, falling back to a ranged GET; final status or None"""
+        try:
+            async with self.session.head(url, allow_redirects=True) as response:
+                if response.status not in self.HEAD_UNSUPPORTED:
+                    return response.status
+            async with self.session.get(url, allow_redirects=True,
+                                        headers={'Range': 'bytes=0-0'}) as response:
+                return response.status
+        except Exception as e:
+            logger.debug(f"    Verification of {url} failed: {e}")
+            return None
+
     def _identify_broken_links(self, links_data: Dict, validation_data: Dict,
                               relevance_data: Dict) -> List[Dict]:
         """Identify links that need repair"""
@@ -268,31 +460,73 @@ class CitationRepair:
         url = link['url']
         issue_type = link_info['issue_type']
 
-        # Check cache
+        # Check cache; a URL repeated across posts shares one in-flight search
         cache_key = f"{url}:{issue_type}"
         if cache_key in self.repair_cache:
             return self.repair_cache[cache_key]
+        if self.cache is not None:
+            hit, cached = self.cache.get(url, issue_type, link_info.get('context_fingerprint', ''))
+            if hit:
+                if cached:
+                    self.repair_cache[cache_key] = RepairSuggestion(**cached)
+                    return self.repair_cache[cache_key]
+                return None
+        if cache_key not in self._inflight:
+            self._inflight[cache_key] = asyncio.ensure_future(
+                self._search_replacement(link_info, cache_key)
+            )
+        return await asyncio.shield(self._inflight[cache_key])
 
+    async def _search_replacement(self, link_info: Dict,
+                                  cache_key: str) -> Optional[RepairSuggestion]:
+        try:
+            return await self._repair_link(link_info, cache_key)
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _repair_link(self, link_info: Dict,
+                           cache_key: str) -> Optional[RepairSuggestion]:
+        link = link_info['link']
+        url = link['url']
+        issue_type = link_info['issue_type']
         suggestion = None
 
         # Try different repair strategies based on link type
-        if self._is_academic_url(url) or link['type'] == 'citation':
-            suggestion = await self._repair_academic_citation(link_info)
-        elif self._is_documentation_url(url) or link['type'] == 'documentation':
-            suggestion = await self._repair_documentation_link(link_info)
-        elif issue_type == '404':
-            suggestion = await self._repair_with_wayback(link_info)
-        elif issue_type == 'redirect':
-            suggestion = await self._validate_redirect(link_info)
-        elif issue_type == 'paywall':
-            suggestion = await self._find_open_access_version(link_info)
+        try:
+            if self._is_academic_url(url) or link['type'] == 'citation':
+                suggestion = await self._repair_academic_citation(link_info)
+            elif self._is_documentation_url(url) or link['type'] == 'documentation':
+                suggestion = await self._repair_documentation_link(link_info)
+            elif issue_type == '404':
+                suggestion = await self._repair_with_wayback(link_info)
+            elif issue_type == 'redirect':
+                suggestion = await self._validate_redirect(link_info)
+            elif issue_type == 'paywall':
+                suggestion = await self._find_open_access_version(link_info)
+        except LookupFailed as e:
+            # A source was down: no verdict on this link, so nothing is cached
+            logger.debug(f"  Lookup failed for {url}: {e}")
+            self.stats['lookup_failed'] += 1
+            return None
 
         # Cache result
         if suggestion:
             self.repair_cache[cache_key] = suggestion
+        if self.cache is not None:
+            self.cache.put(url, issue_type, link_info.get('context_fingerprint', ''),
+                           suggestion.to_dict() if suggestion else None)
 
         return suggestion
 
+    def _uses_wayback(self, link_info: Dict) -> bool:
+        """Whether _repair_link will route this link to _repair_with_wayback"""
+        link = link_info['link']
+        url = link['url']
+        if self._is_academic_url(url) or link['type'] == 'citation':
+            return False
+        return (self._is_documentation_url(url) or link['type'] == 'documentation'
+                or link_info['issue_type'] == '404')
+
     async def _repair_academic_citation(self, link_info: Dict) -> Optional[RepairSuggestion]:
         """Repair academic citations"""
         link = link_info['link']
@@ -303,7 +537,7 @@ class CitationRepair:
         # Extract paper details from context
         paper_info = self._extract_paper_info(context, url)
 
-        # Try different academic sources
+        # Try different academic sources, in priority order
         strategies = [
             self._search_arxiv,
             self._search_crossref,
@@ -312,104 +546,245 @@ class CitationRepair:
             self._find_pmc_version
         ]
 
-        for strategy in strategies:
-            try:
-                result = await strategy(paper_info, url, relevance)
+        # All strategies run at once, but the result is the one the sequential
+        # loop would pick: wait on them in priority order and take the first
+        # success, cancelling whatever lower-priority lookups are still running.
+        tasks = [
+            asyncio.ensure_future(self._run_strategy(strategy, paper_info, url, relevance))
+            for strategy in strategies
+        ]
+        failed = None
+        try:
+            for strategy, task in zip(strategies, tasks):
+                try:
+                    result = await task
+                except LookupFailed as e:
+                    # A lower-priority source may still find a fix
+                    failed = failed or e
+                    continue
                 if result:
+                    self._strategy_stats(strategy.__name__)['wins'] += 1
                     self.stats['alternative_fixes'] += 1
                     return result
-            except Exception as e:
-                logger.debug(f"  Strategy {strategy.__name__} failed: {e}")
-                continue
-
+        finally:
+            for strategy, task in zip(strategies, tasks):
+                if not task.done():
+                    task.cancel()
+                    self._strategy_stats(strategy.__name__)['cancelled'] += 1
+
+        # "No fix" only if every source answered
+        if failed is not None:
+            raise failed
         return None
 
+    def _strategy_stats(self, name: str) -> Dict[str, float]:
+        if name not in self.strategy_stats:
+            self.strategy_stats[name] = {
+                'calls': 0, 'hits': 0, 'wins': 0, 'cancelled': 0, 'errors': 0,
+                'total_seconds': 0.0
+            }
+        return self.strategy_stats[name]
+
+    async def _run_strategy(self, strategy, paper_info: Dict, url: str,
+                            relevance: Optional[Dict]) -> Optional[RepairSuggestion]:
+        """Run one repair strategy, recording its latency and whether it hit.
+
+        Any error is re-raised as LookupFailed: the source wasn't asked, so it
+        can't count as finding nothing.
+        """
+        stats = self._strategy_stats(strategy.__name__)
+        start = time.perf_counter()
+        try:
+            result = await strategy(paper_info, url, relevance)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"  Strategy {strategy.__name__} failed: {e}")
+            result = e
+        stats['calls'] += 1
+        stats['total_seconds'] += time.perf_counter() - start
+        if isinstance(result, Exception):
+            stats['errors'] += 1
+            if isinstance(result, LookupFailed):
+                raise result
+            raise LookupFailed(f"{strategy.__name__}: {result}") from result
+        if result:
+            stats['hits'] += 1
+        return result
+
+    def strategy_report(self) -> Dict[str, Dict]:
+        """Latency and hit rate per strategy (completed calls only)"""
+        report = {}
+        for name, stats in self.strategy_stats.items():
+            calls = stats['calls']
+            report[name.lstrip('_')] = {
+                'calls': calls,
+                'hits': stats['hits'],
+                'wins': stats['wins'],
+                'cancelled': stats['cancelled'],
+                'errors': stats['errors'],
+                'hit_rate': round(stats['hits'] / calls, 3) if calls else 0.0,
+                'avg_latency_ms': round(stats['total_seconds'] / calls * 1000, 1) if calls else 0.0,
+            }
+        return report
+
     async def _search_arxiv(self, paper_info: Dict, original_url: str,
                             relevance: Optional[Dict] = None) -> Optional[RepairSuggestion]:
         """Search arXiv for paper"""
         if not paper_info.get('title'):
             return None
 
+        known = self.index.lookup_title(paper_info['title'], need='arxiv_id')
+        if known:
+            return self._arxiv_suggestion(
+                f"https://arxiv.org/abs/{known['arxiv_id']}", known['title'],
+                paper_info, original_url, relevance
+            )
+
         try:
-            query = quote(paper_info['title'])
-            search_url = f"{self.ACADEMIC_SOURCES['arxiv']}?search_query=ti:{query}&max_results=1"
-
-            async with self.session.get(search_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-
-                    # Parse arXiv response (simplified)
-                    if '<entry>' in content:
-                        # Extract URL
-                        url_match = re.search(r'<id>([^<]+)</id>', content)
-                        title_match = re.search(r'<title>([^<]+)</title>', content)
-
-                        if url_match:
-                            new_url = url_match.group(1)
-                            title = title_match.group(1) if title_match else paper_info['title']
-
-                            return RepairSuggestion(
-                                original_url=original_url,
-                                link_hash=paper_info.get('hash', ''),
-                                issue_type='broken_citation',
-                                suggested_url=new_url,
-                                source='arXiv',
-                                confidence=self._cap_confidence(
-                                    85, original_url, new_url, 'alternative', relevance
-                                ),
-                                title=title,
-                                description='Found on arXiv',
-                                is_archived=False,
-                                repair_type='alternative',
-                                notes='Open access version available on arXiv'
-                            )
+            status, content = await self.client.fetch(
+                'arxiv', self.ACADEMIC_SOURCES['arxiv'],
+                {'search_query': f"ti:{paper_info['title']}",
+                 'max_results': str(self.SEARCH_CANDIDATES)}
+            )
+            if status == 429 or status >= 500:
+                raise LookupFailed(f"arXiv returned {status}")
+            if status == 200:
+                # Parse arXiv response (simplified); the feed has its own
+                # <id> and <title>, so read each entry's
+                candidates = []
+                for entry in content.split('<entry>')[1:]:
+                    url_match = re.search(r'<id>([^<]+)</id>', entry)
+                    title_match = re.search(r'<title>([^<]+)</title>', entry)
+                    if url_match and title_match:
+                        candidates.append({
+                            'url': url_match.group(1),
+                            'title': ' '.join(title_match.group(1).split()),
+                            'authors': re.findall(r'<name>([^<]+)</name>', entry),
+                            'year': (re.search(r'<published>(\d{4})', entry) or [None, None])[1],
+                        })
+                for candidate in candidates:
+                    self.index.record(
+                        arxiv=arxiv_id(candidate['url']), title=candidate['title'],
+                        authors=candidate['authors'], year=candidate['year'],
+                        url=candidate['url'], source='arXiv'
+                    )
+
+                match = best_match(paper_info['title'], paper_info.get('authors'), candidates)
+                if match:
+                    chosen = candidates[match[0]]
+                    return self._arxiv_suggestion(
+                        chosen['url'], chosen['title'], paper_info, original_url, relevance,
+                        match_score=match[1]
+                    )
+        except LookupFailed:
+            raise
         except Exception as e:
-            logger.debug(f"    arXiv search error: {e}")
+            raise LookupFailed(f"arXiv search error: {e}") from e
 
         return None
 
+    def _arxiv_suggestion(self, new_url: str, title: str, paper_info: Dict,
+                          original_url: str, relevance: Optional[Dict],
+                          match_score: Optional[float] = None) -> RepairSuggestion:
+        notes = 'Open access version available on arXiv'
+        if match_score is not None:
+            notes += f' (title match {match_score:.2f})'
+        return RepairSuggestion(
+            original_url=original_url,
+            link_hash=paper_info.get('hash', ''),
+            issue_type='broken_citation',
+            suggested_url=new_url,
+            source='arXiv',
+            confidence=self._cap_confidence(
+                85, original_url, new_url, 'alternative', relevance
+            ),
+            title=title,
+            description='Found on arXiv',
+            is_archived=False,
+            repair_type='alternative',
+            notes=notes
+        )
+
     async def _search_crossref(self, paper_info: Dict, original_url: str,
                                relevance: Optional[Dict] = None) -> Optional[RepairSuggestion]:
         """Search CrossRef for DOI"""
         if not paper_info.get('title'):
             return None
 
+        known = self.index.lookup_title(paper_info['title'], need='doi')
+        if known:
+            return self._crossref_suggestion(
+                known['doi'], known['title'], paper_info, original_url, relevance
+            )
+
         try:
-            query = quote(paper_info['title'])
-            search_url = f"{self.ACADEMIC_SOURCES['crossref']}?query={query}&rows=1"
-
-            async with self.session.get(search_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    if data.get('message', {}).get('items'):
-                        item = data['message']['items'][0]
-                        doi = item.get('DOI')
-
-                        if doi:
-                            new_url = f"https://doi.org/{doi}"
-                            title = item.get('title', [''])[0] or paper_info['title']
-
-                            return RepairSuggestion(
-                                original_url=original_url,
-                                link_hash=paper_info.get('hash', ''),
-                                issue_type='broken_citation',
-                                suggested_url=new_url,
-                                source='CrossRef',
-                                confidence=self._cap_confidence(
-                                    90, original_url, new_url, 'doi_resolution', relevance
-                                ),
-                                title=title,
-                                description='DOI resolution link',
-                                is_archived=False,
-                                repair_type='doi_resolution',
-                                notes='Permanent DOI link'
-                            )
+            status, data = await self.client.fetch_json(
+                'crossref', self.ACADEMIC_SOURCES['crossref'],
+                {'query.bibliographic': paper_info['title'],
+                 'rows': str(self.SEARCH_CANDIDATES)}
+            )
+            if status == 429 or status >= 500:
+                raise LookupFailed(f"CrossRef returned {status}")
+            if status == 200:
+                candidates = []
+                for item in data.get('message', {}).get('items', []):
+                    if not item.get('DOI'):
+                        continue
+                    issued = item.get('issued', {}).get('date-parts', [[None]])[0]
+                    candidates.append({
+                        'doi': item['DOI'],
+                        'title': (item.get('title') or [''])[0],
+                        'authors': [
+                            ' '.join(filter(None, (a.get('given'), a.get('family'))))
+                            for a in item.get('author', [])
+                        ],
+                        'year': issued[0] if issued else None,
+                    })
+                for candidate in candidates:
+                    self.index.record(
+                        doi=candidate['doi'], title=candidate['title'] or None,
+                        authors=candidate['authors'], year=candidate['year'],
+                        url=f"https://doi.org/{candidate['doi']}", source='CrossRef'
+                    )
+
+                match = best_match(paper_info['title'], paper_info.get('authors'), candidates)
+                if match:
+                    chosen = candidates[match[0]]
+                    return self._crossref_suggestion(
+                        chosen['doi'], chosen['title'], paper_info, original_url, relevance,
+                        match_score=match[1]
+                    )
+        except LookupFailed:
+            raise
         except Exception as e:
-            logger.debug(f"    CrossRef search error: {e}")
+            raise LookupFailed(f"CrossRef search error: {e}") from e
 
         return None
 
+    def _crossref_suggestion(self, doi: str, title: str, paper_info: Dict,
+                             original_url: str, relevance: Optional[Dict],
+                             match_score: Optional[float] = None) -> RepairSuggestion:
+        new_url = f"https://doi.org/{doi}"
+        notes = 'Permanent DOI link'
+        if match_score is not None:
+            notes += f' (title match {match_score:.2f})'
+        return RepairSuggestion(
+            original_url=original_url,
+            link_hash=paper_info.get('hash', ''),
+            issue_type='broken_citation',
+            suggested_url=new_url,
+            source='CrossRef',
+            confidence=self._cap_confidence(
+                90, original_url, new_url, 'doi_resolution', relevance
+            ),
+            title=title,
+            description='DOI resolution link',
+            is_archived=False,
+            repair_type='doi_resolution',
+            notes=notes
+        )
+
     async def _search_semantic_scholar(self, paper_info: Dict,
                                       original_url: str,
                                       relevance: Optional[Dict] = None) -> Optional[RepairSuggestion]:
@@ -430,7 +805,9 @@ class CitationRepair:
 
         if doi:
             new_url = f"https://doi.org/{doi}"
-            # In production, would verify this resolves
+            # A DOI CrossRef has returned before is known to be registered
+            known = self.index.lookup_url(new_url)
+            registered = bool(known and known['source'] == 'CrossRef')
             return RepairSuggestion(
                 original_url=original_url,
                 link_hash=paper_info.get('hash', ''),
@@ -444,7 +821,8 @@ class CitationRepair:
                 description='Direct DOI link',
                 is_archived=False,
                 repair_type='doi_resolution',
-                notes='Permanent DOI resolution'
+                notes=('Permanent DOI resolution (registered with CrossRef)' if registered
+                       else 'Permanent DOI resolution')
             )
 
         return None
@@ -480,46 +858,49 @@ class CitationRepair:
         return None
 
     async def _repair_with_wayback(self, link_info: Dict) -> Optional[RepairSuggestion]:
-        """Try to find archived version in Wayback Machine"""
-        url = link_info['link']['url']
+        """Find the archived copy closest to when the citing post was written;
+        raises LookupFailed if the Wayback Machine couldn't be asked"""
+        link = link_info['link']
+        url = link['url']
 
         try:
-            # Check Wayback Machine availability API
-            wayback_api = f"https://archive.org/wayback/available?url={quote(url)}"
-
-            async with self.session.get(wayback_api) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    if data.get('archived_snapshots', {}).get('closest'):
-                        snapshot = data['archived_snapshots']['closest']
-                        wayback_url = snapshot['url']
-
-                        # Ensure HTTPS
-                        wayback_url = wayback_url.replace('http://', 'https://')
-
-                        self.stats['wayback_fixes'] += 1
-
-                        return RepairSuggestion(
-                            original_url=url,
-                            link_hash=link_info['link'].get('hash', ''),
-                            issue_type=link_info['issue_type'],
-                            suggested_url=wayback_url,
-                            source='Wayback Machine',
-                            confidence=self._cap_confidence(
-                                70, url, wayback_url, 'wayback', link_info.get('relevance', {}),
-                                is_archived=True
-                            ),
-                            title=link_info['link'].get('text', 'Archived Page'),
-                            description=f"Archived on {snapshot.get('timestamp', 'unknown')}",
-                            is_archived=True,
-                            repair_type='wayback',
-                            notes='Historical snapshot - content may be outdated'
-                        )
+            post_date = self._post_date(link.get('file_path', ''))
+            snapshot = await self.wayback.closest(self.session, url, before=post_date)
         except Exception as e:
-            logger.debug(f"    Wayback Machine error: {e}")
+            raise LookupFailed(f"Wayback Machine error: {e}") from e
+        if not snapshot:
+            return None
 
-        return None
+        timestamp = snapshot['timestamp']
+        if snapshot['before_date']:
+            confidence, notes = 70, 'Snapshot from before the post was published'
+        else:
+            confidence, notes = 60, 'Only later snapshots exist - content may have changed'
+
+        self.stats['wayback_fixes'] += 1
+
+        return RepairSuggestion(
+            original_url=url,
+            link_hash=link.get('hash', ''),
+            issue_type=link_info['issue_type'],
+            suggested_url=snapshot['url'],
+            source='Wayback Machine',
+            confidence=self._cap_confidence(
+                confidence, url, snapshot['url'], 'wayback', link_info.get('relevance', {}),
+                is_archived=True
+            ),
+            title=link.get('text', 'Archived Page'),
+            description=f"Archived on {timestamp[:4]}-{timestamp[4:6]}-{timestamp[6:8]}",
+            is_archived=True,
+            repair_type='wayback',
+            notes=notes
+        )
+
+    @classmethod
+    def _post_date(cls, file_path: str) -> Optional[str]:
+        """Publication date (YYYYMMDD) from a dated post filename"""
+        match = cls.POST_DATE_RE.search(file_path or '')
+        return ''.join(match.groups()) if match else None
 
     async def _validate_redirect(self, link_info: Dict) -> Optional[RepairSuggestion]:
         """Validate and suggest accepting redirects"""
@@ -631,25 +1012,118 @@ class CitationRepair:
         if arxiv_match:
             info['arxiv_id'] = arxiv_match.group(1)
 
+        # The publisher's own citation_* tags, from the last copy the validator
+        # stored (for a dead link, from before it died)
+        info.update(self._page_metadata(url))
+
+        # Metadata the index already holds for this URL beats regex guesses
+        known = self.index.lookup_url(url)
+        if known:
+            if known['title']:
+                info['title'] = known['title']
+            if known['authors']:
+                info['authors'] = ', '.join(known['authors'])
+            for field, key in (('year', 'year'), ('doi', 'doi'), ('arxiv_id', 'arxiv_id')):
+                if known[key]:
+                    info[field] = known[key]
+
         return info
 
-    def save_results(self, repairs: List[RepairSuggestion], output_file: Path):
-        """Save repair suggestions"""
-        data = {
+    def _page_metadata(self, url: str) -> Dict:
+        """Title, authors, year, DOI and arXiv ID from a stored page's meta tags"""
+        body = self.pages.get(url) if self.pages is not None else None
+        if not body:
+            return {}
+
+        tags = defaultdict(list)
+        for tag in self.META_TAG_RE.findall(body):
+            attrs = {k.lower(): a or b for k, a, b in self.META_ATTR_RE.findall(tag)}
+            name = attrs.get('name', '').lower()
+            if name.startswith('citation_') and attrs.get('content', '').strip():
+                tags[name].append(' '.join(attrs['content'].split()))
+
+        info = {}
+        if tags['citation_title']:
+            info['title'] = tags['citation_title'][0]
+        if tags['citation_author']:
+            info['authors'] = ', '.join(tags['citation_author'])
+        date = (tags['citation_publication_date'] or tags['citation_date'] or [''])[0]
+        year = re.search(r'\b(\d{4})\b', date)
+        if year:
+            info['year'] = year.group(1)
+        if tags['citation_doi']:
+            doi = self._extract_doi(tags['citation_doi'][0])
+            if doi:
+                info['doi'] = doi
+        if tags['citation_arxiv_id']:
+            arxiv = arxiv_id(f"arxiv:{tags['citation_arxiv_id'][0]}")
+            if arxiv:
+                info['arxiv_id'] = arxiv
+        return info
+
+    def results_data(self, repairs: List[RepairSuggestion]) -> Dict:
+        """repairs.json contents"""
+        return {
             'repair_date': datetime.now().isoformat(),
             'stats': self.stats,
+            'strategy_stats': self.strategy_report(),
+            'cache_stats': self.cache.stats if self.cache is not None else {},
+            'wayback_stats': self.wayback.stats,
+            'index_stats': self.index.stats,
+            'api_stats': {**self.client.stats, 'by_api': self.client.api_stats},
+            'verification_stats': self.verification_stats,
             'repairs': [r.to_dict() for r in repairs]
         }
 
+    def save_results(self, repairs: List[RepairSuggestion], output_file: Path):
+        """Save repair suggestions"""
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+            json.dump(self.results_data(repairs), f, indent=2)
+
+        self.log_summary()
+        logger.info(f"💾 Results saved to {output_file}")
 
+    def log_summary(self):
         logger.info(f"✅ Processed {self.stats['total_processed']} broken links")
         logger.info(f"🔧 Direct fixes: {self.stats['direct_fixes']}")
         logger.info(f"📚 Wayback fixes: {self.stats['wayback_fixes']}")
         logger.info(f"🔄 Alternative fixes: {self.stats['alternative_fixes']}")
         logger.info(f"❌ No fix found: {self.stats['no_fix_found']}")
-        logger.info(f"💾 Results saved to {output_file}")
+        if self.cache is not None:
+            cache_stats = self.cache.stats
+            logger.info(
+                f"🗄️  Repair cache: {cache_stats['hits']} fixes and "
+                f"{cache_stats['negative_hits']} no-fix outcomes reused, "
+                f"{cache_stats['misses']} searched "
+                f"({cache_stats['expired']} expired, {cache_stats['invalidated']} context changed)"
+            )
+        if self.verification_stats['checked']:
+            logger.info(
+                f"✔️  Verified {self.verification_stats['checked']} replacement URLs: "
+                f"{self.verification_stats['live']} live, {self.verification_stats['dead']} not "
+                f"({self.verification_stats['from_page_cache']} from the page cache)"
+            )
+        client_stats = self.client.stats
+        if client_stats['requests'] or client_stats['cache_hits']:
+            logger.info(
+                f"🌐 Scholarly APIs: {client_stats['requests']} requests made, "
+                f"{client_stats['cache_hits']} served from cache, "
+                f"{client_stats['throttled_seconds']:.1f}s throttled, "
+                f"{client_stats['retries']} retried after 429/503"
+            )
+        wayback_stats = self.wayback.stats
+        if wayback_stats['requests'] or wayback_stats['cache_hits']:
+            logger.info(
+                f"🏛️  Wayback CDX: {wayback_stats['requests']} requests "
+                f"({wayback_stats['prefix_queries']} prefix), "
+                f"{wayback_stats['cache_hits']} lookups served from cache"
+            )
+        for name, stats in self.strategy_report().items():
+            logger.info(
+                f"   {name}: {stats['hits']}/{stats['calls']} hits "
+                f"({stats['hit_rate']:.0%}), avg {stats['avg_latency_ms']:.0f} ms, "
+                f"{stats['wins']} used, {stats['cancelled']} cancelled, {stats['errors']} failed"
+            )
 
 async def main():
     parser = argparse.ArgumentParser(
@@ -675,6 +1149,19 @@ Examples:
     parser.add_argument('--output', type=Path,
                        default=Path('repairs.json'),
                        help='Output file')
+    parser.add_argument('--concurrency', type=int, default=5,
+                       help='Broken links repaired concurrently (default: 5)')
+    parser.add_argument('--cache', type=Path, default=None,
+                       help='Repair cache file (default: .cache/link-validation/repairs.json)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Search every broken link, ignoring cached outcomes')
+    parser.add_argument('--page-cache', type=Path, default=None,
+                       help='Page bodies stored by link-validator.py '
+                            '(default: .cache/link-validation/pages)')
+    parser.add_argument('--no-page-cache', action='store_true',
+                       help="Don't read page bodies stored by link-validator.py")
+    parser.add_argument('--no-verify', action='store_true',
+                       help='Skip fetching suggested URLs (caps confidence below auto-apply)')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress progress messages')
 
@@ -692,19 +1179,23 @@ Examples:
             relevance_data = json.load(f)
 
         # Initialize repair tool
-        repair_tool = CitationRepair()
+        repair_tool = CitationRepair.with_persistent_stores(
+            max_concurrency=args.concurrency, use_cache=not args.no_cache,
+            cache_path=args.cache,
+            pages=None if args.no_page_cache else PageCache(args.page_cache)
+        )
         await repair_tool.initialize()
 
         try:
-            # Find repairs
-            repairs = await repair_tool.find_repairs(
-                links_data, validation_data, relevance_data
+            repairs = await repair_tool.run(
+                links_data, validation_data, relevance_data, verify=not args.no_verify
             )
 
             # Save results
             repair_tool.save_results(repairs, args.output)
         finally:
             await repair_tool.cleanup()
+            repair_tool.close_stores()
 
         sys.exit(0)
     except FileNotFoundError as e:
@@ -18,6 +18,11 @@ ARGUMENTS:
     --input: Path to validation results JSON
     --links: Path to extracted links JSON
     --output: Path to output markdown report
+    --history: Validation history database (trend and flapping sections)
+    --no-history: Skip recording the run and the history sections
+    --changed-posts: Report only these posts (incremental; totals stay global)
+    --since: Report only posts changed since a git revision or range
+    --section-cache: Per-post entries of the last full report
     --verbose: Enable verbose output
 
 EXAMPLES:
@@ -27,6 +32,12 @@ EXAMPLES:
         --links citation-links.json \
         --output citation-report.md
 
+    # PR comment: sections for the changed posts, totals for all posts
+    python scripts/link-validation/citation-report.py \
+        --input citation-validation.json \
+        --links citation-links.json \
+        --since origin/main...HEAD
+
 OUTPUT:
     - Markdown formatted report with broken citation links
     - Grouped by blog post
@@ -45,19 +56,62 @@ import argparse
 import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 
 # Add lib directory to path for logging_config
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from git_changes import GitError, changed_files
 from logging_config import setup_logger
+from repair_cache import DEFAULT_CACHE_DIR
+from repair_journal import write_atomic
+from validation_history import ValidationHistory, history_sections
 
 logger = setup_logger(__name__)
 
 
-def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
-    """Generate markdown report for broken citation links"""
+DEFAULT_SECTION_CACHE = DEFAULT_CACHE_DIR / 'citation-report.json'
+
+PostEntries = Dict[str, List[Dict]]
+
+
+class SectionCache:
+    """Per-post broken and restricted citation entries from the last report.
+
+    An incremental report (``changed_posts``) re-walks only the changed
+    posts' links. Every other post's entries come from here, so the summary
+    still counts the whole archive.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or DEFAULT_SECTION_CACHE
+
+    def load(self) -> Optional[Dict[str, PostEntries]]:
+        """{'broken': {post: entries}, 'restricted': {post: entries}}, or None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.VERSION:
+            return None
+        return {'broken': data['broken'], 'restricted': data['restricted']}
+
+    def save(self, broken_by_post: PostEntries, restricted_by_post: PostEntries):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': self.VERSION, 'created_date': datetime.now().isoformat(),
+                'broken': broken_by_post, 'restricted': restricted_by_post}
+        write_atomic(self.path, json.dumps(data).encode('utf-8'))
 
+
+def collect_post_entries(validation_data: Dict, links: Iterable[Dict],
+                         posts: Optional[Set[str]] = None) -> Tuple[PostEntries, PostEntries]:
+    """Broken and restricted citation entries by post name.
+
+    With ``posts``, only links in those posts (by file name) are looked at.
+    """
     # Map validation results by URL
     validation_map = {r['url']: r for r in validation_data.get('results', [])}
 
@@ -69,7 +123,11 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
     broken_by_post = defaultdict(list)
     restricted_by_post = defaultdict(list)
 
-    for link in links_data.get('links', []):
+    for link in links:
+        post_path = Path(link['file_path'])
+        if posts is not None and post_path.name not in posts:
+            continue
+
         url = link['url']
         validation = validation_map.get(url, {})
         status = validation.get('status')
@@ -77,7 +135,6 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
         if status not in ('broken', 'restricted'):
             continue
 
-        post_path = Path(link['file_path'])
         entry = {
             'url': url,
             'line': link['line_number'],
@@ -93,22 +150,87 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
         else:
             restricted_by_post[post_path.name].append(entry)
 
+    return dict(broken_by_post), dict(restricted_by_post)
+
+
+def _merge_posts(cached: PostEntries, fresh: PostEntries, changed: Set[str]) -> PostEntries:
+    """Cached entries of unchanged posts plus fresh entries of changed ones"""
+    merged = {post: entries for post, entries in cached.items() if post not in changed}
+    merged.update(fresh)
+    return merged
+
+
+def generate_citation_report(validation_data: Dict, links_data: Dict,
+                             history: Optional[ValidationHistory] = None,
+                             changed_posts: Optional[Iterable[str]] = None,
+                             section_cache: Optional[SectionCache] = None) -> str:
+    """Generate markdown report for broken citation links.
+
+    With ``history``, the run is recorded there and the report gains trend
+    and flapping-link sections covering recent citation runs.
+
+    With ``changed_posts`` (post paths or names), only those posts' links
+    are checked and only their sections are rendered. The other posts'
+    entries are taken from ``section_cache`` so the summary statistics
+    still cover every post; the full report (no ``changed_posts``) is what
+    fills the cache. An incremental run isn't recorded in ``history``, as
+    its validation covers only part of the archive.
+    """
+    trend = []
+    if history is not None:
+        if changed_posts is None:
+            history.record(validation_data, suite='citations')
+        trend = history_sections(history, 'citations')
+
+    shown = None if changed_posts is None else {Path(p).name for p in changed_posts}
+    broken_by_post, restricted_by_post = collect_post_entries(
+        validation_data, links_data.get('links', []), shown
+    )
+
+    cached = None
+    if shown is not None:
+        cached = section_cache.load() if section_cache is not None else None
+        if cached is None:
+            logger.warning("No cached citation report: totals cover the changed posts only")
+        else:
+            broken_by_post = _merge_posts(cached['broken'], broken_by_post, shown)
+            restricted_by_post = _merge_posts(cached['restricted'], restricted_by_post, shown)
+    if section_cache is not None and (shown is None or cached is not None):
+        section_cache.save(broken_by_post, restricted_by_post)
+
+    shown_broken = broken_by_post
+    shown_restricted = restricted_by_post
+    if shown is not None:
+        shown_broken = {post: e for post, e in broken_by_post.items() if post in shown}
+        shown_restricted = {post: e for post, e in restricted_by_post.items() if post in shown}
+
     # Generate report
     report = []
     report.append("# Broken Citation Links by Blog Post")
     report.append("")
 
+    if shown is not None:
+        unchanged = len(set(broken_by_post) - shown)
+        report.append(f"Changed posts only ({len(shown)}); summary totals cover all posts, "
+                      f"including {unchanged} unchanged post(s) with broken links from the last full report.")
+        report.append("")
+
     if not broken_by_post and not restricted_by_post:
         report.append("✅ No broken citation links found!")
+        report.extend(trend)
         return '\n'.join(report)
 
     if not broken_by_post:
         report.append("✅ No genuinely broken citation links found!")
         report.append("")
     else:
+        if not shown_broken:
+            report.append("✅ No broken citation links in the changed posts.")
+            report.append("")
+
         # Sort posts by number of broken links (most broken first)
         sorted_posts = sorted(
-            broken_by_post.items(),
+            shown_broken.items(),
             key=lambda x: len(x[1]),
             reverse=True
         )
@@ -186,8 +308,8 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
     # These are 403 / 401 / paywall responses: CI can't verify them (publisher
     # WAF blocks, login walls), but a human reader can usually still see the
     # page fine. Not an alarm -- verify manually if you have doubts.
-    if restricted_by_post:
-        total_restricted = sum(len(links) for links in restricted_by_post.values())
+    if shown_restricted:
+        total_restricted = sum(len(links) for links in shown_restricted.values())
         report.append("<details>")
         report.append(
             f"<summary>🔒 Access-restricted / unverifiable ({total_restricted} links, "
@@ -203,7 +325,7 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
         report.append("")
 
         sorted_restricted_posts = sorted(
-            restricted_by_post.items(),
+            shown_restricted.items(),
             key=lambda x: len(x[1]),
             reverse=True
         )
@@ -225,6 +347,10 @@ def generate_citation_report(validation_data: Dict, links_data: Dict) -> str:
         report.append("</details>")
         report.append("")
 
+    if trend:
+        report.extend(trend)
+        report.append("")
+
     # Add repair recommendations
     report.append("## 🔧 Repair Recommendations")
     report.append("")
@@ -281,6 +407,37 @@ def main() -> int:
         default=Path('citation-report.md'),
         help='Output markdown report path'
     )
+    parser.add_argument(
+        '--history',
+        type=Path,
+        default=None,
+        help='Validation history database (default: .cache/link-validation/history.sqlite)'
+    )
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help="Don't record this run or report trends"
+    )
+    changed = parser.add_mutually_exclusive_group()
+    changed.add_argument(
+        '--changed-posts',
+        type=Path,
+        nargs='+',
+        metavar='POST',
+        help='Report only these posts; other posts come from the section cache'
+    )
+    changed.add_argument(
+        '--since',
+        metavar='GIT_REV',
+        help='Report only posts changed since this revision or range (e.g. origin/main...HEAD)'
+    )
+    parser.add_argument(
+        '--section-cache',
+        type=Path,
+        default=None,
+        help='Per-post entries of the last full report '
+             '(default: .cache/link-validation/citation-report.json)'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -312,9 +469,24 @@ def main() -> int:
             logger.info(f"Loaded validation results: {len(validation_data.get('results', []))} links")
             logger.info(f"Loaded link data: {len(links_data.get('links', []))} links")
 
+        changed_posts = args.changed_posts
+        if args.since:
+            try:
+                changed_posts = changed_files(args.since)
+            except GitError as e:
+                logger.error(f"Could not list posts changed since {args.since}: {e}")
+                return 1
+            logger.info(f"{len(changed_posts)} posts changed since {args.since}")
+
         # Generate report
         logger.debug("Generating citation report")
-        report = generate_citation_report(validation_data, links_data)
+        history = None if args.no_history else ValidationHistory(args.history)
+        try:
+            report = generate_citation_report(validation_data, links_data, history,
+                                              changed_posts, SectionCache(args.section_cache))
+        finally:
+            if history is not None:
+                history.close()
 
         # Save report
         logger.debug(f"Writing report to {args.output}")
@@ -0,0 +1,389 @@
+#!/usr/bin/env -S uv run python3
+"""
+SCRIPT: content-relevance-checker.py
+PURPOSE: Content Relevance Checker
+CATEGORY: link_validation
+LLM_READY: True
+VERSION: 1.0.0
+UPDATED: 2026-10-19
+
+DESCRIPTION:
+    Scores how well each live link's target page matches the prose that cites
+    it. The words around a link (context_before, link text, context_after)
+    and the target page's title and text are compared with TF-IDF cosine
+    similarity, computed for every link at once with NumPy. Page bodies come
+    from the cache link-validator.py fills while validating, so nothing is
+    fetched twice.
+
+    A link whose page has drifted away from its context (a domain now parked,
+    a docs page replaced by a landing page) gets suggested_action 'replace',
+    which citation-repair.py treats as a repair candidate ('low_relevance').
+
+LLM_USAGE:
+    python scripts/link-validation/content-relevance-checker.py --links links.json --validation validation.json --output relevance.json
+
+ARGUMENTS:
+    --links: JSON file with extracted links (default: links.json)
+    --validation: Validation results (default: validation.json)
+    --output: Output file (default: relevance.json)
+    --page-cache: Page bodies stored by link-validator.py
+    --fetch-missing: Fetch pages the validator didn't store
+    --quiet/-q: Suppress progress messages
+
+EXAMPLES:
+    # After link-validator.py
+    python scripts/link-validation/content-relevance-checker.py \\
+      --links links.json --validation validation.json --output relevance.json
+
+OUTPUT:
+    - relevance.json: one result per URL with relevance_score and
+      suggested_action ('keep', 'review', 'replace' or 'unchecked')
+
+DEPENDENCIES:
+    - Python 3.8+
+    - numpy
+    - aiohttp (only with --fetch-missing)
+    - scripts/lib/page_cache.py for validator-cached page bodies
+
+RELATED_SCRIPTS:
+    - link-validator.py: Validates links and caches page bodies
+    - citation-repair.py: Repairs links marked 'replace'
+
+MANIFEST_REGISTRY: scripts/link-validation/content-relevance-checker.py
+"""
+
+import json
+import re
+import asyncio
+import argparse
+import html
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from logging_config import setup_logger
+from page_cache import PageCache, page_title, read_body
+
+logger = setup_logger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+TOKEN_RE = re.compile(r'[a-z][a-z0-9]+')
+INVISIBLE_RE = re.compile(
+    r'<(script|style|noscript|svg|template)\b.*?</\1\s*>|<!--.*?-->',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_RE = re.compile(r'<[^>]+>')
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been
+before being below between both but by can could did do does doing down
+during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off
+on once only or other our ours out over own same she should so some such than
+that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will
+with you your yours see via use using used one two new get like well also may
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def page_text(body: str) -> Tuple[str, str]:
+    """(title, visible text) of an HTML page"""
+    text = TAG_RE.sub(' ', INVISIBLE_RE.sub(' ', body))
+    return page_title(body), html.unescape(text)
+
+
+def cosine_scores(contexts: List[List[str]], pages: List[List[str]],
+                  pair_page: List[int]) -> 'np.ndarray':
+    """TF-IDF cosine similarity of ``contexts[i]`` and ``pages[pair_page[i]]``.
+
+    Documents are held as sparse (doc, term, weight) arrays; all pairs are
+    scored with a handful of vectorized operations rather than a Python loop
+    over links. Pages shared by several links are weighted once for IDF.
+    """
+    n_ctx, n_pages = len(contexts), len(pages)
+    if n_ctx == 0:
+        return np.zeros(0)
+
+    vocab: Dict[str, int] = {}
+    docs = contexts + pages
+    term_ids = np.fromiter(
+        (vocab.setdefault(t, len(vocab)) for tokens in docs for t in tokens), dtype=np.int64
+    )
+    doc_ids = np.repeat(np.arange(len(docs), dtype=np.int64), [len(tokens) for tokens in docs])
+    V = max(len(vocab), 1)
+
+    # Term frequencies per document, entries sorted by (doc, term)
+    keys, tf = np.unique(doc_ids * V + term_ids, return_counts=True)
+    doc, term = keys // V, keys % V
+
+    df = np.bincount(term, minlength=V)
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    weight = (1 + np.log(tf)) * idf[term]
+    norms = np.sqrt(np.bincount(doc, weights=weight * weight, minlength=len(docs)))
+
+    is_ctx = doc < n_ctx
+    ctx_keys, ctx_w = doc[is_ctx] * V + term[is_ctx], weight[is_ctx]
+
+    # Expand each page's entries once per pair that cites it
+    p_doc, p_term, p_w = doc[~is_ctx] - n_ctx, term[~is_ctx], weight[~is_ctx]
+    starts = np.searchsorted(p_doc, np.arange(n_pages))
+    lengths = np.bincount(p_doc, minlength=n_pages)
+    pair_page = np.asarray(pair_page, dtype=np.int64)
+    per_pair = lengths[pair_page]
+    pair_of_entry = np.repeat(np.arange(n_ctx), per_pair)
+    offset = np.arange(per_pair.sum()) - np.repeat(np.cumsum(per_pair) - per_pair, per_pair)
+    entry = np.repeat(starts[pair_page], per_pair) + offset
+    page_keys = pair_of_entry * V + p_term[entry]
+
+    _, ci, pi = np.intersect1d(ctx_keys, page_keys, assume_unique=True, return_indices=True)
+    dots = np.bincount(ctx_keys[ci] // V, weights=ctx_w[ci] * p_w[entry[pi]], minlength=n_ctx)
+
+    denom = norms[:n_ctx] * norms[n_ctx + pair_page]
+    return np.divide(dots, denom, out=np.zeros(n_ctx), where=denom > 0)
+
+
+class RelevanceChecker:
+    """Score live links against the pages they point to"""
+
+    # Thresholds on the best cosine score over a URL's occurrences
+    REPLACE_BELOW = 0.02   # effectively nothing in common
+    REVIEW_BELOW = 0.06
+    MIN_PAGE_TOKENS = 30   # JS shells and interstitials can't be judged
+    MIN_CONTEXT_TOKENS = 5
+    MAX_PAGE_TOKENS = 5000
+    LIVE_STATUSES = ('valid', 'redirect')
+
+    def __init__(self, page_cache: Optional[PageCache] = None, fetch_missing: bool = False):
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.fetch_missing = fetch_missing
+        self.stats = {
+            'total_urls': 0,
+            'scored': 0,
+            'unchecked': 0,
+            'keep': 0,
+            'review': 0,
+            'replace': 0,
+            'pages_from_cache': 0,
+            'pages_fetched': 0,
+            'contexts_scored': 0,
+            'scoring_seconds': 0.0,
+            'links_per_second': 0
+        }
+
+    def check(self, links_data: Dict, validation_data: Dict,
+              bodies: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """One result per URL, in first-occurrence order"""
+        validation_map = {r['url']: r for r in validation_data.get('results', [])}
+        bodies = bodies or {}
+
+        occurrences: Dict[str, List[Dict]] = {}
+        for link in links_data.get('links', []):
+            url = link['url']
+            if url.startswith(('http://', 'https://')):
+                occurrences.setdefault(url, []).append(link)
+        self.stats['total_urls'] = len(occurrences)
+
+        pages: List[List[str]] = []
+        titles: List[str] = []
+        page_index: Dict[str, int] = {}
+        contexts: List[List[str]] = []
+        pair_page: List[int] = []
+        pair_url: List[str] = []
+        results: Dict[str, Dict] = {}
+
+        for url, links in occurrences.items():
+            validation = validation_map.get(url, {})
+            result = {'url': url, 'occurrences': len(links), 'relevance_score': None,
+                      'suggested_action': 'unchecked', 'page_title': validation.get('page_title'),
+                      'reason': None}
+            results[url] = result
+
+            if validation.get('status') not in self.LIVE_STATUSES:
+                result['reason'] = 'not_live'
+                continue
+            body = bodies.get(url) or self.page_cache.get(url)
+            if body is None:
+                result['reason'] = 'no_cached_body'
+                continue
+            if url not in bodies:
+                self.stats['pages_from_cache'] += 1
+
+            title, text = page_text(body)
+            title_tokens = tokenize(title)
+            tokens = (title_tokens * 2 + tokenize(text))[:self.MAX_PAGE_TOKENS]
+            if len(tokens) < self.MIN_PAGE_TOKENS:
+                result['reason'] = 'too_little_page_text'
+                continue
+            result['page_title'] = title or result['page_title']
+
+            page_index[url] = len(pages)
+            pages.append(tokens)
+            for link in links:
+                context = tokenize(' '.join((
+                    link.get('context_before', ''), link.get('text', ''),
+                    link.get('context_after', '')
+                )))
+                if len(context) >= self.MIN_CONTEXT_TOKENS:
+                    contexts.append(context)
+                    pair_page.append(page_index[url])
+                    pair_url.append(url)
+
+        start = time.perf_counter()
+        scores = cosine_scores(contexts, pages, pair_page)
+        elapsed = time.perf_counter() - start
+        self.stats['contexts_scored'] = len(contexts)
+        self.stats['scoring_seconds'] = round(elapsed, 4)
+        self.stats['links_per_second'] = round(len(contexts) / elapsed) if elapsed > 0 else 0
+
+        # A URL is as relevant as its best-matching citation
+        best = np.full(len(pages), -1.0)
+        np.maximum.at(best, np.asarray(pair_page, dtype=np.int64), scores)
+        for url, idx in page_index.items():
+            result = results[url]
+            if best[idx] < 0:
+                result['reason'] = 'too_little_context'
+                continue
+            score = round(float(best[idx]), 4)
+            result['relevance_score'] = score
+            if score < self.REPLACE_BELOW:
+                result['suggested_action'] = 'replace'
+            elif score < self.REVIEW_BELOW:
+                result['suggested_action'] = 'review'
+            else:
+                result['suggested_action'] = 'keep'
+
+        for result in results.values():
+            self.stats[result['suggested_action']] += 1
+        self.stats['scored'] = len(results) - self.stats['unchecked']
+        return list(results.values())
+
+    async def fetch_pages(self, links_data: Dict, validation_data: Dict,
+                          session=None) -> Dict[str, str]:
+        """Fetch live pages the validator didn't cache (``--fetch-missing``),
+        on ``session`` if one is shared"""
+        import aiohttp
+
+        live = {r['url'] for r in validation_data.get('results', [])
+                if r.get('status') in self.LIVE_STATUSES}
+        missing = sorted({
+            link['url'] for link in links_data.get('links', [])
+            if link['url'] in live and self.page_cache.latest(link['url']) is None
+        })
+        bodies: Dict[str, str] = {}
+        semaphore = asyncio.Semaphore(10)
+        timeout = aiohttp.ClientTimeout(total=30)
+
+        async def fetch(session, url):
+            async with semaphore:
+                try:
+                    async with session.get(url, allow_redirects=True,
+                                           timeout=timeout) as response:
+                        if response.status < 400:
+                            bodies[url] = await read_body(response)
+                            self.page_cache.put(url, bodies[url], status=response.status)
+                except Exception as e:
+                    logger.debug(f"  Fetch failed for {url}: {e}")
+
+        if session is not None:
+            await asyncio.gather(*(fetch(session, url) for url in missing))
+        else:
+            async with aiohttp.ClientSession() as own_session:
+                await asyncio.gather(*(fetch(own_session, url) for url in missing))
+        self.stats['pages_fetched'] = len(bodies)
+        return bodies
+
+    def results_data(self, results: List[Dict]) -> Dict:
+        """relevance.json contents"""
+        return {
+            'check_date': datetime.now().isoformat(),
+            'stats': self.stats,
+            'page_cache_stats': self.page_cache.stats,
+            'results': results
+        }
+
+    def save_results(self, results: List[Dict], output_file: Path):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.results_data(results), f, indent=2)
+
+        self.log_summary()
+        logger.info(f"💾 Results saved to {output_file}")
+
+    def log_summary(self):
+        logger.info(f"✅ Scored {self.stats['scored']} of {self.stats['total_urls']} URLs "
+                    f"in {self.stats['scoring_seconds']:.3f}s "
+                    f"({self.stats['links_per_second']} links/s)")
+        logger.info(f"👍 Keep: {self.stats['keep']}")
+        logger.info(f"🔍 Review: {self.stats['review']}")
+        logger.info(f"🔄 Replace: {self.stats['replace']}")
+        logger.info(f"❔ Unchecked (not live or no page text): {self.stats['unchecked']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score how well linked pages match the prose that cites them',
+        epilog='''
+Examples:
+  %(prog)s --links links.json --validation validation.json --output relevance.json
+  %(prog)s --fetch-missing
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
+    parser.add_argument('--links', type=Path, default=Path('links.json'),
+                       help='Links data file')
+    parser.add_argument('--validation', type=Path, default=Path('validation.json'),
+                       help='Validation results file')
+    parser.add_argument('--output', type=Path, default=Path('relevance.json'),
+                       help='Output file')
+    parser.add_argument('--page-cache', type=Path, default=None,
+                       help='Page bodies stored by link-validator.py '
+                            '(default: .cache/link-validation/pages)')
+    parser.add_argument('--fetch-missing', action='store_true',
+                       help="Fetch live pages the validator didn't cache")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Suppress progress messages')
+
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        logger.error("Error: numpy is required (pip install numpy)")
+        sys.exit(2)
+
+    try:
+        with open(args.links, 'r', encoding='utf-8') as f:
+            links_data = json.load(f)
+        with open(args.validation, 'r', encoding='utf-8') as f:
+            validation_data = json.load(f)
+
+        checker = RelevanceChecker(PageCache(args.page_cache), fetch_missing=args.fetch_missing)
+        bodies = {}
+        if args.fetch_missing:
+            bodies = asyncio.run(checker.fetch_pages(links_data, validation_data))
+
+        results = checker.check(links_data, validation_data, bodies)
+        checker.save_results(results, args.output)
+        checker.page_cache.close()
+        sys.exit(0)
+    except FileNotFoundError as e:
+        logger.error(f"Error: File not found: {e}")
+        logger.error("Expected files: links.json, validation.json")
+        logger.info("Tip: Run link extraction and validation first")
+        sys.exit(2)
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,7 @@ LLM_USAGE:
 ARGUMENTS:
     --help: Show help message
     --verbose: Enable verbose output
+    --since: Only links on lines changed since a git revision
     [Additional arguments specific to this script]
 
 EXAMPLES:
@@ -45,34 +46,91 @@ MANIFEST_REGISTRY: scripts/link-extractor.py
 import re
 import json
 import argparse
+import asyncio
+import logging
+import os
 import sys
+import textwrap
 from pathlib import Path
-from typing import Dict, List, Tuple
-from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
 import hashlib
 
 # Setup logging
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from git_changes import GitError, changed_lines
 from logging_config import setup_logger
+from occurrence_index import OccurrenceIndex, index_path
 
 logger = setup_logger(__name__)
 
-@dataclass
+CONTEXT_LINES = 3   # lines of context on each side of a link
+CONTEXT_WORDS = 50  # words kept from each context window
+NO_CONTEXT = (0, 0, 0, 0)  # span for links extracted without surrounding prose
+
+
+@lru_cache(maxsize=8)
+def _read_source(file_path: str, mtime_ns: int) -> str:
+    """Post text for context materialization; mtime_ns keys out stale copies."""
+    return Path(file_path).read_text(encoding='utf-8')
+
+
+def _context_words(text: str, start: int, end: int, tail: bool) -> str:
+    """Whitespace-normalized words of ``text[start:end]``, capped at CONTEXT_WORDS"""
+    words = text[start:end].split()
+    return ' '.join(words[-CONTEXT_WORDS:] if tail else words[:CONTEXT_WORDS])
+
+
+@dataclass(slots=True)
 class LinkContext:
-    """Represents a link with its surrounding context"""
+    """Represents a link with its surrounding context.
+
+    Records are slotted and carry no context text: the ±3-line windows are
+    stored as character offsets into the source post, and are read back into
+    ``context_before``/``context_after`` only on output (``to_dict``).
+    ``file_path`` is interned, so all of a post's links share one string.
+    """
     url: str
     text: str
     type: str  # citation, reference, inline, resource
-    context_before: str
-    context_after: str
     file_path: str
     line_number: int
     position: int
     hash: str
-
-    def to_dict(self):
-        return asdict(self)
+    context_span: Tuple[int, int, int, int] = field(repr=False)
+
+    def _source(self) -> str:
+        if self.context_span == NO_CONTEXT:
+            return ''
+        return _read_source(self.file_path, os.stat(self.file_path).st_mtime_ns)
+
+    @property
+    def context_before(self) -> str:
+        return _context_words(self._source(), *self.context_span[:2], tail=True)
+
+    @property
+    def context_after(self) -> str:
+        return _context_words(self._source(), *self.context_span[2:], tail=False)
+
+    def to_dict(self) -> Dict:
+        source = self._source()
+        before_start, before_end, after_start, after_end = self.context_span
+        return {
+            'url': self.url,
+            'text': self.text,
+            'type': self.type,
+            'context_before': _context_words(source, before_start, before_end, tail=True),
+            'context_after': _context_words(source, after_start, after_end, tail=False),
+            'file_path': self.file_path,
+            'line_number': self.line_number,
+            'position': self.position,
+            'hash': self.hash,
+        }
 
 class LinkExtractor:
     """Extract and categorize links from markdown files"""
@@ -108,8 +166,11 @@ class LinkExtractor:
         ]
     }
 
-    def __init__(self, posts_dir: Path):
+    def __init__(self, posts_dir: Path, changed_lines: Optional[Dict[Path, Set[int]]] = None):
         self.posts_dir = posts_dir
+        # With --since: only these posts, and only links on these lines
+        self.changed_lines = changed_lines
+        self._keep_lines: Optional[Set[int]] = None
         self.links = []
         self.stats = {
             'total_files': 0,
@@ -120,20 +181,58 @@ class LinkExtractor:
 
     def extract_all(self) -> List[LinkContext]:
         """Extract links from all markdown files"""
-        md_files = list(self.posts_dir.glob('*.md'))
+        for _ in self.iter_file_batches():
+            pass
+        return self.links
+
+    def iter_file_batches(self) -> Iterator[List[LinkContext]]:
+        """Yield each post's links as soon as that post has been extracted.
+
+        Links are still accumulated on ``self.links`` so ``save_results`` can
+        write links.json once the stream has been drained.
+        """
+        md_files = sorted(self.posts_dir.glob('*.md'))
+        if self.changed_lines is not None:
+            md_files = [f for f in md_files if f.resolve() in self.changed_lines]
         self.stats['total_files'] = len(md_files)
 
         for md_file in md_files:
+            start = len(self.links)
+            if self.changed_lines is not None:
+                self._keep_lines = self.changed_lines[md_file.resolve()]
             self._extract_from_file(md_file)
+            self.stats['total_links'] = len(self.links)
+            yield self.links[start:]
 
-        self.stats['total_links'] = len(self.links)
-        return self.links
+    def iter_links(self) -> Iterator[LinkContext]:
+        """Yield links one at a time, post by post"""
+        for batch in self.iter_file_batches():
+            yield from batch
+
+    async def stream(self) -> AsyncIterator[LinkContext]:
+        """Async generator over extracted links.
+
+        Control is handed back to the event loop after every post, so a
+        validator consuming this stream starts on the first post's URLs while
+        the remaining posts are still being parsed.
+        """
+        for batch in self.iter_file_batches():
+            for link in batch:
+                yield link
+            await asyncio.sleep(0)
 
     def _extract_from_file(self, file_path: Path):
         """Extract links from a single file"""
         try:
             content = file_path.read_text(encoding='utf-8')
             lines = content.split('\n')
+            path_str = sys.intern(str(file_path))
+
+            # Offset of each line start, plus a sentinel past the end, so
+            # context windows can be stored as spans of ``content``.
+            line_starts = [0]
+            for line in lines:
+                line_starts.append(line_starts[-1] + len(line) + 1)
 
             # Track reference definitions
             ref_defs = {}
@@ -149,11 +248,11 @@ class LinkExtractor:
                     self._add_link(
                         url=match.group(2),
                         text=match.group(1),
-                        file_path=file_path,
+                        file_path=path_str,
                         line_number=line_num,
                         position=match.start(),
-                        lines=lines,
-                        line_idx=line_num - 1
+                        source=content,
+                        line_starts=line_starts
                     )
 
                 # Extract reference links
@@ -163,11 +262,11 @@ class LinkExtractor:
                         self._add_link(
                             url=ref_defs[ref_key],
                             text=match.group(1),
-                            file_path=file_path,
+                            file_path=path_str,
                             line_number=line_num,
                             position=match.start(),
-                            lines=lines,
-                            line_idx=line_num - 1
+                            source=content,
+                            line_starts=line_starts
                         )
 
                 # Extract bare URLs
@@ -181,11 +280,11 @@ class LinkExtractor:
                         self._add_link(
                             url=bare,
                             text='',
-                            file_path=file_path,
+                            file_path=path_str,
                             line_number=line_num,
                             position=match.start(),
-                            lines=lines,
-                            line_idx=line_num - 1
+                            source=content,
+                            line_starts=line_starts
                         )
 
         except Exception as e:
@@ -218,64 +317,61 @@ class LinkExtractor:
             url = url[:-1]
         return url
 
-    def _add_link(self, url: str, text: str, file_path: Path,
-                  line_number: int, position: int, lines: List[str],
-                  line_idx: int):
+    def _add_link(self, url: str, text: str, file_path: str,
+                  line_number: int, position: int, source: str,
+                  line_starts: List[int]):
         """Add a link with its context"""
+        if self._keep_lines is not None and line_number not in self._keep_lines:
+            return
         url = self._clean_trailing_punct(url)
-        # Get context (±50 words or ±3 lines)
-        context_before = self._get_context(lines, line_idx, -3, 50)
-        context_after = self._get_context(lines, line_idx, 3, 50)
-
-        # Classify link type
-        link_type = self._classify_link(url, text, context_before + context_after)
 
         # Create unique hash for the link occurrence
         hash_input = f"{file_path}:{line_number}:{position}:{url}"
         link_hash = hashlib.md5(hash_input.encode()).hexdigest()[:8]
 
-        link_context = LinkContext(
+        # Get context (±50 words or ±3 lines); only the span is kept
+        span = self._context_span(line_starts, line_number - 1)
+        context_before = _context_words(source, span[0], span[1], tail=True)
+        context_after = _context_words(source, span[2], span[3], tail=False)
+
+        # Classify link type
+        link_type = self._classify_link(url, text, context_before + context_after)
+
+        self._register(LinkContext(
             url=url,
             text=text,
             type=link_type,
-            context_before=context_before,
-            context_after=context_after,
-            file_path=str(file_path),
+            file_path=file_path,
             line_number=line_number,
             position=position,
-            hash=link_hash
-        )
+            hash=link_hash,
+            context_span=span
+        ))
 
+    def _register(self, link_context: LinkContext):
+        """Keep an extracted link and update statistics"""
         self.links.append(link_context)
 
-        # Update statistics
+        link_type = link_context.type
         self.stats['by_type'][link_type] = self.stats['by_type'].get(link_type, 0) + 1
-        domain = self._extract_domain(url)
+        domain = self._extract_domain(link_context.url)
         if domain:
             self.stats['by_domain'][domain] = self.stats['by_domain'].get(domain, 0) + 1
 
-    def _get_context(self, lines: List[str], center_idx: int,
-                     line_offset: int, word_limit: int) -> str:
-        """Get context around a line"""
-        if line_offset < 0:
-            start_idx = max(0, center_idx + line_offset)
-            end_idx = center_idx
-        else:
-            start_idx = center_idx + 1
-            end_idx = min(len(lines), center_idx + line_offset + 1)
-
-        context_lines = lines[start_idx:end_idx]
-        context_text = ' '.join(context_lines)
-
-        # Limit to word count
-        words = context_text.split()
-        if len(words) > word_limit:
-            if line_offset < 0:
-                words = words[-word_limit:]
-            else:
-                words = words[:word_limit]
+    @staticmethod
+    def _context_span(line_starts: List[int], line_idx: int) -> Tuple[int, int, int, int]:
+        """Character spans of the ±CONTEXT_LINES lines around ``line_idx``.
 
-        return ' '.join(words)
+        Returns (before_start, before_end, after_start, after_end) into the
+        post's text; ``line_starts`` carries a sentinel past the last line.
+        """
+        last = len(line_starts) - 1
+        return (
+            line_starts[max(0, line_idx - CONTEXT_LINES)],
+            line_starts[line_idx],
+            line_starts[line_idx + 1],
+            line_starts[min(last, line_idx + CONTEXT_LINES + 1)],
+        )
 
     def _classify_link(self, url: str, text: str, context: str) -> str:
         """Classify the type of link based on URL and context"""
@@ -302,24 +398,204 @@ class LinkExtractor:
             # Remove www prefix
             if domain.startswith('www.'):
                 domain = domain[4:]
-            return domain
+            return sys.intern(domain)
         return None
 
-    def save_results(self, output_file: Path):
-        """Save extracted links to JSON file"""
-        data = {
+    def write_ndjson(self, out: TextIO, citations_only: bool = False) -> int:
+        """Stream links to ``out`` as NDJSON, one link object per line.
+
+        The stream is flushed after every post so a downstream reader
+        (``link-validator.py --input -``) sees links while extraction runs.
+        """
+        written = 0
+        for batch in self.iter_file_batches():
+            for link in batch:
+                if citations_only and link.type != 'citation':
+                    continue
+                out.write(json.dumps(link.to_dict()) + '\n')
+                written += 1
+            out.flush()
+        return written
+
+    def results_data(self) -> Dict:
+        """links.json contents, for callers that keep them in memory"""
+        return {
             'extraction_date': datetime.now().isoformat(),
             'stats': self.stats,
-            'links': [link.to_dict() for link in self.links]
+            'links': [link.to_dict() for link in self.links],
         }
 
+    def occurrence_index(self) -> OccurrenceIndex:
+        """URL -> every file/line/position it was extracted from"""
+        return OccurrenceIndex.from_links(self.links)
+
+    def save_results(self, output_file: Path):
+        """Save extracted links to JSON file, plus its occurrence index.
+
+        The file is written link by link, so each record's context strings
+        exist only while that record is being serialized. The output is
+        byte-identical to ``json.dump(data, f, indent=2)``. The index goes
+        beside it (links.json -> links.index.json).
+        """
+        header = json.dumps({
+            'extraction_date': datetime.now().isoformat(),
+            'stats': self.stats,
+        }, indent=2)
+
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+            f.write(header[:-2])  # reopen the object: drop the closing "\n}"
+            f.write(',\n  "links": [')
+            for i, link in enumerate(self.links):
+                f.write(',\n' if i else '\n')
+                f.write(textwrap.indent(json.dumps(link.to_dict(), indent=2), '    '))
+            f.write('\n  ]\n}' if self.links else ']\n}')
+        self.occurrence_index().save(index_path(output_file), output_file)
 
         logger.info(f"✅ Extracted {len(self.links)} links from {self.stats['total_files']} files")
         logger.info(f"📊 By type: {self.stats['by_type']}")
         logger.info(f"💾 Results saved to {output_file}")
 
+class _HrefCollector(HTMLParser):
+    """Streaming tokenizer pass that collects link-bearing attributes.
+
+    Fed the page in chunks; never builds a tree. Records
+    (url, text, line, column) for ``href``/``src``, the first ``srcset``
+    candidate and OpenGraph/Twitter URL ``<meta>`` tags. Anchor text is
+    accumulated until the matching ``</a>``.
+    """
+
+    URL_ATTRS = ('href', 'src')
+    META_URL_PROPERTIES = frozenset({'og:image', 'og:url', 'twitter:image'})
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found: List[Tuple[str, str, int, int]] = []
+        self._anchor: Optional[List] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        line, col = self.getpos()
+        if tag == 'meta':
+            prop = attrs.get('property') or attrs.get('name')
+            if prop in self.META_URL_PROPERTIES and attrs.get('content'):
+                self.found.append((attrs['content'], prop, line, col))
+            return
+        for attr in self.URL_ATTRS:
+            if attrs.get(attr):
+                if tag == 'a' and attr == 'href':
+                    self._anchor = [attrs[attr], [], line, col]
+                else:
+                    self.found.append((attrs[attr], attrs.get('alt') or '', line, col))
+        if attrs.get('srcset'):
+            first = attrs['srcset'].split(',')[0].split()
+            if first:
+                self.found.append((first[0], attrs.get('alt') or '', line, col))
+
+    def handle_data(self, data):
+        if self._anchor is not None:
+            self._anchor[1].append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._anchor is not None:
+            url, text, line, col = self._anchor
+            self.found.append((url, ' '.join(''.join(text).split()), line, col))
+            self._anchor = None
+
+
+def scan_html_page(page: str, site_path: str) -> List[Tuple[str, str, int, int]]:
+    """Collect a built page's links, resolved to site-absolute URLs.
+
+    Module-level so it can run in a worker process. ``site_path`` is the URL
+    path the page is served at, used to resolve relative and '#id' links.
+    """
+    collector = _HrefCollector()
+    with open(page, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(HtmlLinkExtractor.CHUNK_SIZE), ''):
+            collector.feed(chunk)
+    collector.close()
+
+    links = []
+    for url, text, line, col in collector.found:
+        url = url.strip()
+        if not url or url.lower().startswith(HtmlLinkExtractor.SKIP_SCHEMES):
+            continue
+        if not urlparse(url).scheme and not url.startswith('//'):
+            url = urljoin(site_path, url)
+        if urlparse(url).path.startswith(HtmlLinkExtractor.BUNDLE_PREFIX):
+            continue
+        links.append((url, text, line, col))
+    return links
+
+
+class HtmlLinkExtractor(LinkExtractor):
+    """Extract links from a built site (e.g. astro-site/dist).
+
+    Sees what readers see: links injected by layouts, components, footers
+    and OG tags, not just post markdown. Pages are tokenized in parallel
+    worker processes, and a URL that appears on several pages (a shared
+    footer or nav link) is kept once, at its first occurrence, so the
+    validator checks it once.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    SKIP_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'blob:')
+    # Hashed bundles Astro emits next to the pages; present by construction.
+    BUNDLE_PREFIX = '/_astro/'
+
+    def __init__(self, site_dir: Path, workers: Optional[int] = None):
+        super().__init__(site_dir)
+        self.site_dir = site_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.stats['duplicates_skipped'] = 0
+        self._seen_urls = set()
+
+    def _site_path(self, page: Path) -> str:
+        """URL path a built page is served at (dir/index.html -> /dir/)"""
+        rel = page.relative_to(self.site_dir).as_posix()
+        if rel == 'index.html':
+            return '/'
+        if rel.endswith('/index.html'):
+            return '/' + rel[:-len('index.html')]
+        return '/' + rel
+
+    def iter_file_batches(self) -> Iterator[List[LinkContext]]:
+        pages = sorted(self.site_dir.rglob('*.html'))
+        self.stats['total_files'] = len(pages)
+        site_paths = [self._site_path(page) for page in pages]
+        page_strs = [str(page) for page in pages]
+
+        if self.workers > 1 and len(pages) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                chunksize = max(1, len(pages) // (self.workers * 4))
+                scanned = pool.map(scan_html_page, page_strs, site_paths, chunksize=chunksize)
+                yield from self._collect(page_strs, scanned)
+        else:
+            yield from self._collect(page_strs, map(scan_html_page, page_strs, site_paths))
+
+    def _collect(self, pages: List[str], scanned) -> Iterator[List[LinkContext]]:
+        for page, found in zip(pages, scanned):
+            start = len(self.links)
+            path_str = sys.intern(page)
+            for url, text, line, col in found:
+                if url in self._seen_urls:
+                    self.stats['duplicates_skipped'] += 1
+                    continue
+                self._seen_urls.add(url)
+                hash_input = f"{path_str}:{line}:{col}:{url}"
+                self._register(LinkContext(
+                    url=url,
+                    text=text,
+                    type=self._classify_link(url, text, ''),
+                    file_path=path_str,
+                    line_number=line,
+                    position=col,
+                    hash=hashlib.md5(hash_input.encode()).hexdigest()[:8],
+                    context_span=NO_CONTEXT
+                ))
+            self.stats['total_links'] = len(self.links)
+            yield self.links[start:]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Extract links from blog posts',
@@ -328,6 +604,9 @@ Examples:
   %(prog)s --posts-dir src/posts
   %(prog)s --citations-only
   %(prog)s --output links.json --quiet
+  %(prog)s --ndjson - | link-validator.py --input -
+  %(prog)s --site-dir astro-site/dist --output site-links.json
+  %(prog)s --since origin/main --output pr-links.json
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -335,11 +614,19 @@ Examples:
     parser.add_argument('--posts-dir', type=Path,
                        default=Path('src/posts'),
                        help='Directory containing blog posts')
+    parser.add_argument('--site-dir', type=Path,
+                       help='Extract from a built site instead (e.g. astro-site/dist)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for --site-dir (default: CPU count)')
     parser.add_argument('--output', type=Path,
-                       default=Path('links.json'),
-                       help='Output JSON file')
+                       default=None,
+                       help='Output JSON file (default: links.json; optional with --ndjson)')
+    parser.add_argument('--ndjson', metavar='PATH',
+                       help='Stream links as NDJSON while extracting ("-" for stdout)')
     parser.add_argument('--citations-only', action='store_true',
                        help='Extract only citation links (research papers, academic sources)')
+    parser.add_argument('--since', metavar='GIT_REV',
+                       help='Only links on lines added or changed since this git revision or range')
     parser.add_argument('--verbose', action='store_true',
                        help='Verbose output')
     parser.add_argument('--quiet', '-q', action='store_true',
@@ -348,12 +635,48 @@ Examples:
     args = parser.parse_args()
 
     try:
-        if not args.posts_dir.exists():
-            logger.error(f"❌ Posts directory not found: {args.posts_dir}")
+        source_dir = args.site_dir or args.posts_dir
+        if not source_dir.exists():
+            logger.error(f"❌ Directory not found: {source_dir}")
             sys.exit(2)
 
-        extractor = LinkExtractor(args.posts_dir)
-        all_links = extractor.extract_all()
+        if args.site_dir:
+            if args.since:
+                parser.error('--since applies to --posts-dir, not a built site')
+            extractor = HtmlLinkExtractor(args.site_dir, workers=args.workers)
+        elif args.since:
+            try:
+                changed = changed_lines(args.since, str(args.posts_dir / '*.md'))
+            except GitError as e:
+                logger.error(f"❌ Could not diff against {args.since}: {e}")
+                sys.exit(2)
+            if not args.quiet:
+                logger.info(f"🔀 {sum(map(len, changed.values()))} lines changed in "
+                            f"{len(changed)} posts since {args.since}")
+            extractor = LinkExtractor(args.posts_dir, changed_lines=changed)
+        else:
+            extractor = LinkExtractor(args.posts_dir)
+
+        if args.ndjson:
+            if args.ndjson == '-':
+                # stdout carries the stream; keep log lines out of it.
+                for handler in logger.handlers:
+                    if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                        handler.setStream(sys.stderr)
+                written = extractor.write_ndjson(sys.stdout, args.citations_only)
+            else:
+                with open(args.ndjson, 'w', encoding='utf-8') as out:
+                    written = extractor.write_ndjson(out, args.citations_only)
+            if not args.quiet:
+                logger.info(f"📤 Streamed {written} links as NDJSON to {args.ndjson}")
+            if args.output is None:
+                sys.exit(0)
+            all_links = extractor.links
+        else:
+            all_links = extractor.extract_all()
+
+        if args.output is None:
+            args.output = Path('links.json')
 
         # Filter for citations only if requested
         if args.citations_only:
@@ -367,7 +690,7 @@ Examples:
         sys.exit(0)
     except FileNotFoundError as e:
         logger.error(f"Error: File not found: {e}")
-        logger.error(f"Expected: {args.posts_dir}")
+        logger.error(f"Expected: {args.site_dir or args.posts_dir}")
         logger.error("Tip: Run from repository root")
         sys.exit(2)
     except Exception as e:
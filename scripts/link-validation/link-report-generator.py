@@ -46,58 +46,333 @@ import json
 import csv
 import argparse
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
 from datetime import datetime
 from collections import defaultdict
+from urllib.parse import urlparse
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 from logging_config import setup_logger
+from page_cache import PageCache, page_title
+from validation_history import ValidationHistory, history_sections
 
 logger = setup_logger(__name__)
 
+class LinkTable:
+    """Every extracted link joined with its validation, relevance and repair.
+
+    The join is lazy. Iterating the table yields one row (a dict of
+    ``COLUMNS``) per link occurrence, and the aggregates the reports print
+    are tallied as the rows go by. Only the per-URL result maps are held;
+    joined rows are never stored. Writers that consume the iterator row by
+    row therefore use the same memory for 100 links or 100,000. A table is
+    iterated once, and ``stats`` is complete after that. Results missing for
+    a link are None (empty in the CSV).
+    """
+
+    COLUMNS = (
+        'file_path', 'line_number', 'url', 'text', 'type', 'context', 'domain',
+        'validated', 'status', 'issue_type', 'status_code',
+        'relevance_score', 'suggested_action', 'relevance_title',
+        'has_repair', 'suggested_url', 'confidence', 'notes', 'priority',
+    )
+    PRIORITIES = ('critical', 'high', 'medium', 'low')
+
+    def __init__(self, links: Iterable[Dict], validation_data: Dict,
+                 relevance_data: Dict, repairs_data: Dict):
+        self.links = links
+        self.validation_map = {r['url']: r for r in validation_data.get('results', [])}
+        self.relevance_map = {r['url']: r for r in relevance_data.get('results', [])}
+        self.repairs_map = {}
+        # Repairs (not links) by confidence band, for the action plan
+        self.repair_bands = {'high': 0, 'medium': 0, 'low': 0}
+        for repair in repairs_data.get('repairs', []):
+            self.repairs_map[repair['original_url']] = repair
+            confidence = repair['confidence']
+            band = 'high' if confidence >= 90 else 'medium' if confidence >= 70 else 'low'
+            self.repair_bands[band] += 1
+
+        self.stats = {
+            'total_links': 0,
+            'valid': 0,
+            'broken': 0,
+            'redirects': 0,
+            'manual_review': 0,
+            'auto_fixable': 0,
+            'by_issue': defaultdict(int),
+            'by_domain': defaultdict(lambda: {'total': 0, 'broken': 0}),
+            'by_file': defaultdict(lambda: {'total': 0, 'broken': 0}),
+            'high_confidence_fixes': 0,
+            'medium_confidence_fixes': 0,
+            'low_confidence_fixes': 0,
+            'no_fix': 0,
+            'valid_pct': 0,
+            'broken_pct': 0,
+        }
+
+    @classmethod
+    def join(cls, links_data: Dict, validation_data: Dict,
+             relevance_data: Dict, repairs_data: Dict) -> 'LinkTable':
+        return cls(links_data.get('links', []), validation_data, relevance_data, repairs_data)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for link in self.links:
+            row = self._join(link)
+            self._tally(row)
+            yield row
+
+        stats = self.stats
+        if stats['total_links'] > 0:
+            stats['valid_pct'] = (stats['valid'] / stats['total_links']) * 100
+            stats['broken_pct'] = (stats['broken'] / stats['total_links']) * 100
+
+    def _join(self, link: Dict) -> Dict:
+        url = link['url']
+        validation = self.validation_map.get(url, {})
+        relevance = self.relevance_map.get(url, {})
+        repair = self.repairs_map.get(url, {})
+        status = validation.get('status', 'unknown')
+        confidence = repair.get('confidence')
+
+        # Manual review priority
+        if status == 'broken' and not repair:
+            priority = 'critical'
+        elif repair and (100 if confidence is None else confidence) < 70:
+            priority = 'high'
+        elif relevance.get('suggested_action') == 'review':
+            priority = 'medium'
+        else:
+            priority = None
+
+        return {
+            'file_path': link['file_path'],
+            'line_number': link['line_number'],
+            'url': url,
+            'text': link.get('text', ''),
+            'type': link.get('type', ''),
+            'context': link.get('context_before', '')[:100],
+            'domain': urlparse(url).netloc,
+            'validated': bool(validation),
+            'status': status,
+            'issue_type': validation.get('issue_type', 'unknown'),
+            'status_code': validation.get('status_code'),
+            'relevance_score': relevance.get('relevance_score'),
+            'suggested_action': relevance.get('suggested_action'),
+            'relevance_title': relevance.get('page_title'),
+            'has_repair': bool(repair),
+            'suggested_url': repair.get('suggested_url'),
+            'confidence': confidence,
+            'notes': repair.get('notes'),
+            'priority': priority,
+        }
+
+    def _tally(self, row: Dict):
+        stats = self.stats
+        status = row['status']
+        stats['total_links'] += 1
+        if status == 'valid':
+            stats['valid'] += 1
+        elif status == 'broken':
+            stats['broken'] += 1
+        elif status == 'redirect':
+            stats['redirects'] += 1
+        stats['by_issue'][row['issue_type']] += 1
+        stats['by_domain'][row['domain']]['total'] += 1
+        stats['by_file'][row['file_path']]['total'] += 1
+        if status == 'broken':
+            stats['by_domain'][row['domain']]['broken'] += 1
+            stats['by_file'][row['file_path']]['broken'] += 1
+
+        if row['has_repair']:
+            confidence = row['confidence'] or 0
+            if confidence >= 90:
+                stats['high_confidence_fixes'] += 1
+                stats['auto_fixable'] += 1
+            elif confidence >= 70:
+                stats['medium_confidence_fixes'] += 1
+            else:
+                stats['low_confidence_fixes'] += 1
+                stats['manual_review'] += 1
+        elif status == 'broken':
+            stats['no_fix'] += 1
+            stats['manual_review'] += 1
+
+
+class DetailedCsvWriter:
+    """detailed_report.csv, written one joined row at a time"""
+
+    FIELDS = ('File', 'Line', 'URL', 'Link Text', 'Type', 'Status', 'Issue Type',
+              'HTTP Status', 'Relevance Score', 'Suggested Action', 'Repair Available',
+              'Suggested URL', 'Repair Confidence', 'Notes')
+
+    def __init__(self, output_file: Path):
+        self.output_file = output_file
+        self.rows = 0
+        self._file: Optional[TextIO] = None
+        self._writer = None
+
+    def __enter__(self) -> 'DetailedCsvWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, link: Dict):
+        if self._writer is None:
+            # Opened on the first row: no links, no CSV (as before)
+            self._file = open(self.output_file, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.FIELDS)
+        self._writer.writerow((
+            Path(link['file_path']).name,
+            link['line_number'],
+            link['url'],
+            link['text'],
+            link['type'],
+            link['status'],
+            link['issue_type'] if link['validated'] else '',
+            link['status_code'],
+            link['relevance_score'],
+            link['suggested_action'],
+            'Yes' if link['has_repair'] else 'No',
+            link['suggested_url'],
+            link['confidence'],
+            link['notes'],
+        ))
+        self.rows += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Detailed CSV saved to {self.output_file}")
+
+
+class ReviewQueueWriter:
+    """manual_review.md: per-priority counts plus the first items of each.
+
+    Only ``MAX_ITEMS`` rows per priority are kept while rows stream past;
+    the file is written on ``close``.
+    """
+
+    MAX_ITEMS = 20
+
+    def __init__(self, output_file: Path, page_title: Callable[[str, Optional[str]], str]):
+        self.output_file = output_file
+        self.page_title = page_title
+        self.counts = dict.fromkeys(LinkTable.PRIORITIES, 0)
+        self.items: Dict[str, List[Dict]] = {p: [] for p in LinkTable.PRIORITIES}
+
+    def __enter__(self) -> 'ReviewQueueWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+    def write(self, link: Dict):
+        priority = link['priority']
+        if priority is None:
+            return
+        self.counts[priority] += 1
+        if len(self.items[priority]) < self.MAX_ITEMS:
+            self.items[priority].append(link)
+
+    def close(self):
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write("# Manual Review Queue")
+            f.write(f"\n\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+            for priority in LinkTable.PRIORITIES:
+                if not self.counts[priority]:
+                    continue
+                f.write(f"\n\n## {priority.capitalize()} Priority ({self.counts[priority]} items)\n")
+
+                for item in self.items[priority]:
+                    f.write(f"\n### {Path(item['file_path']).name}:{item['line_number']}")
+                    f.write(f"\n- **URL:** {item['url']}")
+                    f.write(f"\n- **Link Text:** {item['text']}")
+                    f.write(f"\n- **Issue:** {item['issue_type']}")
+                    title = self.page_title(item['url'], item['relevance_title'])
+                    if title:
+                        f.write(f"\n- **Page Title:** {title}")
+                    if item['suggested_url']:
+                        f.write(f"\n- **Suggested Fix:** {item['suggested_url']} "
+                                f"(confidence: {item['confidence'] or 0}%)")
+                    f.write(f"\n- **Context:** ...{item['context']}...")
+                    f.write("\n")
+
+        logger.info(f"Manual review queue saved to {self.output_file}")
+
+
+def iter_links(links_file: Path) -> Iterator[Dict]:
+    """Link records from links.json, or one per line from an NDJSON stream"""
+    if links_file.suffix in ('.ndjson', '.jsonl'):
+        with open(links_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(links_file, 'r', encoding='utf-8') as f:
+            yield from json.load(f).get('links', [])
+
+
 class ReportGenerator:
     """Generate detailed reports from link validation results"""
 
-    def __init__(self):
+    def __init__(self, page_cache: Optional[PageCache] = None,
+                 history: Optional[ValidationHistory] = None):
         self.stats = defaultdict(int)
+        # Page bodies link-validator.py stored; titles show what a link leads to
+        self.page_cache = page_cache
+        # Past validation runs, for the trend and flapping sections
+        self.history = history
+
+    def _page_title(self, url: str, relevance_title: Optional[str]) -> str:
+        """Title of the page at ``url``, as the relevance check or the validator saw it"""
+        if relevance_title:
+            return relevance_title
+        body = self.page_cache.get(url) if self.page_cache is not None else None
+        return page_title(body) if body else ''
 
     def generate_all_reports(self, links_data: Dict, validation_data: Dict,
                            relevance_data: Dict, repairs_data: Dict,
-                           output_dir: Path):
-        """Generate all report formats"""
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate different report formats
-        self.generate_summary_report(
-            links_data, validation_data, relevance_data, repairs_data,
-            output_dir / 'summary.md'
+                           output_dir: Path) -> LinkTable:
+        """Generate every report format; links_data may also be an iterable of link records"""
+        links = links_data.get('links', []) if isinstance(links_data, dict) else links_data
+        return self.generate_from_table(
+            LinkTable(links, validation_data, relevance_data, repairs_data), output_dir,
+            validation_data
         )
 
-        self.generate_detailed_csv(
-            links_data, validation_data, relevance_data, repairs_data,
-            output_dir / 'detailed_report.csv'
-        )
+    def generate_from_table(self, table: LinkTable, output_dir: Path,
+                            validation_data: Optional[Dict] = None) -> LinkTable:
+        """Stream the joined rows once through the CSV and review-queue writers,
+        then write the summary and action plan from the aggregates"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        if self.history is not None and validation_data is not None:
+            self.history.record(validation_data, suite='links')
 
-        self.generate_manual_review_queue(
-            links_data, validation_data, relevance_data, repairs_data,
-            output_dir / 'manual_review.md'
-        )
+        with DetailedCsvWriter(output_dir / 'detailed_report.csv') as csv_out, \
+                ReviewQueueWriter(output_dir / 'manual_review.md', self._page_title) as review:
+            for row in table:
+                csv_out.write(row)
+                review.write(row)
 
-        self.generate_action_plan(
-            links_data, validation_data, relevance_data, repairs_data,
-            output_dir / 'action_plan.md'
-        )
+        self.generate_summary_report(table, output_dir / 'summary.md')
+        self.generate_action_plan(table, output_dir / 'action_plan.md')
 
-    def generate_summary_report(self, links_data: Dict, validation_data: Dict,
-                               relevance_data: Dict, repairs_data: Dict,
-                               output_file: Path):
-        """Generate markdown summary report"""
-        # Calculate statistics
-        stats = self._calculate_statistics(
-            links_data, validation_data, relevance_data, repairs_data
-        )
+        logger.info(f"⏱️  Reports for {table.stats['total_links']} links generated in "
+                    f"{time.perf_counter() - start:.3f}s")
+        return table
+
+    def generate_summary_report(self, table: LinkTable, output_file: Path):
+        """Generate markdown summary report from an iterated table's aggregates"""
+        stats = table.stats
 
         report = []
         report.append("# Link Validation Report")
@@ -138,156 +413,25 @@ class ReportGenerator:
             file_name = Path(file_path).name
             report.append(f"| {file_name} | {counts['broken']} | {counts['total']} |")
 
-        # Write report
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report))
-
-        logger.info(f"Summary report saved to {output_file}")
-
-    def generate_detailed_csv(self, links_data: Dict, validation_data: Dict,
-                             relevance_data: Dict, repairs_data: Dict,
-                             output_file: Path):
-        """Generate detailed CSV report"""
-        # Map results by URL
-        validation_map = {r['url']: r for r in validation_data.get('results', [])}
-        relevance_map = {r['url']: r for r in relevance_data.get('results', [])}
-        repairs_map = {r['original_url']: r for r in repairs_data.get('repairs', [])}
-
-        rows = []
-        for link in links_data.get('links', []):
-            url = link['url']
-            validation = validation_map.get(url, {})
-            relevance = relevance_map.get(url, {})
-            repair = repairs_map.get(url, {})
-
-            row = {
-                'File': Path(link['file_path']).name,
-                'Line': link['line_number'],
-                'URL': url,
-                'Link Text': link.get('text', ''),
-                'Type': link.get('type', ''),
-                'Status': validation.get('status', 'unknown'),
-                'Issue Type': validation.get('issue_type', ''),
-                'HTTP Status': validation.get('status_code', ''),
-                'Relevance Score': relevance.get('relevance_score', ''),
-                'Suggested Action': relevance.get('suggested_action', ''),
-                'Repair Available': 'Yes' if repair else 'No',
-                'Suggested URL': repair.get('suggested_url', ''),
-                'Repair Confidence': repair.get('confidence', ''),
-                'Notes': repair.get('notes', '')
-            }
-            rows.append(row)
-
-        # Write CSV
-        if rows:
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-                writer.writeheader()
-                writer.writerows(rows)
-
-        logger.info(f"Detailed CSV saved to {output_file}")
-
-    def generate_manual_review_queue(self, links_data: Dict, validation_data: Dict,
-                                    relevance_data: Dict, repairs_data: Dict,
-                                    output_file: Path):
-        """Generate manual review queue"""
-        # Map results
-        validation_map = {r['url']: r for r in validation_data.get('results', [])}
-        relevance_map = {r['url']: r for r in relevance_data.get('results', [])}
-        repairs_map = {r['original_url']: r for r in repairs_data.get('repairs', [])}
-
-        # Group links by priority
-        priority_groups = {
-            'critical': [],
-            'high': [],
-            'medium': [],
-            'low': []
-        }
-
-        for link in links_data.get('links', []):
-            url = link['url']
-            validation = validation_map.get(url, {})
-            relevance = relevance_map.get(url, {})
-            repair = repairs_map.get(url, {})
-
-            # Determine if manual review needed
-            needs_review = False
-            priority = 'low'
-
-            if validation.get('status') == 'broken' and not repair:
-                needs_review = True
-                priority = 'critical'
-            elif repair and repair.get('confidence', 100) < 70:
-                needs_review = True
-                priority = 'high'
-            elif relevance.get('suggested_action') == 'review':
-                needs_review = True
-                priority = 'medium'
-
-            if needs_review:
-                review_item = {
-                    'url': url,
-                    'file': Path(link['file_path']).name,
-                    'line': link['line_number'],
-                    'text': link.get('text', ''),
-                    'issue': validation.get('issue_type', 'unknown'),
-                    'repair': repair.get('suggested_url', '') if repair else '',
-                    'confidence': repair.get('confidence', 0) if repair else 0,
-                    'context': link.get('context_before', '')[:100]
-                }
-                priority_groups[priority].append(review_item)
-
-        # Generate report
-        report = []
-        report.append("# Manual Review Queue")
-        report.append(f"\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-        for priority in ['critical', 'high', 'medium', 'low']:
-            items = priority_groups[priority]
-            if items:
-                report.append(f"\n## {priority.capitalize()} Priority ({len(items)} items)\n")
-
-                for item in items[:20]:  # Limit to 20 items per priority
-                    report.append(f"### {item['file']}:{item['line']}")
-                    report.append(f"- **URL:** {item['url']}")
-                    report.append(f"- **Link Text:** {item['text']}")
-                    report.append(f"- **Issue:** {item['issue']}")
-                    if item['repair']:
-                        report.append(f"- **Suggested Fix:** {item['repair']} (confidence: {item['confidence']}%)")
-                    report.append(f"- **Context:** ...{item['context']}...")
-                    report.append("")
+        if self.history is not None:
+            report.extend(history_sections(self.history, 'links'))
 
         # Write report
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write('\n'.join(report))
 
-        logger.info(f"Manual review queue saved to {output_file}")
+        logger.info(f"Summary report saved to {output_file}")
 
-    def generate_action_plan(self, links_data: Dict, validation_data: Dict,
-                            relevance_data: Dict, repairs_data: Dict,
-                            output_file: Path):
+    def generate_action_plan(self, table: LinkTable, output_file: Path):
         """Generate action plan for fixes"""
-        repairs_map = {r['original_url']: r for r in repairs_data.get('repairs', [])}
-
-        # Group repairs by confidence
-        high_confidence = []
-        medium_confidence = []
-        low_confidence = []
-
-        for repair in repairs_data.get('repairs', []):
-            if repair['confidence'] >= 90:
-                high_confidence.append(repair)
-            elif repair['confidence'] >= 70:
-                medium_confidence.append(repair)
-            else:
-                low_confidence.append(repair)
+        bands = table.repair_bands
 
         # Generate action plan
         report = []
         report.append("# Link Repair Action Plan")
         report.append(f"\n**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-        report.append(f"\n## Phase 1: Automatic Fixes ({len(high_confidence)} links)")
+        report.append(f"\n## Phase 1: Automatic Fixes ({bands['high']} links)")
         report.append("\nThese fixes have high confidence and can be applied automatically:\n")
         report.append("```bash")
         report.append("python scripts/link-validation/batch-link-fixer.py \\")
@@ -296,7 +440,7 @@ class ReportGenerator:
         report.append("    --apply")
         report.append("```")
 
-        report.append(f"\n## Phase 2: Semi-Automatic Fixes ({len(medium_confidence)} links)")
+        report.append(f"\n## Phase 2: Semi-Automatic Fixes ({bands['medium']} links)")
         report.append("\nThese fixes should be reviewed before applying:\n")
         report.append("```bash")
         report.append("python scripts/link-validation/batch-link-fixer.py \\")
@@ -305,7 +449,7 @@ class ReportGenerator:
         report.append("    --dry-run")
         report.append("```")
 
-        report.append(f"\n## Phase 3: Manual Review ({len(low_confidence)} links)")
+        report.append(f"\n## Phase 3: Manual Review ({bands['low']} links)")
         report.append("\nThese require manual investigation:")
         report.append("\nReview the `manual_review.md` file for detailed items.")
 
@@ -326,85 +470,6 @@ class ReportGenerator:
 
         logger.info(f"Action plan saved to {output_file}")
 
-    def _calculate_statistics(self, links_data: Dict, validation_data: Dict,
-                             relevance_data: Dict, repairs_data: Dict) -> Dict:
-        """Calculate comprehensive statistics"""
-        stats = {
-            'total_links': len(links_data.get('links', [])),
-            'valid': 0,
-            'broken': 0,
-            'redirects': 0,
-            'manual_review': 0,
-            'auto_fixable': 0,
-            'by_issue': defaultdict(int),
-            'by_domain': defaultdict(lambda: {'total': 0, 'broken': 0}),
-            'by_file': defaultdict(lambda: {'total': 0, 'broken': 0}),
-            'high_confidence_fixes': 0,
-            'medium_confidence_fixes': 0,
-            'low_confidence_fixes': 0,
-            'no_fix': 0
-        }
-
-        # Map validation results
-        validation_map = {r['url']: r for r in validation_data.get('results', [])}
-        repairs_map = {r['original_url']: r for r in repairs_data.get('repairs', [])}
-
-        for link in links_data.get('links', []):
-            url = link['url']
-            validation = validation_map.get(url, {})
-            repair = repairs_map.get(url)
-
-            # Count by status
-            status = validation.get('status', 'unknown')
-            if status == 'valid':
-                stats['valid'] += 1
-            elif status == 'broken':
-                stats['broken'] += 1
-            elif status == 'redirect':
-                stats['redirects'] += 1
-
-            # Count by issue type
-            issue_type = validation.get('issue_type', 'unknown')
-            stats['by_issue'][issue_type] += 1
-
-            # Count by domain
-            from urllib.parse import urlparse
-            domain = urlparse(url).netloc
-            stats['by_domain'][domain]['total'] += 1
-            if status == 'broken':
-                stats['by_domain'][domain]['broken'] += 1
-
-            # Count by file
-            file_path = link['file_path']
-            stats['by_file'][file_path]['total'] += 1
-            if status == 'broken':
-                stats['by_file'][file_path]['broken'] += 1
-
-            # Count repairs
-            if repair:
-                confidence = repair.get('confidence', 0)
-                if confidence >= 90:
-                    stats['high_confidence_fixes'] += 1
-                    stats['auto_fixable'] += 1
-                elif confidence >= 70:
-                    stats['medium_confidence_fixes'] += 1
-                else:
-                    stats['low_confidence_fixes'] += 1
-                    stats['manual_review'] += 1
-            elif status == 'broken':
-                stats['no_fix'] += 1
-                stats['manual_review'] += 1
-
-        # Calculate percentages
-        if stats['total_links'] > 0:
-            stats['valid_pct'] = (stats['valid'] / stats['total_links']) * 100
-            stats['broken_pct'] = (stats['broken'] / stats['total_links']) * 100
-        else:
-            stats['valid_pct'] = 0
-            stats['broken_pct'] = 0
-
-        return stats
-
 def main():
     parser = argparse.ArgumentParser(
         description='Generate link validation reports',
@@ -413,24 +478,35 @@ Examples:
   %(prog)s
   %(prog)s --output-dir reports
   %(prog)s --links links.json --quiet
+  %(prog)s --links links.ndjson     # one link per line, streamed
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     parser.add_argument('--version', action='version', version='%(prog)s 1.1.0')
-    parser.add_argument('--links', type=Path, default=Path('links.json'))
+    parser.add_argument('--links', type=Path, default=Path('links.json'),
+                       help='links.json, or .ndjson/.jsonl with one link per line')
     parser.add_argument('--validation', type=Path, default=Path('validation.json'))
     parser.add_argument('--relevance', type=Path, default=Path('relevance.json'))
     parser.add_argument('--repairs', type=Path, default=Path('repairs.json'))
     parser.add_argument('--output-dir', type=Path, default=Path('reports'))
+    parser.add_argument('--page-cache', type=Path, default=None,
+                       help='Page bodies stored by link-validator.py '
+                            '(default: .cache/link-validation/pages)')
+    parser.add_argument('--history', type=Path, default=None,
+                       help='Validation history database '
+                            '(default: .cache/link-validation/history.sqlite)')
+    parser.add_argument('--no-history', action='store_true',
+                       help="Don't record this run or report trends")
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress progress messages')
 
     args = parser.parse_args()
 
     try:
-        # Load all data
-        with open(args.links, 'r') as f:
-            links_data = json.load(f)
+        # Load the result files; links are streamed, not loaded
+        if not args.links.exists():
+            raise FileNotFoundError(args.links)
+        links = iter_links(args.links)
 
         with open(args.validation, 'r') as f:
             validation_data = json.load(f)
@@ -442,11 +518,15 @@ Examples:
             repairs_data = json.load(f)
 
         # Generate reports
-        generator = ReportGenerator()
+        history = None if args.no_history else ValidationHistory(args.history)
+        generator = ReportGenerator(PageCache(args.page_cache), history)
         generator.generate_all_reports(
-            links_data, validation_data, relevance_data, repairs_data,
+            links, validation_data, relevance_data, repairs_data,
             args.output_dir
         )
+        generator.page_cache.close()
+        if history is not None:
+            history.close()
 
         sys.exit(0)
     except FileNotFoundError as e:
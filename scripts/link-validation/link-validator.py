@@ -49,16 +49,26 @@ import re
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 import hashlib
 import ssl
 import time
-from urllib.parse import urlparse, urljoin
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from lib.logging_config import setup_logger
+from lib.page_cache import MAX_BODY_BYTES, PageCache, read_body
+from lib.site_routes import SiteRoutes
+
+# result_cache imports its lib siblings by bare name
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from git_changes import GitError, changed_lines
+from repair_cache import DEFAULT_CACHE_DIR
+from result_cache import ResultCache, plan_incremental
+
+DEFAULT_RESULT_CACHE = DEFAULT_CACHE_DIR / 'link-validator-results.json'
 
 try:
     from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
@@ -77,7 +87,7 @@ class ValidationResult:
     status: str  # valid, broken, restricted, redirect, timeout, error
     status_code: Optional[int]
     final_url: Optional[str]
-    issue_type: Optional[str]  # 404, 403, http_401, timeout, wrong_content, paywall, redirect, ssl_error
+    issue_type: Optional[str]  # 404, 403, http_401, timeout, wrong_content, paywall, redirect, ssl_error, missing_anchor
     error_message: Optional[str]
     response_time: float
     content_type: Optional[str]
@@ -112,13 +122,33 @@ class LinkValidator:
         'browser': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
     }
 
-    def __init__(self, max_retries: int = 3, timeout: int = 30):
+    # Seconds between requests to the same host (validate_batch and
+    # validate_stream both honour it).
+    DOMAIN_INTERVAL = 0.5
+
+    # Upper bound on how much of a response body is read (see lib/page_cache.py)
+    MAX_BODY_BYTES = MAX_BODY_BYTES
+
+    ID_ATTR_RE = re.compile(r'<[^>]+?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+    def __init__(self, max_retries: int = 3, timeout: int = 30,
+                 max_concurrency: int = 10, check_anchors: bool = False,
+                 page_cache: Optional[PageCache] = None):
         self.max_retries = max_retries
         self.timeout = timeout * 1000  # Convert to milliseconds for Playwright
+        self.max_concurrency = max_concurrency
         self.session = None
+        self._owns_session = True
         self.browser = None
         self.context = None
         self.cache = {}
+        self.site_routes = SiteRoutes()
+        self.check_anchors = check_anchors
+        # Bodies of fetched pages, kept for the relevance, repair and report stages
+        self.page_cache = page_cache
+        self.anchor_index: Dict[str, Set[str]] = {}
+        self._base_tasks: Dict[str, asyncio.Future] = {}
+        self._domain_locks: Dict[str, asyncio.Lock] = {}
         self.stats = {
             'total': 0,
             'valid': 0,
@@ -127,20 +157,18 @@ class LinkValidator:
             'redirects': 0,
             'timeouts': 0,
             'errors': 0,
-            'cached': 0
+            'cached': 0,            # repeats of a URL already checked this run
+            'from_result_cache': 0  # served from an earlier run's results (--since)
         }
 
-    async def initialize(self):
-        """Initialize HTTP session and Playwright browser"""
-        # Create aiohttp session
-        connector = aiohttp.TCPConnector(
-            ssl=ssl.create_default_context(cafile=certifi.where()),
-            limit=10
-        )
-        self.session = aiohttp.ClientSession(
-            connector=connector,
-            headers={'User-Agent': self.USER_AGENTS['browser']}
-        )
+    async def initialize(self, session: Optional[aiohttp.ClientSession] = None):
+        """Initialize HTTP session and Playwright browser.
+
+        A ``session`` passed in (the pipeline's shared one) is used as-is and
+        left open by ``cleanup``.
+        """
+        self._owns_session = session is None
+        self.session = session or self.create_session()
 
         # Initialize Playwright if available
         if PLAYWRIGHT_AVAILABLE:
@@ -154,9 +182,20 @@ class LinkValidator:
                 viewport={'width': 1920, 'height': 1080}
             )
 
+    @classmethod
+    def create_session(cls, limit: int = 10) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+            limit=limit
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': cls.USER_AGENTS['browser']}
+        )
+
     async def cleanup(self):
         """Clean up resources"""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         if self.browser:
             await self.browser.close()
@@ -221,15 +260,88 @@ class LinkValidator:
         # Process each domain group with rate limiting
         for domain, domain_links in domain_groups.items():
             for link_data in domain_links:
-                result = await self.validate_link(link_data['url'])
+                url = self._link_url(link_data)
+                result = await self.validate_link(url)
                 results.append(result)
 
                 # Rate limiting between requests to same domain
-                if len(domain_links) > 1:
-                    await asyncio.sleep(0.5)
+                if len(domain_links) > 1 and not self.site_routes.is_internal(url):
+                    await asyncio.sleep(self.DOMAIN_INTERVAL)
+
+        return results
+
+    async def validate_stream(self, links: AsyncIterator[Dict]) -> List[ValidationResult]:
+        """Validate links as they arrive from an async source.
 
+        Each URL starts validating as soon as its first occurrence arrives, so
+        work overlaps with extraction. Repeat occurrences share the in-flight
+        task instead of fetching again. Hosts are still visited one request at
+        a time, DOMAIN_INTERVAL apart; different hosts run concurrently up to
+        ``max_concurrency``. Returns one result per link, in arrival order.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[str, asyncio.Task] = {}
+        order: List[str] = []
+
+        async for link in links:
+            url = self._link_url(link)
+            order.append(url)
+            if url in tasks:
+                self.stats['total'] += 1
+                self.stats['cached'] += 1
+                continue
+            tasks[url] = asyncio.create_task(self._validate_throttled(url, semaphore))
+
+        if tasks:
+            await asyncio.gather(*tasks.values())
+        return [tasks[url].result() for url in order]
+
+    def serve_cached(self, entries: List[Dict]) -> List[ValidationResult]:
+        """Results stored by an earlier run, counted in stats like fresh ones"""
+        names = ValidationResult.__dataclass_fields__
+        results = []
+        for entry in entries:
+            result = ValidationResult(**{name: entry.get(name) for name in names})
+            self.cache[result.url] = result
+            self.stats['total'] += 1
+            self.stats['from_result_cache'] += 1
+            stat_key = self.STAT_KEYS.get(result.status)
+            if stat_key:
+                self.stats[stat_key] += 1
+            results.append(result)
         return results
 
+    def _link_url(self, link: Dict) -> str:
+        """URL to validate for a link; in-page '#id' links point at their post"""
+        url = link['url']
+        if self.check_anchors and url.startswith('#') and link.get('file_path'):
+            return f"/posts/{Path(link['file_path']).stem}{url}"
+        return url
+
+    async def _validate_throttled(self, url: str,
+                                  semaphore: asyncio.Semaphore) -> ValidationResult:
+        """validate_link() serialised per host and capped globally"""
+        if self.site_routes.is_internal(url):
+            return await self.validate_link(url)
+
+        domain = self._extract_domain(url)
+        lock = self._domain_locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            async with semaphore:
+                result = await self.validate_link(url)
+            await asyncio.sleep(self.DOMAIN_INTERVAL)
+        return result
+
+    # stats key for each ValidationResult.status
+    STAT_KEYS = {
+        'valid': 'valid',
+        'broken': 'broken',
+        'restricted': 'restricted',
+        'redirect': 'redirects',
+        'timeout': 'timeouts',
+        'error': 'errors',
+    }
+
     async def validate_link(self, url: str) -> ValidationResult:
         """Validate a single link"""
         self.stats['total'] += 1
@@ -239,6 +351,28 @@ class LinkValidator:
             self.stats['cached'] += 1
             return self.cache[url]
 
+        if self.check_anchors and urldefrag(url).fragment:
+            result = await self._validate_anchor(url)
+        else:
+            result = await self._resolve(url)
+
+        if result:
+            # Update stats
+            stat_key = self.STAT_KEYS.get(result.status)
+            if stat_key:
+                self.stats[stat_key] += 1
+
+            # Cache result
+            self.cache[url] = result
+
+        return result
+
+    async def _resolve(self, url: str) -> Optional[ValidationResult]:
+        """Run the validation strategies for one URL (no stats, no caching)"""
+        # Links to this site resolve against the source tree -- no round-trip.
+        if self.site_routes.is_internal(url):
+            return self._validate_internal(url)
+
         start_time = time.time()
         result = None
 
@@ -255,7 +389,6 @@ class LinkValidator:
                         result = playwright_result
 
                 if result.status == 'valid':
-                    self.stats['valid'] += 1
                     break
 
                 # Exponential backoff for retries
@@ -279,23 +412,68 @@ class LinkValidator:
                     retry_count=retry + 1
                 )
 
-        if result:
-            # Update stats
-            if result.status == 'broken':
-                self.stats['broken'] += 1
-            elif result.status == 'restricted':
-                self.stats['restricted'] += 1
-            elif result.status == 'redirect':
-                self.stats['redirects'] += 1
-            elif result.status == 'timeout':
-                self.stats['timeouts'] += 1
-            elif result.status == 'error':
-                self.stats['errors'] += 1
+        return result
 
-            # Cache result
-            self.cache[url] = result
+    async def _validate_anchor(self, url: str) -> Optional[ValidationResult]:
+        """Validate a link with a #fragment: the page must resolve and carry the id.
 
-        return result
+        Each base page is resolved once (a shared task, so concurrent anchors
+        on one page don't refetch it) and its id set is built once -- from the
+        markdown headings for internal posts, from the bounded body read of
+        that same fetch for external pages. Every anchor is then a set lookup.
+        A missing id is 'broken' on our own pages but only 'restricted' on
+        external ones, where the id may be injected by JavaScript.
+        """
+        base, fragment = urldefrag(url)
+        base_result = self.cache.get(base)
+        if base_result is None:
+            task = self._base_tasks.get(base)
+            if task is None:
+                task = self._base_tasks[base] = asyncio.ensure_future(self._resolve(base))
+            base_result = await task
+
+        if base_result is None:
+            return None
+        if base_result.status not in ('valid', 'redirect') or fragment.startswith(':~:'):
+            return replace(base_result, url=url)
+
+        internal = self.site_routes.is_internal(base)
+        ids = self.site_routes.anchors(base) if internal else self.anchor_index.get(base)
+        if ids is None or unquote(fragment) in ids:
+            return replace(base_result, url=url)
+
+        return replace(
+            base_result,
+            url=url,
+            status='broken' if internal else 'restricted',
+            issue_type='missing_anchor',
+            error_message=f"No element with id '{unquote(fragment)}' on the page"
+        )
+
+    def _index_anchors(self, url: str, content: str, content_type: Optional[str]):
+        """Remember the element ids of a fetched HTML page for anchor checks"""
+        if self.check_anchors and 'html' in (content_type or 'text/html').lower():
+            self.anchor_index[url] = set(self.ID_ATTR_RE.findall(content))
+
+    def _validate_internal(self, url: str) -> ValidationResult:
+        """Resolve a link to this site offline (see lib/site_routes.py)"""
+        start_time = time.time()
+        found = self.site_routes.exists(url)
+        return ValidationResult(
+            url=url,
+            status='valid' if found else 'broken',
+            status_code=200 if found else 404,
+            final_url=None,
+            issue_type=None if found else '404',
+            error_message=None if found else 'No post, page or asset for this path in the source tree',
+            response_time=time.time() - start_time,
+            content_type=None,
+            page_title=None,
+            requires_js=False,
+            ssl_valid=True,
+            validation_time=datetime.now().isoformat(),
+            retry_count=0
+        )
 
     async def _validate_http(self, url: str, retry: int) -> ValidationResult:
         """Validate using HTTP request"""
@@ -315,9 +493,13 @@ class LinkValidator:
                 final_url = str(response.url)
                 is_redirect = final_url != url
 
-                # Read content for paywall detection
-                content = await response.text()
+                # Read a bounded prefix for paywall, title and anchor detection
+                content = await read_body(response, self.MAX_BODY_BYTES)
                 content_lower = content.lower()
+                self._index_anchors(url, content, response.headers.get('Content-Type'))
+                if (self.page_cache is not None and response.status < 400
+                        and 'html' in response.headers.get('Content-Type', 'text/html').lower()):
+                    self.page_cache.put(url, content, status=response.status)
 
                 # Check for paywall
                 has_paywall = any(
@@ -425,6 +607,10 @@ class LinkValidator:
             # Get page content
             content = await page.content()
             content_lower = content.lower()
+            self._index_anchors(url, content, response.headers.get('content-type'))
+            if self.page_cache is not None and response.status < 400:
+                # The rendered DOM: what readers (and the relevance check) see
+                self.page_cache.put(url, content, status=response.status)
 
             # Check for paywall
             has_paywall = any(
@@ -511,14 +697,18 @@ class LinkValidator:
         except:
             return 'unknown'
 
-    async def save_results(self, results: List[ValidationResult], output_file: Path, logger=None):
-        """Save validation results to JSON"""
-        data = {
+    def results_data(self, results: List[ValidationResult]) -> Dict:
+        """validation.json contents"""
+        return {
             'validation_date': datetime.now().isoformat(),
             'stats': self.stats,
             'results': [r.to_dict() for r in results]
         }
 
+    async def save_results(self, results: List[ValidationResult], output_file: Path, logger=None):
+        """Save validation results to JSON"""
+        data = self.results_data(results)
+
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
 
@@ -531,11 +721,37 @@ class LinkValidator:
             logger.info(f"⏱️  Timeouts: {self.stats['timeouts']}")
             logger.info(f"💾 Results saved to {output_file}")
 
+async def iter_ndjson(path: Path) -> AsyncIterator[Dict]:
+    """Yield link dicts from an NDJSON file, or stdin for "-", as lines arrive.
+
+    Reads happen off the event loop so validation tasks keep running while
+    the producer (``link-extractor.py --ndjson -``) is still writing.
+    """
+    stream = sys.stdin if str(path) == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        while True:
+            line = await asyncio.to_thread(stream.readline)
+            if not line:
+                break
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def is_ndjson_input(path: Path) -> bool:
+    """stdin and *.ndjson / *.jsonl inputs are consumed as a stream"""
+    return str(path) == '-' or path.suffix in ('.ndjson', '.jsonl')
+
+
 async def main():
     parser = argparse.ArgumentParser(description='Validate links from extracted data')
     parser.add_argument('--input', type=Path,
                        default=Path('links.json'),
-                       help='Input JSON file with extracted links')
+                       help='Input JSON file with extracted links, or an NDJSON '
+                            'stream (*.ndjson or "-" for stdin)')
     parser.add_argument('--output', type=Path,
                        default=Path('validation.json'),
                        help='Output JSON file')
@@ -543,6 +759,22 @@ async def main():
                        help='Maximum retry attempts')
     parser.add_argument('--timeout', type=int, default=30,
                        help='Request timeout in seconds')
+    parser.add_argument('--check-anchors', action='store_true',
+                       help='Also verify that #fragment targets exist on the page')
+    parser.add_argument('--page-cache', type=Path, default=None,
+                       help='Where to keep fetched page bodies for the relevance, '
+                            'repair and report stages (default: .cache/link-validation/pages)')
+    parser.add_argument('--page-cache-mb', type=int, default=PageCache.MAX_BYTES // 2**20,
+                       help='Cap on compressed page bodies kept, least recently used '
+                            'evicted first (default: %(default)s)')
+    parser.add_argument('--no-page-cache', action='store_true',
+                       help="Don't keep fetched page bodies")
+    parser.add_argument('--since', metavar='GIT_REV',
+                       help='Validate only links on lines changed since this git revision '
+                            '(and URLs never seen before); serve cached results for the rest')
+    parser.add_argument('--result-cache', type=Path, default=DEFAULT_RESULT_CACHE,
+                       help='Latest result per URL, updated every run and served by --since '
+                            '(default: .cache/link-validation/link-validator-results.json)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable debug output')
     parser.add_argument('--quiet', '-q', action='store_true', help='Suppress info messages')
     parser.add_argument('--log-file', type=Path, help='Write logs to file')
@@ -557,33 +789,67 @@ async def main():
     if not PLAYWRIGHT_AVAILABLE:
         logger.warning("⚠️  Playwright not installed. Using basic HTTP validation.")
 
-    if not args.input.exists():
+    streaming = is_ndjson_input(args.input)
+    if str(args.input) != '-' and not args.input.exists():
         logger.error(f"❌ Input file not found: {args.input}")
         return 1
+    if streaming and args.since:
+        logger.error("❌ --since needs a links.json input, not a stream")
+        return 1
 
-    # Load links
-    with open(args.input, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    links = None
+    if streaming:
+        logger.info(f"📋 Validating links as they stream from {args.input}")
+    else:
+        # Load links
+        with open(args.input, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
-    links = data['links']
-    logger.info(f"📋 Loaded {len(links)} links to validate")
+        links = data['links']
+        logger.info(f"📋 Loaded {len(links)} links to validate")
 
     # Initialize validator
     validator = LinkValidator(
         max_retries=args.max_retries,
-        timeout=args.timeout
+        timeout=args.timeout,
+        check_anchors=args.check_anchors,
+        page_cache=None if args.no_page_cache else PageCache(
+            args.page_cache, max_bytes=args.page_cache_mb * 2**20
+        )
     )
 
+    result_cache = ResultCache(args.result_cache)
+    cached = []
+    if args.since:
+        try:
+            changed = changed_lines(args.since)
+        except GitError as e:
+            logger.error(f"❌ Could not diff against {args.since}: {e}")
+            return 1
+        total = len(links)
+        links, cached = plan_incremental(links, changed, result_cache,
+                                        validator._link_url)
+        logger.info(f"🔀 {len(links)} of {total} links changed since {args.since} or not "
+                    f"seen before; {len(cached)} URLs served from {args.result_cache}")
+
     await validator.initialize()
 
     try:
         # Validate links
-        results = await validator.validate_batch(links)
+        if streaming:
+            results = await validator.validate_stream(iter_ndjson(args.input))
+        else:
+            results = await validator.validate_batch(links)
+        result_cache.update(r.to_dict() for r in results if r)
+        result_cache.save()
+        results += validator.serve_cached(cached)
 
         # Save results
         await validator.save_results(results, args.output, logger)
     finally:
         await validator.cleanup()
+        if validator.page_cache is not None:
+            validator.page_cache.close()
 
     return 0
 
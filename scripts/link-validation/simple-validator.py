@@ -17,6 +17,8 @@ LLM_USAGE:
 ARGUMENTS:
     --links: JSON file with extracted links (default: links.json)
     --output: Output report file (default: validation.json)
+    --since: Validate only links on lines changed since a git revision
+    --result-cache: Latest result per URL, served for unchanged links by --since
     --quiet/-q: Suppress progress messages
 
 EXAMPLES:
@@ -26,6 +28,9 @@ EXAMPLES:
     # Quiet mode
     uv run python scripts/link-validation/simple-validator.py --links links.json --quiet
 
+    # PR check: validate links on changed lines, cached results for the rest
+    uv run python scripts/link-validation/simple-validator.py --links links.json --since origin/main
+
 OUTPUT:
     - Processed results based on script functionality
     - Log messages if verbose mode enabled
@@ -54,10 +59,16 @@ from urllib.parse import urlparse
 
 # Setup logging
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from git_changes import GitError, changed_lines
 from logging_config import setup_logger
+from repair_cache import DEFAULT_CACHE_DIR
+from result_cache import ResultCache, plan_incremental
+from site_routes import SiteRoutes
 
 logger = setup_logger(__name__)
 
+DEFAULT_RESULT_CACHE = DEFAULT_CACHE_DIR / 'simple-validator-results.json'
+
 class SimpleValidator:
     """Simple link validator using only aiohttp.
 
@@ -96,9 +107,11 @@ class SimpleValidator:
             'timeout': 0,
             'error': 0,
             'needs_manual': 0,
+            'from_result_cache': 0,
         }
         self._domain_locks: Dict[str, asyncio.Lock] = {}
         self._domain_last: Dict[str, float] = {}
+        self.site_routes = SiteRoutes()
 
     async def __aenter__(self):
         timeout = aiohttp.ClientTimeout(total=20)
@@ -161,6 +174,15 @@ class SimpleValidator:
         domain = urlparse(url).netloc
         self.stats['total'] += 1
 
+        # Links to this site resolve against the source tree -- no round-trip.
+        if self.site_routes.is_internal(url):
+            if self.site_routes.exists(url):
+                self._record(result, 'valid')
+            else:
+                self._record(result, 'broken', 'not_found')
+            result['notes'] = 'Resolved offline against the source tree'
+            return result
+
         try:
             await self._throttle(domain)
             async with self.session.head(url, allow_redirects=True) as resp:
@@ -240,6 +262,16 @@ class SimpleValidator:
         self.results = results
         return results
 
+    def serve_cached(self, results: List[Dict]):
+        """Add results stored by an earlier run, counted in stats like fresh ones"""
+        if not results:
+            return
+        for result in results:
+            self.stats['total'] += 1
+            self.stats[result['status']] = self.stats.get(result['status'], 0) + 1
+        self.stats['from_result_cache'] += len(results)
+        self.results = self.results + results
+
     def get_broken_links(self) -> List[Dict]:
         """Get all broken links"""
         return [r for r in self.results if r['status'] == 'broken']
@@ -285,6 +317,11 @@ Examples:
                        help='JSON file with extracted links')
     parser.add_argument('--output', type=Path, default=Path('validation.json'),
                        help='Output report file')
+    parser.add_argument('--since', metavar='GIT_REV',
+                       help='Validate only links on lines changed since this git revision '
+                            '(and URLs never seen before); serve cached results for the rest')
+    parser.add_argument('--result-cache', type=Path, default=DEFAULT_RESULT_CACHE,
+                       help='Latest result per URL, updated every run and served by --since')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress progress messages')
 
@@ -300,13 +337,31 @@ Examples:
     with open(args.links, 'r') as f:
         links_data = json.load(f)
 
-    urls = [link['url'] for link in links_data.get('links', [])]
+    links = links_data.get('links', [])
+    result_cache = ResultCache(args.result_cache)
+    cached = []
+    if args.since:
+        try:
+            changed = changed_lines(args.since)
+        except GitError as e:
+            logger.error(f"Error: Could not diff against {args.since}: {e}")
+            sys.exit(2)
+        total = len(links)
+        links, cached = plan_incremental(links, changed, result_cache)
+        if not args.quiet:
+            logger.info(f"{len(links)} of {total} links changed since {args.since} or not seen "
+                        f"before; {len(cached)} URLs served from {args.result_cache}")
+
+    urls = [link['url'] for link in links]
     if not args.quiet:
         logger.info(f"Validating {len(set(urls))} unique URLs...")
 
     # Validate
     async with SimpleValidator() as validator:
         await validator.validate_batch(urls, quiet=args.quiet)
+        result_cache.update(validator.results)
+        result_cache.save()
+        validator.serve_cached(cached)
         validator.save_results(args.output, quiet=args.quiet)
 
         # Show broken links
@@ -2,12 +2,14 @@
 
 The validation scripts use hyphenated filenames (link-extractor.py,
 simple-validator.py) that aren't importable as normal modules, so we load them
-by path with importlib.
+by path with importlib. Shared helpers under scripts/lib import normally.
 """
 import importlib.util
+import sys
 from pathlib import Path
 
 _SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_SCRIPTS.parent / "lib"))
 
 
 def load_script(filename: str):
@@ -15,5 +17,7 @@ def load_script(filename: str):
     path = _SCRIPTS / filename
     spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
     module = importlib.util.module_from_spec(spec)
+    # Registered so worker-process functions defined in the script can pickle.
+    sys.modules[spec.name] = module
     spec.loader.exec_module(module)
     return module
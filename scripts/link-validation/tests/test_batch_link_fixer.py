@@ -37,3 +37,230 @@ def test_markdown_url_that_itself_ends_with_paren():
 
     assert count == 1
     assert fixed == f"See [Mercury]({new_url}) for examples."
+
+
+def test_apply_repairs_skips_replacements_verified_dead(tmp_path, monkeypatch):
+    import json
+
+    monkeypatch.chdir(tmp_path)
+
+    post = tmp_path / "post.md"
+    post.write_text("[a](https://old.example/a) [b](https://old.example/b)\n", encoding="utf-8")
+    repairs = tmp_path / "repairs.json"
+    repairs.write_text(json.dumps({"repairs": [
+        {"original_url": "https://old.example/a", "suggested_url": "https://new.example/a",
+         "confidence": 95, "verified": True},
+        {"original_url": "https://old.example/b", "suggested_url": "https://new.example/b",
+         "confidence": 95, "verified": False},
+    ]}), encoding="utf-8")
+    (tmp_path / "links.json").write_text(json.dumps({"links": [
+        {"url": "https://old.example/a", "file_path": str(post)},
+        {"url": "https://old.example/b", "file_path": str(post)},
+    ]}), encoding="utf-8")
+
+    fixer = blf.BatchLinkFixer(confidence_threshold=95, journal_dir=tmp_path / "runs")
+    fixer.apply_repairs(repairs, tmp_path)
+
+    assert post.read_text(encoding="utf-8") == "[a](https://new.example/a) [b](https://old.example/b)\n"
+
+
+def test_replace_urls_matches_one_replacement_at_a_time():
+    content = (
+        "See [a](https://old.example/a) and https://old.example/a/extra, "
+        "[b](https://old.example/b#frag) or https://old.example/b.\n"
+        "[https://old.example/a](https://elsewhere.example/) stays."
+    )
+    replacements = {
+        "https://old.example/a": "https://new.example/a",
+        "https://old.example/a/extra": "https://new.example/extra",
+        "https://old.example/b": "https://new.example/b",
+    }
+
+    expected, expected_counts = content, {}
+    for old_url, new_url in replacements.items():
+        expected, expected_counts[old_url] = replace_url(expected, old_url, new_url)
+    fixed, counts = blf.BatchLinkFixer._replace_urls(content, replacements)
+
+    assert (fixed, counts) == (expected, expected_counts)
+    assert counts == {
+        "https://old.example/a": 2,
+        "https://old.example/a/extra": 0,
+        "https://old.example/b": 1,
+    }
+    assert "[b](https://old.example/b#frag)" in fixed
+    assert "[https://old.example/a](https://elsewhere.example/)" in fixed
+
+
+def test_replace_urls_does_not_rescan_replacements():
+    fixed, counts = blf.BatchLinkFixer._replace_urls(
+        "[a](https://one.example/) [b](https://two.example/)",
+        {"https://one.example/": "https://two.example/", "https://two.example/": "https://three.example/"},
+    )
+
+    assert fixed == "[a](https://two.example/) [b](https://three.example/)"
+    assert counts == {"https://one.example/": 1, "https://two.example/": 1}
+
+
+def test_applied_run_is_journaled_and_rolled_back(tmp_path):
+    posts = [tmp_path / f"post{i}.md" for i in range(3)]
+    originals = [f"Post {i}: [a](https://old.example/{i})\r\nhttps://old.example/{i}\r\n"
+                 for i in range(3)]
+    for post, text in zip(posts, originals):
+        post.write_bytes(text.encode("utf-8"))
+    links = {"links": [{"url": f"https://old.example/{i}", "file_path": str(post)}
+                       for i, post in enumerate(posts[:2])]}
+    repairs = {"repairs": [
+        {"original_url": f"https://old.example/{i}", "suggested_url": f"https://new.example/{i}",
+         "confidence": 95}
+        for i in range(3)
+    ]}
+
+    fixer = blf.BatchLinkFixer(confidence_threshold=95, workers=2, journal_dir=tmp_path / "runs")
+    fixer.apply_repairs_data(repairs, links)
+
+    # Rewritten in place, line endings kept; post2 isn't in links_data
+    assert posts[0].read_bytes() == b"Post 0: [a](https://new.example/0)\r\nhttps://new.example/0\r\n"
+    assert posts[2].read_bytes() == originals[2].encode("utf-8")
+    assert sum(change["count"] for change in fixer.changes_made) == 4
+    assert not list(tmp_path.glob("*.bak*")) and not list(tmp_path.glob(".*.tmp"))
+
+    run_id = fixer.journal.run_id
+    posts[1].write_text("edited by hand\n", encoding="utf-8")
+
+    assert blf.BatchLinkFixer(journal_dir=tmp_path / "runs").rollback(run_id) == 1
+    assert posts[0].read_bytes() == originals[0].encode("utf-8")
+    assert posts[1].read_text(encoding="utf-8") == "edited by hand\n"
+
+
+def test_unreadable_post_is_skipped_and_the_run_still_rolls_back(tmp_path):
+    posts = [tmp_path / f"post{i}.md" for i in range(4)]
+    for i, post in enumerate(posts):
+        post.write_text(f"[a](https://old.example/{i})\n", encoding="utf-8")
+    posts[2].write_bytes(b"\xff\xfe [a](https://old.example/2)\n")
+    links = {"links": [{"url": f"https://old.example/{i}", "file_path": str(post)}
+                       for i, post in enumerate(posts)]}
+    repairs = {"repairs": [{"original_url": f"https://old.example/{i}",
+                            "suggested_url": f"https://new.example/{i}", "confidence": 95}
+                           for i in range(4)]}
+
+    fixer = blf.BatchLinkFixer(confidence_threshold=95, workers=2, journal_dir=tmp_path / "runs")
+    fixer.apply_repairs_data(repairs, links)
+
+    assert fixer.failed_files == [str(posts[2])]
+    assert len(fixer.journal.files) == 3
+    assert blf.BatchLinkFixer(journal_dir=tmp_path / "runs").rollback(fixer.journal.run_id) == 0
+    assert [post.read_bytes() for post in posts[:2] + posts[3:]] == [
+        f"[a](https://old.example/{i})\n".encode() for i in (0, 1, 3)]
+
+
+def test_journal_is_on_disk_before_a_crash(tmp_path, monkeypatch):
+    posts = [tmp_path / f"post{i}.md" for i in range(2)]
+    for i, post in enumerate(posts):
+        post.write_text(f"[a](https://old.example/{i})\n", encoding="utf-8")
+    links = {"links": [{"url": f"https://old.example/{i}", "file_path": str(post)}
+                       for i, post in enumerate(posts)]}
+    repairs = {"repairs": [{"original_url": f"https://old.example/{i}",
+                            "suggested_url": f"https://new.example/{i}", "confidence": 95}
+                           for i in range(2)]}
+
+    write_atomic = blf.write_atomic
+    written = []
+
+    def crash_on_second_post(path, data):
+        if written:
+            raise KeyboardInterrupt
+        written.append(path)
+        write_atomic(path, data)
+
+    monkeypatch.setattr(blf, "write_atomic", crash_on_second_post)
+    fixer = blf.BatchLinkFixer(confidence_threshold=95, workers=1, journal_dir=tmp_path / "runs")
+    with pytest.raises(KeyboardInterrupt):
+        fixer.apply_repairs_data(repairs, links)
+    monkeypatch.undo()
+
+    assert posts[0].read_text(encoding="utf-8") == "[a](https://new.example/0)\n"
+    (journal,) = (tmp_path / "runs").glob("*.json")
+    assert blf.BatchLinkFixer(journal_dir=tmp_path / "runs").rollback(journal.stem) == 0
+    assert [post.read_text(encoding="utf-8") for post in posts] == [
+        "[a](https://old.example/0)\n", "[a](https://old.example/1)\n"]
+
+
+def test_repair_reaches_every_post_through_the_occurrence_index(tmp_path, monkeypatch):
+    import json
+
+    from occurrence_index import index_path
+
+    posts = tmp_path / "posts"
+    posts.mkdir()
+    links = []
+    for line, name in enumerate(("a.md", "b.md", "c.md"), 1):
+        (posts / name).write_text(f"In {name}: [paper](https://old.example/p)\n", encoding="utf-8")
+        links.append({"url": "https://old.example/p", "file_path": str(posts / name),
+                      "line_number": 1, "position": 9, "text": "paper"})
+    links_file = tmp_path / "links.json"
+    links_file.write_text(json.dumps({"links": links}), encoding="utf-8")
+    blf.OccurrenceIndex.from_links(links).save(index_path(links_file), links_file)
+
+    repairs = tmp_path / "repairs.json"
+    repairs.write_text(json.dumps({"repairs": [
+        {"original_url": "https://old.example/p", "suggested_url": "https://new.example/p",
+         "confidence": 95, "source": "redirect"},
+    ]}), encoding="utf-8")
+
+    # The index is used as written; links.json is not parsed again
+    monkeypatch.setattr(blf.OccurrenceIndex, "from_links", None)
+    fixer = blf.BatchLinkFixer(confidence_threshold=95, journal_dir=tmp_path / "runs",
+                               links_file=links_file)
+    fixer.apply_repairs(repairs, posts)
+
+    for name in ("a.md", "b.md", "c.md"):
+        assert (posts / name).read_text(encoding="utf-8") == f"In {name}: [paper](https://new.example/p)\n"
+    assert len(fixer.journal.files) == 3
+
+    fixer.confidence_threshold = 99
+    fixer.generate_review_queue(repairs, tmp_path / "review.md")
+    assert "## a.md, b.md, c.md" in (tmp_path / "review.md").read_text(encoding="utf-8")
+
+
+def test_dry_run_patch_applies_to_the_same_result(tmp_path, monkeypatch):
+    import io
+    import shutil
+    import subprocess
+
+    git = shutil.which("git")
+    if git is None:
+        pytest.skip("git not installed")
+    monkeypatch.chdir(tmp_path)
+    posts = tmp_path / "posts"
+    posts.mkdir()
+    texts = {
+        "crlf.md": "Intro\r\n\r\n[a](https://old.example/a)\r\nEnd\r\n",
+        "tail.md": "\n".join(f"line {i}" for i in range(20)) + "\nhttps://old.example/a",
+        "none.md": "Nothing to fix here\n",
+    }
+    for name, text in texts.items():
+        (posts / name).write_bytes(text.encode("utf-8"))
+    links = {"links": [{"url": "https://old.example/a", "file_path": str(posts / name)}
+                       for name in texts]}
+    repairs = {"repairs": [{"original_url": "https://old.example/a",
+                            "suggested_url": "https://new.example/a", "confidence": 95}]}
+
+    out = io.StringIO()
+    planner = blf.BatchLinkFixer(confidence_threshold=95, dry_run=True, patch_out=out)
+    planner.apply_repairs_data(repairs, links)
+    patch = out.getvalue()
+
+    assert {p.name: p.read_bytes().decode("utf-8") for p in posts.iterdir()} == texts
+    assert patch.count("diff --git") == 2 and "none.md" not in patch
+    assert "\\ No newline at end of file" in patch
+    assert sum(change["count"] for change in planner.changes_made) == 2
+
+    (tmp_path / "repairs.patch").write_text(patch, encoding="utf-8", newline="")
+    subprocess.run([git, "apply", "repairs.patch"], check=True, cwd=tmp_path)
+    patched = {p.name: p.read_bytes() for p in posts.iterdir()}
+
+    for name, text in texts.items():
+        (posts / name).write_bytes(text.encode("utf-8"))
+    blf.BatchLinkFixer(confidence_threshold=95, journal_dir=tmp_path / "runs").apply_repairs_data(
+        repairs, links)
+    assert patched == {p.name: p.read_bytes() for p in posts.iterdir()}
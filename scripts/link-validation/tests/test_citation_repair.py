@@ -46,3 +46,300 @@ def test_different_live_url_caps_high_confidence_with_empty_relevance():
     )
 
     assert confidence == 90
+
+
+def _suggestion(url, source):
+    return cr.RepairSuggestion(
+        original_url="https://dead.example/paper", link_hash="", issue_type="broken_citation",
+        suggested_url=url, source=source, confidence=85, title="", description="",
+        is_archived=False, repair_type="alternative", notes="",
+    )
+
+
+def test_strategies_race_but_highest_priority_success_wins():
+    import asyncio
+
+    repair = cr.CitationRepair()
+    cancelled = []
+
+    async def _search_arxiv(paper_info, url, relevance=None):
+        await asyncio.sleep(0.05)
+        return _suggestion("https://arxiv.org/abs/1", "arXiv")
+
+    async def _search_crossref(paper_info, url, relevance=None):
+        return _suggestion("https://doi.org/10.1/x", "CrossRef")
+
+    async def nothing(paper_info, url, relevance=None):
+        return None
+
+    async def _check_doi_resolution(paper_info, url, relevance=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    repair._search_arxiv = _search_arxiv
+    repair._search_crossref = _search_crossref
+    repair._search_semantic_scholar = nothing
+    repair._check_doi_resolution = _check_doi_resolution
+    repair._find_pmc_version = nothing
+
+    link_info = {"link": {"url": "https://dead.example/paper", "type": "citation"}, "relevance": {}}
+    result = asyncio.run(repair._repair_academic_citation(link_info))
+
+    assert result.source == "arXiv"  # same pick as the sequential loop
+    assert cancelled == [True]
+    report = repair.strategy_report()
+    assert report["search_arxiv"]["wins"] == 1
+    assert report["search_crossref"]["hit_rate"] == 1.0
+    assert report["check_doi_resolution"]["cancelled"] == 1
+
+
+def test_find_repairs_bounds_concurrency_and_shares_repeated_urls():
+    import asyncio
+
+    repair = cr.CitationRepair(max_concurrency=2)
+    active, peak, calls = 0, 0, []
+
+    async def fake_wayback(link_info):
+        nonlocal active, peak
+        calls.append(link_info["link"]["url"])
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return None
+
+    repair._repair_with_wayback = fake_wayback
+    # The repeat arrives while the first lookup is still in flight.
+    urls = ["https://blog.example/post-0"] + [f"https://blog.example/post-{i}" for i in range(5)]
+    links = {"links": [{"url": u, "type": "inline", "hash": str(i)} for i, u in enumerate(urls)]}
+    validation = {"results": [{"url": u, "status": "broken", "issue_type": "404"} for u in urls]}
+
+    repairs = asyncio.run(repair.find_repairs(links, validation, {"results": []}))
+
+    assert repairs == []
+    assert peak == 2
+    assert sorted(calls) == sorted(set(urls))
+    assert repair.stats["total_processed"] == 6
+
+
+def test_persistent_cache_reuses_fixes_and_no_fix_outcomes(tmp_path):
+    import asyncio
+    from repair_cache import RepairCache
+
+    calls = []
+
+    async def fake_wayback(link_info):
+        url = link_info["link"]["url"]
+        calls.append(url)
+        return _suggestion("https://web.archive.org/web/2024/" + url, "Wayback") if "fixable" in url else None
+
+    def run(context="Old post prose"):
+        repair = cr.CitationRepair(cache=RepairCache(tmp_path / "repairs.json"))
+        repair._repair_with_wayback = fake_wayback
+        urls = ["https://blog.example/fixable", "https://blog.example/gone"]
+        links = {"links": [{"url": u, "type": "inline", "text": "t", "context_before": context,
+                            "context_after": ""} for u in urls]}
+        validation = {"results": [{"url": u, "status": "broken", "issue_type": "404"} for u in urls]}
+        repairs = asyncio.run(repair.find_repairs(links, validation, {"results": []}))
+        repair.cache.save()
+        return repairs, repair.cache.stats
+
+    first, _ = run()
+    assert len(calls) == 2
+
+    again, stats = run()
+    assert len(calls) == 2  # unchanged corpus: nothing searched
+    assert [r.suggested_url for r in again] == [r.suggested_url for r in first]
+    assert stats["hits"] == 1 and stats["negative_hits"] == 1
+
+    _, stats = run(context="Edited post prose")
+    assert len(calls) == 4
+    assert stats["invalidated"] == 2
+
+
+def test_repair_cache_expires_negative_outcomes_sooner(tmp_path):
+    from repair_cache import RepairCache
+
+    cache = RepairCache(tmp_path / "repairs.json", found_ttl=100, not_found_ttl=-1)
+    cache.put("https://a.example", "404", "ctx", None)
+    cache.put("https://b.example", "404", "ctx", {"suggested_url": "https://b2.example"})
+
+    assert cache.get("https://a.example", "404", "ctx") == (False, None)
+    assert cache.get("https://b.example", "404", "ctx")[0] is True
+    assert cache.stats["expired"] == 1
+
+
+def test_verification_caps_suggestions_that_are_not_live():
+    import asyncio
+
+    import aiohttp
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    seen = []
+
+    async def live(request):
+        seen.append((request.method, request.path))
+        return web.Response(text="ok")
+
+    async def head_rejected(request):
+        seen.append((request.method, request.path, request.headers.get("Range")))
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        return web.Response(status=206, text="o")
+
+    async def dead(request):
+        seen.append((request.method, request.path))
+        return web.Response(status=404)
+
+    async def run():
+        app = web.Application()
+        app.router.add_route("*", "/live", live)
+        app.router.add_route("*", "/no-head", head_rejected)
+        app.router.add_route("*", "/dead", dead)
+        server = TestServer(app)
+        await server.start_server()
+        repair = cr.CitationRepair()
+        repair.DOMAIN_INTERVAL = 0
+        try:
+            async with aiohttp.ClientSession() as session:
+                repair.session = session
+                shared = _suggestion(str(server.make_url("/live")), "DOI")
+                shared.confidence = 95
+                repairs = [shared, shared,  # same object for a URL cited twice
+                           _suggestion(str(server.make_url("/no-head")), "arXiv"),
+                           _suggestion(str(server.make_url("/dead")), "CrossRef")]
+                repairs[2].confidence = repairs[3].confidence = 95
+                await repair.verify_suggestions(repairs)
+        finally:
+            await server.close()
+        return repair, repairs
+
+    repair, (live_fix, _, no_head_fix, dead_fix) = asyncio.run(run())
+
+    assert live_fix.verified and live_fix.confidence == 95
+    assert no_head_fix.verified and no_head_fix.verification_status == 206
+    assert ("GET", "/no-head", "bytes=0-0") in seen
+    assert dead_fix.verified is False and dead_fix.confidence == 89
+    assert dead_fix.notes.endswith("(replacement not verified: HTTP 404)")
+    assert live_fix.notes == ""
+    assert seen.count(("HEAD", "/live")) == 1
+    assert repair.verification_stats == {"checked": 3, "live": 2, "dead": 1,
+                                         "from_page_cache": 0}
+
+
+def test_page_cache_supplies_metadata_and_fresh_verification(tmp_path):
+    import asyncio
+
+    from page_cache import PageCache
+
+    pages = PageCache(tmp_path)
+    pages.put("https://journal.example/article/42", """<html><head>
+        <meta name="citation_title" content="Memory-Safe  Parsers in Practice">
+        <meta content="Ada Lovelace" name="citation_author">
+        <meta name="citation_author" content='Grace Hopper'>
+        <meta name="citation_publication_date" content="2021/03/14">
+        <meta name="citation_doi" content="doi:10.1145/3442381.3450000">
+        </head></html>""")
+    pages.put("https://mirror.example/paper.pdf", "%PDF", status=200)
+    repair = cr.CitationRepair(pages=pages)
+
+    info = repair._extract_paper_info("as argued in a recent paper", "https://journal.example/article/42")
+    assert info == {"title": "Memory-Safe Parsers in Practice",
+                    "authors": "Ada Lovelace, Grace Hopper", "year": "2021",
+                    "doi": "10.1145/3442381.3450000"}
+
+    # Fetched by the validator moments ago: no request needed (no session set)
+    fix = _suggestion("https://mirror.example/paper.pdf", "arXiv")
+    asyncio.run(repair.verify_suggestions([fix]))
+    assert fix.verified and fix.verification_status == 200
+    assert repair.verification_stats["from_page_cache"] == 1
+
+
+def test_searches_keep_the_candidate_that_is_the_cited_paper():
+    import asyncio
+
+    arxiv_feed = """<feed><id>http://arxiv.org/api/query</id><title>ArXiv Query</title>
+      <entry><id>http://arxiv.org/abs/2101.00001v1</id>
+        <title>A Survey of Attention Mechanisms</title><author><name>Li Wei</name></author></entry>
+      <entry><id>http://arxiv.org/abs/1706.03762v7</id>
+        <title>Attention Is All
+          You Need</title><author><name>Ashish Vaswani</name></author>
+        <published>2017-06-12T00:00:00Z</published></entry></feed>"""
+    crossref = {"message": {"items": [
+        {"DOI": "10.1000/unrelated", "title": ["Transformers for Time Series"]},
+        {"DOI": "10.1000/other", "title": ["Attention Models in Graphs"]},
+    ]}}
+
+    class FakeClient:
+        def __init__(self):
+            self.params = []
+
+        async def fetch(self, api, url, params=None):
+            self.params.append(params)
+            return 200, arxiv_feed
+
+        async def fetch_json(self, api, url, params=None):
+            self.params.append(params)
+            return 200, crossref
+
+    client = FakeClient()
+    repair = cr.CitationRepair(client=client)
+    paper = {"title": "Attention is all you need", "authors": "Vaswani et al."}
+
+    found = asyncio.run(repair._search_arxiv(paper, "https://example.com/paper.pdf"))
+    assert found.suggested_url == "http://arxiv.org/abs/1706.03762v7"
+    assert found.notes.endswith("(title match 1.00)")
+    assert client.params[0]["max_results"] == str(repair.SEARCH_CANDIDATES)
+
+    # Neither CrossRef hit is the cited paper: no suggestion rather than the first one
+    assert asyncio.run(repair._search_crossref(paper, "https://example.com/paper.pdf")) is None
+    assert repair.index.lookup_url("https://doi.org/10.1000/unrelated") is not None
+
+
+def test_failed_lookups_are_not_cached_as_no_fix(tmp_path):
+    import asyncio
+
+    import aiohttp
+    from repair_cache import RepairCache
+    from wayback import WaybackError
+
+    async def nothing(paper_info, url, relevance=None):
+        return None
+
+    async def _search_crossref(paper_info, url, relevance=None):
+        raise aiohttp.ClientError("connection reset")
+
+    class WaybackDown:
+        stats = {"requests": 0, "cache_hits": 0}
+
+        async def closest(self, session, url, before=None):
+            raise WaybackError(f"CDX lookup failed for {url}")
+
+    def run(crossref):
+        repair = cr.CitationRepair(cache=RepairCache(tmp_path / "repairs.json"))
+        repair.wayback = WaybackDown()
+        repair._search_arxiv = nothing
+        repair._search_crossref = crossref
+        repair._search_semantic_scholar = nothing
+        repair._check_doi_resolution = nothing
+        repair._find_pmc_version = nothing
+        urls = ["https://dead.example/paper", "https://blog.example/gone"]
+        links = {"links": [{"url": urls[0], "type": "citation", "text": "paper"},
+                           {"url": urls[1], "type": "inline", "text": "post"}]}
+        validation = {"results": [{"url": u, "status": "broken", "issue_type": "404"} for u in urls]}
+        repairs = asyncio.run(repair.find_repairs(links, validation, {"results": []}))
+        repair.cache.save()
+        return repairs, repair
+
+    repairs, repair = run(_search_crossref)
+    assert repairs == [] and repair.stats["lookup_failed"] == 2
+    assert repair.strategy_report()["search_crossref"]["errors"] == 1
+
+    # Nothing was cached, so the next run searches again
+    _, repair = run(nothing)
+    assert repair.cache.stats["negative_hits"] == 0 and repair.cache.stats["misses"] == 2
+    assert repair.stats["lookup_failed"] == 1  # the archive is still down
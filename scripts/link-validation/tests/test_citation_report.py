@@ -0,0 +1,67 @@
+"""Tests for citation-report.py incremental reports and scripts/lib/git_changes.py."""
+
+import subprocess
+
+from conftest import load_script
+from git_changes import changed_files
+
+citation_report = load_script("citation-report.py")
+
+
+def _links(*posts):
+    return {"links": [{"url": f"https://{post}.example/{n}", "file_path": f"/src/posts/{post}.md",
+                       "line_number": n, "text": "paper"}
+                      for post, count in posts for n in range(1, count + 1)]}
+
+
+def _validation(links, status="broken"):
+    return {"results": [{"url": link["url"], "status": status, "issue_type": "404",
+                         "status_code": 404} for link in links["links"]]}
+
+
+def test_incremental_report_renders_changed_posts_with_global_totals(tmp_path):
+    cache = citation_report.SectionCache(tmp_path / "sections.json")
+    links = _links(("a", 2), ("b", 3), ("c", 1))
+    full = citation_report.generate_citation_report(_validation(links), links, section_cache=cache)
+    assert "## 📄 a.md" in full and "- **Total Broken Citation Links:** 6" in full
+
+    # b.md fixed one of its three links; only b.md is re-extracted and validated
+    changed = _links(("b", 2))
+    report = citation_report.generate_citation_report(
+        _validation(changed), changed, changed_posts=["src/posts/b.md"], section_cache=cache)
+
+    assert "## 📄 b.md (2 broken links)" in report
+    assert "## 📄 a.md" not in report and "## 📄 c.md" not in report
+    assert "including 2 unchanged post(s)" in report
+    assert "- **Total Posts with Broken Links:** 3" in report
+    assert "- **Total Broken Citation Links:** 5" in report
+
+
+def test_incremental_report_drops_a_fixed_post(tmp_path):
+    cache = citation_report.SectionCache(tmp_path / "sections.json")
+    links = _links(("a", 2), ("b", 1))
+    citation_report.generate_citation_report(_validation(links), links, section_cache=cache)
+
+    fixed = _links(("b", 1))
+    report = citation_report.generate_citation_report(
+        _validation(fixed, "valid"), fixed, changed_posts=["b.md"], section_cache=cache)
+
+    assert "✅ No broken citation links in the changed posts." in report
+    assert "- **Total Broken Citation Links:** 2" in report
+    assert set(cache.load()["broken"]) == {"a.md"}
+
+
+def test_changed_files_lists_posts_changed_since_a_revision(tmp_path):
+    def git(*args):
+        subprocess.run(("git", "-c", "user.name=t", "-c", "user.email=t@example.com") + args,
+                       cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / "a.md").write_text("one\n")
+    (tmp_path / "b.md").write_text("two\n")
+    git("add", ".")
+    git("commit", "-qm", "posts")
+    (tmp_path / "b.md").write_text("two, edited\n")
+    (tmp_path / "notes.txt").write_text("not a post\n")
+
+    assert changed_files("HEAD", cwd=tmp_path) == [tmp_path.resolve() / "b.md"]
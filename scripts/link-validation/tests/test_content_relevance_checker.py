@@ -0,0 +1,151 @@
+"""Tests for content-relevance-checker.py scoring over validator-cached pages."""
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from conftest import load_script
+from page_cache import PageCache
+
+rc = load_script("content-relevance-checker.py")
+
+KUBERNETES = """<html><head><title>Kubernetes Pod Security Standards</title>
+<script>var tracking = "kubernetes kubernetes";</script></head><body>
+<p>Pod Security Standards define three policies: privileged, baseline and restricted.
+The restricted policy enforces current pod hardening best practices for kubernetes
+clusters, dropping capabilities, running containers as non-root and requiring a
+seccomp profile. Namespaces opt in to pod security admission with labels.
+Cluster administrators apply the baseline policy to prevent known privilege
+escalations while keeping workloads running.</p></body></html>"""
+
+PARKED = """<html><head><title>example-domain.com is for sale</title></head><body>
+<p>This premium domain name is available for purchase. Make an offer today and our
+brokers will contact you. Secure checkout, escrow service, instant transfer of
+ownership, financing plans available. Buy now or lease to own this great name for
+your next business venture, startup brand or portfolio investment.</p></body></html>"""
+
+
+def _link(url, before, after, text="source"):
+    return {"url": url, "text": text, "context_before": before, "context_after": after,
+            "file_path": "src/posts/k8s.md", "line_number": 3}
+
+
+def test_relevant_page_kept_and_drifted_page_replaced(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put("https://kubernetes.example/pss", KUBERNETES)
+    cache.put("https://example-domain.com/guide", PARKED)
+    links = {"links": [
+        _link("https://kubernetes.example/pss",
+              "Kubernetes Pod Security Standards define restricted and baseline policies",
+              "so every namespace gets pod security admission labels",
+              text="Pod Security Standards"),
+        _link("https://example-domain.com/guide",
+              "The restricted kubernetes policy requires seccomp profiles and non-root containers",
+              "for hardened cluster workloads"),
+        _link("https://gone.example/", "anything about kubernetes pods", "here too"),
+        _link("https://uncached.example/", "kubernetes pod security seccomp", "policies"),
+    ]}
+    validation = {"results": [
+        {"url": "https://kubernetes.example/pss", "status": "valid"},
+        {"url": "https://example-domain.com/guide", "status": "valid"},
+        {"url": "https://gone.example/", "status": "broken"},
+        {"url": "https://uncached.example/", "status": "valid"},
+    ]}
+
+    checker = rc.RelevanceChecker(cache)
+    results = {r["url"]: r for r in checker.check(links, validation)}
+
+    assert results["https://kubernetes.example/pss"]["suggested_action"] == "keep"
+    assert results["https://kubernetes.example/pss"]["page_title"] == "Kubernetes Pod Security Standards"
+    assert results["https://example-domain.com/guide"]["suggested_action"] == "replace"
+    assert (results["https://kubernetes.example/pss"]["relevance_score"]
+            > results["https://example-domain.com/guide"]["relevance_score"])
+    assert results["https://gone.example/"]["reason"] == "not_live"
+    assert results["https://uncached.example/"]["reason"] == "no_cached_body"
+    assert checker.stats["pages_from_cache"] == 2
+    assert checker.stats["scored"] == 2 and checker.stats["unchecked"] == 2
+
+
+def _naive_cosine(contexts, pages, pair_page):
+    docs = contexts + pages
+    df = Counter(t for d in docs for t in set(d))
+    idf = {t: math.log((1 + len(docs)) / (1 + n)) + 1 for t, n in df.items()}
+
+    def vec(doc):
+        return {t: (1 + math.log(n)) * idf[t] for t, n in Counter(doc).items()}
+
+    scores = []
+    for ctx, p in zip(contexts, pair_page):
+        a, b = vec(ctx), vec(pages[p])
+        dot = sum(w * b.get(t, 0) for t, w in a.items())
+        norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+        scores.append(dot / norm if norm else 0.0)
+    return scores
+
+
+def test_vectorized_scores_match_naive_cosine():
+    contexts = [["pod", "security", "pod", "seccomp"], ["domain", "sale"], ["pod", "sale", "x9"]]
+    pages = [["pod", "security", "standards", "pod", "seccomp", "baseline"],
+             ["domain", "sale", "offer", "domain"]]
+    pair_page = [0, 1, 0]
+
+    vectorized = rc.cosine_scores(contexts, pages, pair_page)
+    assert vectorized == pytest.approx(_naive_cosine(contexts, pages, pair_page))
+
+
+def test_best_occurrence_decides_action(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put("https://kubernetes.example/pss", KUBERNETES)
+    links = {"links": [
+        _link("https://kubernetes.example/pss", "unrelated words about baking sourdough bread",
+              "with a long cold proof overnight"),
+        _link("https://kubernetes.example/pss", "pod security standards restricted baseline policy",
+              "applied with namespace admission labels"),
+    ]}
+    validation = {"results": [{"url": "https://kubernetes.example/pss", "status": "valid"}]}
+
+    (result,) = rc.RelevanceChecker(cache).check(links, validation)
+    assert result["occurrences"] == 2
+    assert result["suggested_action"] == "keep"
+
+
+def test_fetch_missing_reads_the_whole_page(tmp_path):
+    import asyncio
+
+    import aiohttp
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    page = ("<html><body>" + "<p>filler</p>" * 40_000
+            + "<p>kubernetes pod security seccomp</p></body></html>").encode()
+
+    async def long_page(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        await response.prepare(request)
+        for start in range(0, len(page), 50_000):
+            await response.write(page[start:start + 50_000])
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/long", long_page)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            url = str(server.make_url("/long"))
+            links = {"links": [_link(url, "kubernetes pod security", "seccomp")]}
+            validation = {"results": [{"url": url, "status": "valid"}]}
+            checker = rc.RelevanceChecker(PageCache(tmp_path), fetch_missing=True)
+            async with aiohttp.ClientSession() as session:
+                bodies = await checker.fetch_pages(links, validation, session=session)
+            checker.page_cache.close()
+            return url, bodies
+        finally:
+            await server.close()
+
+    url, bodies = asyncio.run(run())
+    assert bodies[url] == page.decode()
+    assert PageCache(tmp_path).get(url) == page.decode()
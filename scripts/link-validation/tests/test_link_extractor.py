@@ -56,3 +56,148 @@ def test_extraction_cleans_bare_url_punctuation(tmp_path):
     urls = [link.url for link in extractor.extract_all()]
     assert "https://arxiv.org/abs/2408.13687" in urls
     assert all(not u.endswith(")") for u in urls)
+
+
+def test_stream_yields_post_by_post_and_keeps_json_sink(tmp_path):
+    """The async stream hands out links per post and still fills self.links."""
+    import asyncio
+
+    (tmp_path / "a.md").write_text("https://a.example/one\n", encoding="utf-8")
+    (tmp_path / "b.md").write_text("https://b.example/two\n", encoding="utf-8")
+    extractor = le.LinkExtractor(tmp_path)
+
+    async def drain():
+        seen = []
+        async for link in extractor.stream():
+            # Only the posts extracted so far are on self.links.
+            seen.append((link.url, len(extractor.links)))
+        return seen
+
+    seen = asyncio.run(drain())
+    assert seen == [("https://a.example/one", 1), ("https://b.example/two", 2)]
+    assert extractor.stats["total_links"] == 2
+
+
+def test_write_ndjson_one_object_per_line(tmp_path):
+    import io
+    import json
+
+    (tmp_path / "post.md").write_text(
+        "See [paper](https://arxiv.org/abs/1234.5678) and https://example.com/raw\n",
+        encoding="utf-8",
+    )
+    out = io.StringIO()
+    written = le.LinkExtractor(tmp_path).write_ndjson(out)
+    lines = out.getvalue().splitlines()
+    assert written == len(lines) == 2
+    assert [json.loads(line)["url"] for line in lines] == [
+        "https://arxiv.org/abs/1234.5678", "https://example.com/raw",
+    ]
+
+
+def test_context_is_materialized_from_source_offsets(tmp_path):
+    """Slotted records keep only offsets; to_dict rebuilds the ±3-line context."""
+    post = tmp_path / "post.md"
+    post.write_text(
+        "one\ntwo\nthree\nfour\nSee https://example.com/x here\nfive\nsix\nseven\nhttps://example.com/y\n",
+        encoding="utf-8",
+    )
+    extractor = le.LinkExtractor(tmp_path)
+    link, other = extractor.extract_all()
+
+    assert not hasattr(link, "__dict__")
+    record = link.to_dict()
+    assert record["context_before"] == "two three four"
+    assert record["context_after"] == "five six seven"
+    assert link.file_path is other.file_path  # interned per post
+
+
+def test_save_results_matches_plain_json_dump(tmp_path):
+    import json
+
+    posts = tmp_path / "posts"
+    posts.mkdir()
+    (posts / "post.md").write_text("Read [docs](https://docs.example/a) now.\n", encoding="utf-8")
+    extractor = le.LinkExtractor(posts)
+    extractor.extract_all()
+    out = tmp_path / "links.json"
+    extractor.save_results(out)
+
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert out.read_text(encoding="utf-8") == json.dumps(data, indent=2)
+    assert data["links"][0]["url"] == "https://docs.example/a"
+
+    from occurrence_index import OccurrenceIndex
+
+    assert (tmp_path / "links.index.json").exists()
+    index = OccurrenceIndex.for_links_file(out)
+    assert index.occurrences("https://docs.example/a") == [
+        {"file_path": str(posts / "post.md"), "line_number": 1, "position": 5}
+    ]
+    assert index.context("https://docs.example/a")["text"] == "docs"
+
+    empty = le.LinkExtractor(tmp_path / "nothing")
+    empty.save_results(out)
+    assert json.loads(out.read_text(encoding="utf-8"))["links"] == []
+
+
+def _write_site(root):
+    footer = '<footer><a href="https://github.com/williamzujkowski">GitHub</a></footer>'
+    (root / "posts" / "a").mkdir(parents=True)
+    (root / "index.html").write_text(
+        '<html><head><meta property="og:image" content="https://williamzujkowski.github.io/og/home.png">'
+        '<script src="/_astro/hoisted.js"></script></head><body>'
+        f'<a href="posts/a/">First <em>post</em></a>{footer}</body></html>',
+        encoding="utf-8",
+    )
+    (root / "posts" / "a" / "index.html").write_text(
+        '<html><body><a href="#setup">Setup</a><img src="../../img/x.png" alt="diagram">'
+        f'<a href="mailto:me@example.com">Mail</a>{footer}</body></html>',
+        encoding="utf-8",
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_site_dir_extraction_dedupes_shared_layout_links(tmp_path, workers):
+    _write_site(tmp_path)
+    extractor = le.HtmlLinkExtractor(tmp_path, workers=workers)
+    links = {link.url: link for link in extractor.extract_all()}
+
+    assert set(links) == {
+        "https://williamzujkowski.github.io/og/home.png",
+        "/posts/a/",
+        "https://github.com/williamzujkowski",
+        "/posts/a/#setup",
+        "/img/x.png",
+    }
+    assert extractor.stats["duplicates_skipped"] == 1  # footer link on the second page
+    assert links["/posts/a/"].text == "First post"
+    assert links["/img/x.png"].text == "diagram"
+    assert links["/posts/a/"].to_dict()["context_before"] == ""
+
+
+def test_since_extracts_only_links_on_changed_lines(tmp_path):
+    """--since: only posts in the diff, and only the links on added/changed lines."""
+    import subprocess
+    from git_changes import changed_lines
+
+    def git(*args):
+        subprocess.run(("git", "-c", "user.name=t", "-c", "user.email=t@example.com") + args,
+                       cwd=tmp_path, check=True, capture_output=True)
+
+    (tmp_path / "a.md").write_text("[old](https://a.example/old)\n\nSee https://a.example/kept\n")
+    (tmp_path / "b.md").write_text("[b](https://b.example/)\n")
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-qm", "posts")
+    (tmp_path / "a.md").write_text("[new](https://a.example/new)\n\nSee https://a.example/kept\n"
+                                   "Also https://a.example/added\n")
+
+    changed = changed_lines("HEAD", cwd=tmp_path)
+    assert changed == {tmp_path.resolve() / "a.md": {1, 4}}
+
+    extractor = le.LinkExtractor(tmp_path, changed_lines=changed)
+    links = extractor.extract_all()
+    assert [(link.url, link.line_number) for link in links] == [
+        ("https://a.example/new", 1), ("https://a.example/added", 4)]
+    assert extractor.stats["total_files"] == 1
@@ -0,0 +1,130 @@
+"""Tests for scripts/lib/link_pipeline.py against a local stand-in site."""
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from link_pipeline import LinkPipeline, load_stage
+from page_cache import PageCache
+
+PAGE = """<html><head><title>Container Hardening Guide</title></head><body>
+<p>Harden container images by running as a non-root user, dropping Linux
+capabilities, applying seccomp profiles and scanning images for known
+vulnerabilities before deployment. Pin base image digests, rebuild often, and
+keep the runtime read-only so a compromised process cannot persist changes to
+the container filesystem or escalate its privileges on the host.</p></body></html>"""
+
+
+def test_pipeline_runs_stages_in_process_and_writes_optional_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(load_stage("link-validator.py").LinkValidator, "DOMAIN_INTERVAL", 0)
+    hits = []
+
+    async def guide(request):
+        hits.append(request.path)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/guide", guide)
+        server = TestServer(app)
+        await server.start_server()
+        url = str(server.make_url("/guide"))
+        posts = tmp_path / "posts"
+        posts.mkdir()
+        (posts / "2024-01-01-hardening.md").write_text(
+            "Running containers as a non-root user with seccomp profiles\n"
+            "and dropped Linux capabilities is the baseline.\n"
+            f"See the [container hardening guide]({url}).\n"
+            "Scan images for vulnerabilities and keep the filesystem read-only.\n",
+            encoding="utf-8")
+        pipeline = LinkPipeline(posts, reports_dir=tmp_path / "reports",
+                                artifacts_dir=tmp_path / "artifacts",
+                                page_cache=PageCache(tmp_path / "pages"),
+                                cache_dir=tmp_path / "cache")
+        try:
+            data = await pipeline.run()
+        finally:
+            await server.close()
+        return pipeline, data, url
+
+    pipeline, data, url = asyncio.run(run())
+
+    assert [t.name for t in pipeline.timings] == ["extract", "validate", "relevance", "repair", "report"]
+    assert all(t.status == "ok" and t.seconds >= 0 and t.peak_mb >= 0 for t in pipeline.timings)
+    assert hits == ["/guide"]  # relevance and reports reuse the validator's copy
+    assert data["validate"]["results"][0]["status"] == "valid"
+    (scored,) = data["relevance"]["results"]
+    assert scored["url"] == url and scored["suggested_action"] == "keep"
+    assert data["repair"]["repairs"] == []
+
+    written = json.loads((tmp_path / "artifacts" / "relevance.json").read_text(encoding="utf-8"))
+    assert written["results"] == data["relevance"]["results"]
+    assert (tmp_path / "reports" / "summary.md").exists()
+
+
+def test_unchanged_stages_are_reused_and_changes_rerun_downstream(tmp_path, monkeypatch):
+    monkeypatch.setattr(load_stage("link-validator.py").LinkValidator, "DOMAIN_INTERVAL", 0)
+    hits = []
+
+    async def guide(request):
+        hits.append(request.path)
+        return web.Response(text=PAGE, content_type="text/html")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/guide", guide)
+        server = TestServer(app)
+        await server.start_server()
+        post = tmp_path / "posts" / "2024-01-01-hardening.md"
+        post.parent.mkdir()
+        post.write_text(f"See the [hardening guide]({server.make_url('/guide')}).\n", encoding="utf-8")
+
+        async def once(**kwargs):
+            pipeline = LinkPipeline(post.parent, reports_dir=tmp_path / "reports",
+                                    page_cache=PageCache(tmp_path / "pages"),
+                                    cache_dir=tmp_path / "cache", **kwargs)
+            await pipeline.run()
+            return {t.name: t.status for t in pipeline.timings}, pipeline.saved_seconds
+
+        try:
+            first, _ = await once()
+            second, saved = await once()
+            (tmp_path / "reports" / "summary.md").unlink()
+            reports_gone, _ = await once()
+            post.write_text(post.read_text(encoding="utf-8")
+                            + f"[Again]({server.make_url('/guide?ref=2')})\n", encoding="utf-8")
+            edited, _ = await once(reuse=True)
+            forced, _ = await once(reuse=False)
+        finally:
+            await server.close()
+        return first, second, saved, reports_gone, edited, forced
+
+    first, second, saved, reports_gone, edited, forced = asyncio.run(run())
+
+    assert set(first.values()) == {"ok"}
+    assert set(second.values()) == {"reused"} and saved > 0
+    assert reports_gone == {"extract": "reused", "validate": "reused", "relevance": "reused",
+                            "repair": "reused", "report": "ok"}
+    assert edited["extract"] == "ok" and edited["validate"] == "ok"
+    assert "reused" not in forced.values()
+    assert len(hits) == 5  # not on the reused run: 1 first, then 2 after the edit and 2 forced
+
+
+def test_fingerprint_covers_the_lib_modules(tmp_path, monkeypatch):
+    import link_pipeline
+
+    lib = tmp_path / "lib"
+    lib.mkdir()
+    (lib / "site_routes.py").write_text("ROUTES = 1\n", encoding="utf-8")
+    monkeypatch.setattr(link_pipeline, "LIB_DIR", lib)
+    (tmp_path / "posts").mkdir()
+
+    def extract_fingerprint():
+        return LinkPipeline(tmp_path / "posts", page_cache=PageCache(tmp_path / "pages"),
+                            cache_dir=tmp_path / "cache").fingerprint("extract")
+
+    before = extract_fingerprint()
+    assert extract_fingerprint() == before
+    (lib / "site_routes.py").write_text("ROUTES = 2\n", encoding="utf-8")
+    assert extract_fingerprint() != before
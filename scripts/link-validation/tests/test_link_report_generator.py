@@ -0,0 +1,108 @@
+"""Tests for link-report-generator.py: one streamed join, every report rendered from it."""
+
+import csv
+import json
+
+from conftest import load_script
+
+lrg = load_script("link-report-generator.py")
+
+
+def _inputs():
+    links = {"links": [
+        {"url": "https://a.example/ok", "file_path": "/posts/one.md", "line_number": 3,
+         "text": "ok", "type": "citation", "context_before": "before ok"},
+        {"url": "https://b.example/dead", "file_path": "/posts/one.md", "line_number": 9,
+         "text": "dead", "type": "citation", "context_before": "before dead"},
+        {"url": "https://b.example/dead", "file_path": "/posts/two.md", "line_number": 1,
+         "text": "dead again", "type": "citation", "context_before": ""},
+        {"url": "https://c.example/moved", "file_path": "/posts/two.md", "line_number": 4,
+         "text": "moved", "type": "resource", "context_before": ""},
+    ]}
+    validation = {"results": [
+        {"url": "https://a.example/ok", "status": "valid", "issue_type": None, "status_code": 200},
+        {"url": "https://b.example/dead", "status": "broken", "issue_type": "404", "status_code": 404},
+        {"url": "https://c.example/moved", "status": "broken", "issue_type": "404", "status_code": 404},
+    ]}
+    relevance = {"results": [
+        {"url": "https://a.example/ok", "relevance_score": 0.04, "suggested_action": "review",
+         "page_title": "A page"},
+    ]}
+    repairs = {"repairs": [
+        {"original_url": "https://c.example/moved", "suggested_url": "https://c.example/new",
+         "confidence": 95, "notes": "redirect", "source": "redirect"},
+    ]}
+    return links, validation, relevance, repairs
+
+
+def test_join_yields_rows_and_tallies_aggregates_in_one_pass():
+    table = lrg.LinkTable.join(*_inputs())
+
+    rows = list(table)
+    assert [row["priority"] for row in rows] == ["medium", "critical", "critical", None]
+    assert [row["suggested_url"] for row in rows] == [None, None, None, "https://c.example/new"]
+    assert set(rows[0]) == set(lrg.LinkTable.COLUMNS)
+    stats = table.stats
+    assert (stats["valid"], stats["broken"], stats["no_fix"], stats["auto_fixable"]) == (1, 3, 2, 1)
+    assert dict(stats["by_issue"]) == {None: 1, "404": 3}
+    assert stats["by_file"]["/posts/two.md"] == {"total": 2, "broken": 2}
+    assert table.repair_bands == {"high": 1, "medium": 0, "low": 0}
+
+
+def test_all_reports_render_from_the_table(tmp_path):
+    table = lrg.ReportGenerator().generate_all_reports(*_inputs(), tmp_path)
+
+    assert table.stats["total_links"] == 4
+    summary = (tmp_path / "summary.md").read_text(encoding="utf-8")
+    assert "- **Broken Links:** 3 (75.0%)" in summary
+    assert "| b.example | 2 | 2 |" in summary
+
+    with open(tmp_path / "detailed_report.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Repair Available"] for row in rows] == ["No", "No", "No", "Yes"]
+    assert rows[0]["Issue Type"] == "" and rows[1]["HTTP Status"] == "404"
+
+    review = (tmp_path / "manual_review.md").read_text(encoding="utf-8")
+    assert "## Critical Priority (2 items)" in review
+    assert "- **Page Title:** A page" in review
+
+    plan = (tmp_path / "action_plan.md").read_text(encoding="utf-8")
+    assert "## Phase 1: Automatic Fixes (1 links)" in plan
+
+
+def test_review_queue_keeps_only_the_listed_items(tmp_path, monkeypatch):
+    monkeypatch.setattr(lrg.ReviewQueueWriter, "MAX_ITEMS", 1)
+    lrg.ReportGenerator().generate_all_reports(*_inputs(), tmp_path)
+
+    review = (tmp_path / "manual_review.md").read_text(encoding="utf-8")
+    assert "## Critical Priority (2 items)" in review
+    assert "### one.md:9" in review and "### two.md:1" not in review
+
+
+def test_links_stream_from_ndjson(tmp_path):
+    links, validation, relevance, repairs = _inputs()
+    ndjson = tmp_path / "links.ndjson"
+    ndjson.write_text("".join(json.dumps(link) + "\n" for link in links["links"]), encoding="utf-8")
+    streamed = lrg.ReportGenerator().generate_all_reports(
+        lrg.iter_links(ndjson), validation, relevance, repairs, tmp_path / "ndjson")
+    loaded = lrg.ReportGenerator().generate_all_reports(
+        links, validation, relevance, repairs, tmp_path / "json")
+
+    assert streamed.stats == loaded.stats
+    csv_name = "detailed_report.csv"
+    assert (tmp_path / "ndjson" / csv_name).read_bytes() == (tmp_path / "json" / csv_name).read_bytes()
+
+
+def test_summary_gains_trend_sections_with_history(tmp_path):
+    from validation_history import ValidationHistory
+
+    history = ValidationHistory(tmp_path / "history.sqlite")
+    links, validation, relevance, repairs = _inputs()
+    for day in (1, 2):
+        validation["validation_date"] = f"2026-01-0{day}T00:00:00"
+        lrg.ReportGenerator(history=history).generate_all_reports(
+            links, validation, relevance, repairs, tmp_path / "reports")
+
+    summary = (tmp_path / "reports" / "summary.md").read_text(encoding="utf-8")
+    assert "## Trend (last 2 runs)" in summary and "## Flapping Links" in summary
+    history.close()
@@ -80,3 +80,101 @@ def test_matches_simple_validator_taxonomy():
         a = classify(code)[0]
         b = sv.SimpleValidator.classify_status(code)[0]
         assert (a == "broken") == (b == "broken"), f"disagree on {code}: {a} vs {b}"
+
+
+def test_validate_stream_starts_before_source_is_drained():
+    """Validation of early links overlaps with a still-running producer, and
+    repeat URLs reuse the in-flight result instead of fetching again."""
+    import asyncio
+
+    validator = lv.LinkValidator()
+    validator.DOMAIN_INTERVAL = 0
+    fetched = []
+
+    async def fake_validate_link(url):
+        fetched.append(url)
+        return url
+
+    validator.validate_link = fake_validate_link
+
+    async def source():
+        yield {"url": "https://a.example/1"}
+        await asyncio.sleep(0.01)
+        # The first URL was validated while the producer was still "extracting".
+        assert fetched == ["https://a.example/1"]
+        yield {"url": "https://b.example/2"}
+        yield {"url": "https://a.example/1"}
+
+    results = asyncio.run(validator.validate_stream(source()))
+    assert results == ["https://a.example/1", "https://b.example/2", "https://a.example/1"]
+    assert fetched == ["https://a.example/1", "https://b.example/2"]
+    assert validator.stats["cached"] == 1
+
+
+def test_since_validates_changed_links_and_serves_cached_results(tmp_path):
+    """--since: links on changed lines and unseen URLs are validated; every
+    other URL gets its stored result, counted in stats like a fresh one."""
+    from result_cache import ResultCache, plan_incremental
+
+    post = tmp_path / "post.md"
+    links = [
+        {"url": "https://a.example/new", "file_path": str(post), "line_number": 3},
+        {"url": "https://b.example/old", "file_path": str(post), "line_number": 9},
+        {"url": "https://b.example/old", "file_path": str(post), "line_number": 12},
+        {"url": "https://c.example/unseen", "file_path": str(post), "line_number": 20},
+    ]
+    cache = ResultCache(tmp_path / "results.json")
+    cache.update([{"url": "https://b.example/old", "status": "broken", "status_code": 404,
+                   "issue_type": "404"}])
+    cache.save()
+
+    to_validate, cached = plan_incremental(links, {post.resolve(): {3}},
+                                           ResultCache(tmp_path / "results.json"))
+    assert [link["url"] for link in to_validate] == ["https://a.example/new",
+                                                     "https://c.example/unseen"]
+
+    validator = lv.LinkValidator()
+    results = validator.serve_cached(cached)
+    assert [(r.url, r.status) for r in results] == [("https://b.example/old", "broken")]
+    assert validator.stats["broken"] == validator.stats["from_result_cache"] == 1
+    assert validator.stats["cached"] == 0
+
+
+def test_http_body_is_read_past_the_first_chunk(tmp_path):
+    import asyncio
+
+    import aiohttp
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from page_cache import PageCache
+
+    page = ("<html><head><title>Long read</title></head><body>"
+            + "<p>paragraph</p>" * 60_000 + '<h2 id="end">End</h2></body></html>').encode()
+
+    async def long_page(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/html; charset=utf-8"})
+        await response.prepare(request)
+        for start in range(0, len(page), 50_000):
+            await response.write(page[start:start + 50_000])
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/long", long_page)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            validator = lv.LinkValidator(check_anchors=True, page_cache=PageCache(tmp_path))
+            async with aiohttp.ClientSession() as validator.session:
+                url = str(server.make_url("/long"))
+                return url, validator, await validator._validate_http(url, 0)
+        finally:
+            await server.close()
+
+    url, validator, result = asyncio.run(run())
+    assert result.status == "valid" and result.page_title == "Long read"
+    assert "end" in validator.anchor_index[url]
+    assert validator.page_cache.get(url) == page.decode()
@@ -0,0 +1,80 @@
+"""Tests for scripts/lib/page_cache.py, the body store shared by pipeline stages."""
+import gzip
+
+from page_cache import PageCache, canonical_url, page_title
+
+PAGE = "<html><head><title>Guide &amp; Notes</title></head><body>" + "content " * 500 + "</body></html>"
+
+
+def test_bodies_are_compressed_and_stored_once_per_hash(tmp_path):
+    cache = PageCache(tmp_path)
+    digest = cache.put("https://a.example/guide", PAGE)
+    assert cache.put("https://mirror.example/guide", PAGE) == digest
+
+    blobs = list((tmp_path / "blobs").rglob("*.gz"))
+    assert len(blobs) == 1 and len(cache) == 1
+    assert blobs[0].stat().st_size < len(PAGE) / 10
+    assert gzip.decompress(blobs[0].read_bytes()).decode() == PAGE
+    assert cache.get("https://mirror.example/guide") == PAGE
+    assert cache.stats["stored"] == 1 and cache.stats["deduplicated"] == 1
+
+
+def test_keys_are_canonical_and_latest_fetch_wins(tmp_path):
+    assert canonical_url("HTTPS://Docs.Example:443#intro") == "https://docs.example/"
+    assert canonical_url("http://docs.example:8080/a?b=1") == "http://docs.example:8080/a?b=1"
+
+    cache = PageCache(tmp_path)
+    cache.put("https://docs.example/a", "old", fetched_at=1000.0)
+    cache.put("https://DOCS.example/a#top", "new", fetched_at=2000.0)
+    assert cache.get("https://docs.example/a") == "new"
+    assert cache.latest("https://docs.example/a")["fetched_at"] == 2000.0
+    assert cache.get("https://docs.example/a", max_age=60) is None  # fetched long ago
+
+    for i in range(PageCache.MAX_VERSIONS + 2):
+        cache.put("https://docs.example/a", f"v{i}", fetched_at=3000.0 + i)
+    assert len(cache) == PageCache.MAX_VERSIONS  # old versions' bodies dropped
+
+
+def test_least_recently_used_bodies_are_evicted(tmp_path):
+    import os
+
+    bodies = {name: os.urandom(3000).hex() for name in "abc"}  # incompressible
+    cache = PageCache(tmp_path, max_bytes=10_000)
+    cache.put("https://x.example/a", bodies["a"])
+    cache.put("https://x.example/b", bodies["b"])
+    cache.get("https://x.example/a")  # a is now more recent than b
+    cache.put("https://x.example/c", bodies["c"])
+
+    assert cache.get("https://x.example/b") is None
+    assert cache.get("https://x.example/a") == bodies["a"]
+    assert cache.get("https://x.example/c") == bodies["c"]
+    assert cache.stats["evicted"] == 1
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 2
+
+
+def test_readers_do_not_create_a_store(tmp_path):
+    cache = PageCache(tmp_path / "pages")
+    assert cache.get("https://a.example/") is None
+    assert not (tmp_path / "pages").exists()
+    assert page_title(PAGE) == "Guide & Notes"
+
+
+def test_puts_check_only_the_bodies_they_displace_and_commit_in_batches(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put("https://docs.example/warm", "warm")
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+
+    for i in range(PageCache.MAX_VERSIONS + 2):
+        cache.put("https://docs.example/a", f"v{i}", fetched_at=1000.0 + i)
+    cache.put("https://docs.example/a", "late backfill", fetched_at=1.0)  # trimmed at once
+
+    assert not any("NOT IN (SELECT body_hash" in sql for sql in statements)
+    assert "COMMIT" not in statements
+    assert len(cache) == PageCache.MAX_VERSIONS + 1  # warm plus the kept versions
+    cache.close()
+
+    reopened = PageCache(tmp_path)
+    assert reopened.get("https://docs.example/a") == f"v{PageCache.MAX_VERSIONS + 1}"
+    assert len(reopened) == PageCache.MAX_VERSIONS + 1
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == PageCache.MAX_VERSIONS + 1
@@ -0,0 +1,67 @@
+"""Tests for scripts/lib/scholarly_client.py against a local API stand-in."""
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from scholarly_client import ScholarlyClient, TokenBucket, query_key
+
+
+def test_query_key_ignores_order_case_and_whitespace():
+    a = query_key("crossref", "https://api.example/works", {"query": "Deep  Learning", "rows": "1"})
+    b = query_key("crossref", "https://api.example/works/", {"rows": "1", "query": "deep learning"})
+    assert a == b
+    assert a != query_key("arxiv", "https://api.example/works", {"query": "deep learning", "rows": "1"})
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        waits = [await bucket.acquire() for _ in range(4)]
+        return waits, time.monotonic() - start
+
+    waits, elapsed = asyncio.run(run())
+    assert waits[:2] == [0.0, 0.0]
+    assert elapsed >= 0.09  # two extra tokens at 20/s
+
+
+async def _serve(body, handler):
+    app = web.Application()
+    app.router.add_get("/works", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        return await body(str(server.make_url("/works")))
+    finally:
+        await server.close()
+
+
+def test_cache_hits_and_retry_after(tmp_path):
+    hits = []
+
+    async def handler(request):
+        hits.append(dict(request.query))
+        if len(hits) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0"})
+        return web.json_response({"message": {"items": [{"DOI": "10.1/x"}]}})
+
+    async def body(url):
+        client = ScholarlyClient(cache_dir=tmp_path, rate_limits={"crossref": (100, 5)})
+        await client.open()
+        try:
+            first = await asyncio.gather(
+                client.fetch_json("crossref", url, {"query": "A Title", "rows": "1"}),
+                client.fetch_json("crossref", url, {"query": "a  title", "rows": "1"}),
+            )
+            again = await client.fetch_json("crossref", url, {"rows": "1", "query": "A TITLE"})
+        finally:
+            await client.close()
+        return first, again, client.stats
+
+    (first, again, stats) = asyncio.run(_serve(body, handler))
+
+    assert first[0] == first[1] == again == (200, {"message": {"items": [{"DOI": "10.1/x"}]}})
+    assert len(hits) == 2  # one 429, one retry; the duplicate shared the request
+    assert stats["requests"] == 2 and stats["retries"] == 1 and stats["cache_hits"] == 1
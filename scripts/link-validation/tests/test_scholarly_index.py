@@ -0,0 +1,47 @@
+"""Tests for scripts/lib/scholarly_index.py and its use in citation-repair.py."""
+import asyncio
+
+from conftest import load_script
+from scholarly_index import ScholarlyIndex, arxiv_id, normalize_doi
+
+cr = load_script("citation-repair.py")
+
+TITLE = "Attention Is All You Need For Link Repair"
+
+
+def test_identifier_parsing():
+    assert normalize_doi("https://doi.org/10.1145/3379597.3387457).") == "10.1145/3379597.3387457"
+    assert arxiv_id("https://arxiv.org/pdf/1706.03762v7") == "1706.03762"
+    assert arxiv_id("10.48550/arXiv.1706.03762") == "1706.03762"
+
+
+def test_preprint_and_journal_doi_merge_into_one_work():
+    index = ScholarlyIndex()
+    index.record(arxiv="1706.03762v2", title=TITLE, authors=["A. Vaswani"],
+                 url="http://arxiv.org/abs/1706.03762v2", source="arXiv")
+    index.record(doi="10.5555/3295222.3295349", title=TITLE + ".", year=2017, source="CrossRef")
+
+    assert index.same_work("https://arxiv.org/abs/1706.03762",
+                           "https://doi.org/10.5555/3295222.3295349") is True
+    assert index.same_work("https://arxiv.org/abs/1706.03762", "https://example.com/x") is None
+    work = index.lookup_title(TITLE.lower(), need="doi")
+    assert work["arxiv_id"] == "1706.03762" and work["authors"] == ["A. Vaswani"]
+
+
+def test_citation_repair_answers_from_the_index_before_calling_apis(tmp_path):
+    index = ScholarlyIndex(tmp_path / "scholarly.sqlite")
+    index.record(doi="10.1145/3379597", title=TITLE, authors=["Ada Lovelace"], year=2020,
+                 url="https://dl.acm.org/doi/10.1145/3379597", source="CrossRef")
+    index.close()
+
+    repair = cr.CitationRepair(index=ScholarlyIndex(tmp_path / "scholarly.sqlite"))
+    info = repair._extract_paper_info("no quoted title here", "https://dl.acm.org/doi/10.1145/3379597")
+    assert info["title"] == TITLE and info["authors"] == "Ada Lovelace"
+
+    # No session: only the index can produce this suggestion
+    suggestion = asyncio.run(repair._search_crossref(info, "https://dead.example/paper"))
+    assert suggestion.suggested_url == "https://doi.org/10.1145/3379597"
+    assert repair._same_live_target("https://dl.acm.org/doi/10.1145/3379597",
+                                    "https://doi.org/10.1145/3379597")
+    doi_fix = asyncio.run(repair._check_doi_resolution(info, "https://dl.acm.org/doi/10.1145/3379597"))
+    assert "registered with CrossRef" in doi_fix.notes
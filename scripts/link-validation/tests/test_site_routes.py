@@ -0,0 +1,138 @@
+"""Tests for offline resolution of links to this site (scripts/lib/site_routes.py)."""
+import asyncio
+
+import pytest
+
+from conftest import load_script
+from site_routes import SiteRoutes
+
+
+@pytest.fixture
+def routes(tmp_path):
+    posts = tmp_path / "src" / "posts"
+    posts.mkdir(parents=True)
+    (posts / "2025-01-01-live-post.md").write_text(
+        "---\ntitle: Live\ntags:\n  - homelab\n  - security\n---\nBody\n", encoding="utf-8"
+    )
+    (posts / "2025-02-01-draft-post.md").write_text(
+        "---\ntitle: Draft\ndraft: true\ntags: [unreleased]\n---\nBody\n", encoding="utf-8"
+    )
+    pages = tmp_path / "astro-site" / "src" / "pages"
+    for page in ("index.astro", "about.astro", "feed.xml.ts", "posts/index.astro",
+                 "posts/[...slug].astro", "tags/[tag].astro", "og/[slug].png.ts"):
+        (pages / page).parent.mkdir(parents=True, exist_ok=True)
+        (pages / page).write_text("", encoding="utf-8")
+    asset = tmp_path / "astro-site" / "public" / "assets" / "doodles" / "ebpf.png"
+    asset.parent.mkdir(parents=True)
+    asset.write_bytes(b"")
+    return SiteRoutes(repo_root=tmp_path)
+
+
+@pytest.mark.parametrize("url", [
+    "/posts/2025-01-01-live-post",
+    "/posts/2025-01-01-live-post/",
+    "/posts/2025-01-01-live-post#section",
+    "https://williamzujkowski.github.io/posts/2025-01-01-live-post/",
+    "/about/",
+    "/",
+    "/feed.xml",
+    "/tags/homelab",
+    "/og/2025-01-01-live-post.png",
+    "/assets/doodles/ebpf.png",
+])
+def test_existing_internal_links_resolve(routes, url):
+    assert routes.is_internal(url)
+    assert routes.exists(url)
+
+
+@pytest.mark.parametrize("url", [
+    "/posts/2025-02-01-draft-post",   # drafts are never published
+    "/posts/2024-12-31-typo-slug",
+    "/tags/unreleased",
+    "/assets/doodles/missing.png",
+])
+def test_missing_internal_links_do_not_resolve(routes, url):
+    assert routes.is_internal(url)
+    assert not routes.exists(url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/posts/2025-01-01-live-post",
+    "https://github.com/williamzujkowski/williamzujkowski.github.io",
+    "//cdn.example.com/x.js",
+    # Another repo's project site on the same user-site host.
+    "https://williamzujkowski.github.io/remarque/",
+])
+def test_external_links_are_left_to_http(routes, url):
+    assert not routes.is_internal(url)
+
+
+def test_validator_resolves_internal_links_without_a_session(routes):
+    lv = load_script("link-validator.py")
+    validator = lv.LinkValidator()
+    validator.site_routes = routes  # no session: any HTTP attempt would raise
+
+    ok = asyncio.run(validator.validate_link("/posts/2025-01-01-live-post"))
+    missing = asyncio.run(validator.validate_link("/posts/nope"))
+
+    assert (ok.status, ok.status_code) == ("valid", 200)
+    assert (missing.status, missing.issue_type) == ("broken", "404")
+    assert validator.stats["valid"] == validator.stats["broken"] == 1
+
+
+def test_heading_ids_follow_github_slugger():
+    from site_routes import heading_ids
+
+    ids = heading_ids(
+        "## Output Encoding: Preventing XSS\n"
+        "## Setup\n"
+        "```bash\n# not a heading\n```\n"
+        "### Setup\n"
+        "## [Linked](https://example.com) `code` **bold**\n"
+        'Text with <span id="raw-anchor">html</span>.\n'
+    )
+    assert ids == {
+        "output-encoding-preventing-xss",
+        "setup",
+        "setup-1",
+        "linked-code-bold",
+        "raw-anchor",
+    }
+
+
+def test_anchor_validation_uses_one_index_per_document(routes):
+    """Internal anchors are set lookups; each external page is fetched once."""
+    (routes.posts_dir / "2025-01-01-live-post.md").write_text(
+        "---\ntitle: Live\n---\n## Getting Started\n", encoding="utf-8"
+    )
+    lv = load_script("link-validator.py")
+    validator = lv.LinkValidator(check_anchors=True)
+    validator.site_routes = routes
+    fetched = []
+    resolve_internal = validator._resolve
+
+    async def fake_resolve(url):
+        if routes.is_internal(url):
+            return await resolve_internal(url)
+        fetched.append(url)
+        validator.anchor_index[url] = {"install"}
+        return lv.ValidationResult(url, "valid", 200, None, None, None, 0.0, "text/html",
+                                   None, False, True, "", 1)
+
+    validator._resolve = fake_resolve
+
+    async def run():
+        return await asyncio.gather(
+            validator.validate_link("/posts/2025-01-01-live-post#getting-started"),
+            validator.validate_link("/posts/2025-01-01-live-post#no-such-heading"),
+            validator.validate_link("https://docs.example/guide#install"),
+            validator.validate_link("https://docs.example/guide#uninstall"),
+        )
+
+    ok, missing, ext_ok, ext_missing = asyncio.run(run())
+    assert ok.status == "valid"
+    assert (missing.status, missing.issue_type) == ("broken", "missing_anchor")
+    assert ext_ok.status == "valid"
+    # External ids may be injected by JavaScript: advisory, never 'broken'.
+    assert (ext_missing.status, ext_missing.issue_type) == ("restricted", "missing_anchor")
+    assert fetched == ["https://docs.example/guide"]
@@ -0,0 +1,37 @@
+"""Tests for scripts/lib/title_match.py candidate scoring."""
+import pytest
+
+import title_match
+from title_match import TrigramIndex, best_match, surnames
+
+CANDIDATES = [
+    {"title": "A Survey of Attention Mechanisms in Deep Learning", "authors": ["Li Wei"]},
+    {"title": "Attention is All you Need", "authors": ["Ashish Vaswani", "Noam Shazeer"]},
+    {"title": "Attention Is All You Need In Speech Separation", "authors": ["Cem Subakan"]},
+]
+
+
+def test_exact_work_beats_first_and_near_miss_hits():
+    position, score = best_match("Attention Is All You Need", "Vaswani et al.", CANDIDATES)
+    assert position == 1 and score == pytest.approx(1.0)
+
+
+def test_unrelated_candidates_are_rejected():
+    assert best_match("Memory-Safe Parsers in Practice", None, CANDIDATES) is None
+    assert best_match("anything", None, []) is None
+
+
+def test_authors_break_ties_between_similar_titles():
+    candidates = [
+        {"title": "Deep Residual Learning", "authors": ["Someone Else"]},
+        {"title": "Deep Residual Learning.", "authors": ["Kaiming He", "Xiangyu Zhang"]},
+    ]
+    assert best_match("Deep residual learning", "He and Zhang", candidates)[0] == 1
+    assert surnames(["Lovelace, A.", "Grace Hopper", "Smith et al."]) == {"lovelace", "hopper", "smith"}
+
+
+def test_vectorized_scores_match_set_arithmetic(monkeypatch):
+    titles = [c["title"] for c in CANDIDATES] + [""]
+    vectorized = TrigramIndex(titles).scores("attention is all you need!")
+    monkeypatch.setattr(title_match, "NUMPY_AVAILABLE", False)
+    assert vectorized == pytest.approx(TrigramIndex(titles).scores("attention is all you need!"))
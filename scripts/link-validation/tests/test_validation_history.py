@@ -0,0 +1,86 @@
+"""Tests for scripts/lib/validation_history.py and the report sections built on it."""
+
+from conftest import load_script
+from validation_history import ValidationHistory, history_sections
+
+citation_report = load_script("citation-report.py")
+
+
+def _run(day, statuses):
+    return {
+        "validation_date": f"2026-01-{day:02d}T06:00:00",
+        "results": [{"url": url, "status": status, "status_code": 404 if status == "broken" else 200}
+                    for url, status in statuses.items()],
+    }
+
+
+def _history(tmp_path):
+    history = ValidationHistory(tmp_path / "history.sqlite")
+    flaky = ["valid", "broken", "valid", "broken"]
+    for day, flaky_status in enumerate(flaky, 1):
+        history.record(_run(day, {
+            "https://flaky.example/a": flaky_status,
+            "https://dead.example/x": "broken",
+            "https://fine.example/": "valid",
+        }))
+    return history
+
+
+def test_record_is_idempotent_per_run_and_suite(tmp_path):
+    history = ValidationHistory(tmp_path / "history.sqlite")
+    run = _run(1, {"https://a.example/": "valid"})
+
+    first = history.record(run)
+    assert history.record(run) == first
+    assert history.record(run, suite="citations") != first
+    assert len(history.trend()) == 1 and len(history.trend("citations")) == 1
+    history.close()
+
+
+def test_trend_flapping_and_hosts(tmp_path):
+    history = _history(tmp_path)
+
+    trend = history.trend()
+    assert [run["broken"] for run in trend] == [1, 2, 1, 2]
+    assert trend[0]["total"] == 3
+
+    flapping = history.flapping()
+    assert [entry["url"] for entry in flapping] == ["https://flaky.example/a"]
+    assert flapping[0]["changes"] == 3
+    assert flapping[0]["statuses"] == ["valid", "broken", "valid", "broken"]
+
+    hosts = history.broken_hosts()
+    assert hosts[0] == {"host": "dead.example", "broken": 4, "urls": 1}
+
+    lines = "\n".join(history_sections(history, "links"))
+    assert "| 2026-01-04 06:00 | 3 | 1 | 2 | 0 | +1 |" in lines
+    assert "| https://flaky.example/a | 3 | valid → broken → valid → broken |" in lines
+    history.close()
+
+
+def test_old_runs_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(ValidationHistory, "MAX_RUNS", 2)
+    history = _history(tmp_path)
+
+    assert [run["validated_at"][:10] for run in history.trend()] == ["2026-01-03", "2026-01-04"]
+    assert history.db.execute("SELECT COUNT(DISTINCT run_id) FROM results").fetchone()[0] == 2
+    history.close()
+
+
+def test_citation_report_gains_trend_sections(tmp_path):
+    history = ValidationHistory(tmp_path / "history.sqlite")
+    links = {"links": [{"url": "https://flaky.example/a", "file_path": "/posts/p.md",
+                        "line_number": 2, "text": "paper"}]}
+
+    first = citation_report.generate_citation_report(
+        _run(1, {"https://flaky.example/a": "broken"}), links, history)
+    assert "First recorded run" in first
+
+    for day, status in ((2, "valid"), (3, "broken")):
+        report = citation_report.generate_citation_report(
+            _run(day, {"https://flaky.example/a": status}), links, history)
+    assert "## Trend (last 3 runs)" in report
+    assert "| https://flaky.example/a | 2 | broken → valid → broken |" in report
+    assert report.index("## Flapping Links") < report.index("## 🔧 Repair Recommendations")
+    assert history.trend("links") == []
+    history.close()
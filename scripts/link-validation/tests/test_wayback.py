@@ -0,0 +1,126 @@
+"""Tests for scripts/lib/wayback.py against a local CDX stand-in server."""
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from conftest import load_script
+from wayback import WaybackLookup, url_key
+
+cr = load_script("citation-repair.py")
+
+CAPTURES = {
+    "docs.example.com/guide/install": ["20190301000000", "20230105000000", "20250610000000"],
+    "docs.example.com/guide/upgrade": ["20240801000000"],
+    "blog.example.com/post": ["20200101000000"],
+    # b's only capture shares a month with a's last one
+    "docs.example.com/api/a": ["20240105000000", "20240610000000"],
+    "docs.example.com/api/b": ["20240615000000"],
+}
+
+
+def _cdx_app(requests):
+    async def cdx(request):
+        requests.append(dict(request.query))
+        target = request.query["url"]
+        if request.query.get("matchType") == "prefix":
+            keys = [k for k in CAPTURES if k.startswith(url_key(target) + "/")]
+        else:
+            keys = [url_key(target)] if url_key(target) in CAPTURES else []
+        rows = [[ts, f"http://{key}/"] for key in sorted(keys) for ts in CAPTURES[key]]
+        if request.query.get("collapse") == "timestamp:6":
+            # Like the real CDX server: compare each row with the row before it only
+            rows = [row for i, row in enumerate(rows)
+                    if i == 0 or row[0][:6] != rows[i - 1][0][:6]]
+        return web.json_response([["timestamp", "original"]] + rows)
+
+    app = web.Application()
+    app.router.add_get("/cdx", cdx)
+    return app
+
+
+async def _with_server(body):
+    requests = []
+    server = TestServer(_cdx_app(requests))
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            wayback = WaybackLookup(cdx_url=str(server.make_url("/cdx")), min_interval=0)
+            return await body(wayback, session), requests
+    finally:
+        await server.close()
+
+
+def test_prefetch_batches_shared_directory_into_one_prefix_query():
+    urls = [
+        "https://docs.example.com/guide/install",
+        "https://www.docs.example.com/guide/upgrade/",
+        "https://docs.example.com/guide/missing",
+        "https://blog.example.com/post",
+    ]
+
+    async def body(wayback, session):
+        await wayback.prefetch(session, urls)
+        return [await wayback.closest(session, url, before="20240716") for url in urls]
+
+    (install, upgrade, missing, post), requests = asyncio.run(_with_server(body))
+
+    assert len(requests) == 2  # one prefix query for /guide/, one exact query
+    assert {r.get("matchType") for r in requests} == {"prefix", None}
+    assert install["timestamp"] == "20230105000000" and install["before_date"]
+    assert install["url"] == "https://web.archive.org/web/20230105000000/http://docs.example.com/guide/install/"
+    assert upgrade["timestamp"] == "20240801000000" and not upgrade["before_date"]
+    assert missing is None  # settled by the prefix listing, no extra request
+    assert post["timestamp"] == "20200101000000"
+
+
+def test_prefix_listing_keeps_a_capture_sharing_a_month_with_its_neighbour():
+    urls = ["https://docs.example.com/api/a", "https://docs.example.com/api/b"]
+
+    async def body(wayback, session):
+        await wayback.prefetch(session, urls)
+        return [await wayback.closest(session, url) for url in urls]
+
+    (a, b), requests = asyncio.run(_with_server(body))
+
+    assert len(requests) == 1 and "collapse" not in requests[0]
+    assert a["timestamp"] == "20240610000000"
+    assert b is not None and b["timestamp"] == "20240615000000"
+
+
+def test_snapshot_lists_are_cached_on_disk(tmp_path):
+    url = "https://blog.example.com/post"
+
+    async def body(wayback, session):
+        wayback.cache_path = tmp_path / "wayback.json"
+        await wayback.prefetch(session, [url])
+        wayback.save()
+        reloaded = WaybackLookup(cdx_url=wayback.cdx_url, cache_path=wayback.cache_path)
+        await reloaded.prefetch(session, [url])
+        return await reloaded.closest(session, url), reloaded.stats
+
+    (snapshot, stats), requests = asyncio.run(_with_server(body))
+
+    assert len(requests) == 1
+    assert stats == {"requests": 0, "prefix_queries": 0, "cache_hits": 1, "throttled_seconds": 0.0}
+    assert snapshot["timestamp"] == "20200101000000"
+
+
+def test_repair_with_wayback_uses_post_date():
+    async def body(wayback, session):
+        repair = cr.CitationRepair(wayback=wayback)
+        repair.session = session
+        link_info = {
+            "link": {"url": "https://docs.example.com/guide/install", "type": "documentation",
+                     "text": "install guide", "file_path": "src/posts/2021-06-01-setup.md"},
+            "issue_type": "404",
+            "relevance": {},
+        }
+        return await repair._repair_with_wayback(link_info)
+
+    suggestion, _ = asyncio.run(_with_server(body))
+
+    assert "/web/20190301000000/" in suggestion.suggested_url
+    assert suggestion.description == "Archived on 2019-03-01"
+    assert suggestion.confidence == 70